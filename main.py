@@ -3,15 +3,13 @@
 
 from sw_nebula_service.engine import Engine, EngineConfig
 from sw_nebula_service.managers.connector import Connector, ConnectorConfig
-from sw_nebula_service.utils import FULL_NODE_CLASSES, pascal_case_to_snake_case
+from sw_nebula_service.registry import get_registry
 
 NAME_SPACE = "kg_arda"
 
 
 def tag_name_to_class(tag_name: str):
-    for node_class in FULL_NODE_CLASSES:
-        if pascal_case_to_snake_case(node_class.__name__) == tag_name:
-            return node_class
+    return get_registry().get_node_class(tag_name)
 
 
 connector = Connector(ConnectorConfig(host="192.168.3.70", port=32113, username="root", password="nebula"))
@@ -1,9 +1,30 @@
 __version__ = "0.1.0"
-from sw_onto_generation.utils import get_all_common_and_root_classes
+import functools
+from typing import Any
 
-from sw_nebula_service.models.nodes import PREDEFINED_NODE_CLASSES
-from sw_nebula_service.models.relations import PREDEFINED_RELATION_CLASSES
+# The ontology classes are only loaded on first access, so importing the Connector or a single manager stays cheap
+LAZY_CLASS_LISTS = ("WRITTEN_NODE_CLASSES", "WRITTEN_RELATION_CLASSES", "NODE_CLASSES", "RELATION_CLASSES")
 
-WRITTEN_NODE_CLASSES, WRITTEN_RELATION_CLASSES = get_all_common_and_root_classes()
-NODE_CLASSES = WRITTEN_NODE_CLASSES + PREDEFINED_NODE_CLASSES
-RELATION_CLASSES = WRITTEN_RELATION_CLASSES + PREDEFINED_RELATION_CLASSES
+
+@functools.cache
+def load_class_lists() -> dict[str, list[type]]:
+    from sw_onto_generation.utils import get_all_common_and_root_classes
+
+    from sw_nebula_service.models.nodes import PREDEFINED_NODE_CLASSES
+    from sw_nebula_service.models.relations import PREDEFINED_RELATION_CLASSES
+
+    written_node_classes, written_relation_classes = get_all_common_and_root_classes()
+    return {
+        "WRITTEN_NODE_CLASSES": written_node_classes,
+        "WRITTEN_RELATION_CLASSES": written_relation_classes,
+        "NODE_CLASSES": written_node_classes + PREDEFINED_NODE_CLASSES,
+        "RELATION_CLASSES": written_relation_classes + PREDEFINED_RELATION_CLASSES,
+    }
+
+
+def __getattr__(name: str) -> Any:
+    if name in LAZY_CLASS_LISTS:
+        value = load_class_lists()[name]
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
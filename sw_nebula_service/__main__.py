@@ -0,0 +1,36 @@
+import argparse
+import os
+
+from rich import print as rprint
+
+from sw_nebula_service.engine import Engine
+from sw_nebula_service.managers.connector import Connector, ConnectorConfig
+from sw_nebula_service.managers.transfer_manager import SCHEMA_PROPAGATION_WAIT
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m sw_nebula_service", description="Copy a Nebula space to and from CSV/Parquet files")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("name_space")
+    parser.add_argument("directory")
+    parser.add_argument("--host", default=os.environ.get("NEBULA_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("NEBULA_PORT", "9669")))
+    parser.add_argument("--username", default=os.environ.get("NEBULA_USERNAME", "root"))
+    parser.add_argument("--password", default=os.environ.get("NEBULA_PASSWORD", "nebula"))
+    parser.add_argument("--format", dest="file_format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing import checkpoint")
+    parser.add_argument("--schema-wait", type=float, default=SCHEMA_PROPAGATION_WAIT, help="Seconds to wait for graphd to see tags and edge types created by an import")
+    args = parser.parse_args()
+
+    connector = Connector(ConnectorConfig(host=args.host, port=args.port, username=args.username, password=args.password, session_reuse=True))
+    engine = Engine(connector)
+    if args.command == "export":
+        report = engine.export_space(name_space=args.name_space, directory=args.directory, file_format=args.file_format)
+    else:
+        report = engine.import_space(name_space=args.name_space, directory=args.directory, batch_size=args.batch_size, resume=not args.no_resume, schema_wait=args.schema_wait)
+    rprint(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import asyncio
+import functools
+import inspect
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+from sw_onto_generation.base.base_relation import BaseRelation
+
+from sw_nebula_service.engine import Engine
+from sw_nebula_service.managers.bulk_load_manager import BulkLoadReport
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.edge_manager import EdgeInput
+from sw_nebula_service.managers.index_manager import IndexBuildReport
+from sw_nebula_service.managers.schema_manager import SchemaSyncResult
+from sw_nebula_service.managers.transfer_manager import TransferReport
+from sw_nebula_service.managers.traversal_manager import Subtree
+from sw_nebula_service.managers.vertex_cache import VertexCache
+from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.models.relations import BaseNebulaRelation
+
+T = TypeVar("T")
+# Returned by next() once a generator is exhausted, StopIteration cannot cross the executor into a coroutine
+STOP = object()
+
+
+class AsyncBridge:
+    """Runs blocking nebula3 calls on a dedicated thread pool, with at most `max_concurrency` calls in flight."""
+
+    def __init__(self, max_concurrency: int):
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="nebula")
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+class AsyncManager:
+    """Exposes every public method of a sync manager as a coroutine function running on the bridge.
+
+    Generator methods become async iterators instead, each item is pulled on the bridge so the paging queries never run on the event loop.
+    """
+
+    def __init__(self, manager: Any, bridge: AsyncBridge):
+        self.manager = manager
+        self.bridge = bridge
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.manager, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        if inspect.isgeneratorfunction(attr):
+
+            @functools.wraps(attr)
+            async def iterator(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+                generator = attr(*args, **kwargs)
+                try:
+                    while True:
+                        item = await self.bridge.run(next, generator, STOP)
+                        if item is STOP:
+                            return
+                        yield item
+                finally:
+                    await self.bridge.run(generator.close)
+
+            setattr(self, name, iterator)
+            return iterator
+
+        @functools.wraps(attr)
+        async def method(*args: Any, **kwargs: Any) -> Any:
+            return await self.bridge.run(attr, *args, **kwargs)
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, method)
+        return method
+
+
+class AsyncEngine:
+    """Async mirror of Engine. buffered_writer is not mirrored, use engine.buffered_writer since its writes only append to a buffer."""
+
+    def __init__(self, connector: Connector, max_concurrency: int | None = None, vertex_cache: VertexCache | None = None):
+        self.engine = Engine(connector, vertex_cache=vertex_cache)
+        self.connector = connector
+        self.bridge = AsyncBridge(max_concurrency or connector.config.max_connection_pool_size)
+        self.space_manager = AsyncManager(self.engine.space_manager, self.bridge)
+        self.tag_manager = AsyncManager(self.engine.tag_manager, self.bridge)
+        self.vertex_manager = AsyncManager(self.engine.vertex_manager, self.bridge)
+        self.edge_type_manager = AsyncManager(self.engine.edge_type_manager, self.bridge)
+        self.edge_manager = AsyncManager(self.engine.edge_manager, self.bridge)
+        self.index_manager = AsyncManager(self.engine.index_manager, self.bridge)
+        self.bulk_load_manager = AsyncManager(self.engine.bulk_load_manager, self.bridge)
+        self.schema_manager = AsyncManager(self.engine.schema_manager, self.bridge)
+        self.transfer_manager = AsyncManager(self.engine.transfer_manager, self.bridge)
+        self.traversal_manager = AsyncManager(self.engine.traversal_manager, self.bridge)
+
+    async def create_defined_schemas(self, name_space: str, node_classes: list[type[BaseNode] | type[BaseNebulaNode]], relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]]):
+        return await self.bridge.run(self.engine.create_defined_schemas, name_space=name_space, node_classes=node_classes, relation_classes=relation_classes)
+
+    async def sync_schemas(self, name_space: str, **kwargs: Any) -> SchemaSyncResult:
+        return await self.bridge.run(self.engine.sync_schemas, name_space=name_space, **kwargs)
+
+    async def build_indexes(self, name_space: str, **kwargs: Any) -> IndexBuildReport:
+        return await self.bridge.run(self.engine.build_indexes, name_space=name_space, **kwargs)
+
+    async def find_vertices(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode], **filters: Any) -> list[BaseNode | BaseNebulaNode]:
+        return await self.bridge.run(self.engine.find_vertices, name_space, node_class, **filters)
+
+    async def bulk_load(self, name_space: str, nodes: Sequence[BaseNode | BaseNebulaNode | BaseModel], vids: Sequence[str], relations: Sequence[EdgeInput] = (), **kwargs: Any) -> BulkLoadReport:
+        return await self.bridge.run(self.engine.bulk_load, name_space=name_space, nodes=nodes, vids=vids, relations=relations, **kwargs)
+
+    async def get_subtree(self, name_space: str, root_vid: str = "root", **kwargs: Any) -> Subtree:
+        return await self.bridge.run(self.engine.get_subtree, name_space=name_space, root_vid=root_vid, **kwargs)
+
+    async def export_space(self, name_space: str, directory: str | Path, **kwargs: Any) -> TransferReport:
+        return await self.bridge.run(self.engine.export_space, name_space=name_space, directory=directory, **kwargs)
+
+    async def import_space(self, name_space: str, directory: str | Path, **kwargs: Any) -> TransferReport:
+        return await self.bridge.run(self.engine.import_space, name_space=name_space, directory=directory, **kwargs)
+
+    def metrics_snapshot(self) -> dict:
+        return self.engine.metrics_snapshot()
+
+    def metrics_text(self) -> str:
+        return self.engine.metrics_text()
+
+    async def insert_directory_nodes(self, name_space: str):
+        return await self.bridge.run(self.engine.insert_directory_nodes, name_space=name_space)
+
+    async def close(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.bridge.shutdown)
+
+    async def __aenter__(self) -> "AsyncEngine":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
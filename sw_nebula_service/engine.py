@@ -1,13 +1,24 @@
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
 from pydantic import BaseModel
-from sw_onto_generation import DIR_STRUCTURE
 from sw_onto_generation.base.base_node import BaseNode
 from sw_onto_generation.base.base_relation import BaseRelation
 
+from sw_nebula_service.managers.buffered_writer import BufferedWriter
+from sw_nebula_service.managers.bulk_load_manager import BulkLoadManager, BulkLoadProgress, BulkLoadReport
 from sw_nebula_service.managers.connector import Connector
-from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.managers.edge_manager import EdgeInput, EdgeManager
 from sw_nebula_service.managers.edge_type_manager import EdgeTypeManager
+from sw_nebula_service.managers.frames import FRAME_PAGE_SIZE
+from sw_nebula_service.managers.index_manager import IndexBuildReport, IndexManager
+from sw_nebula_service.managers.schema_manager import SchemaManager, SchemaSyncResult
 from sw_nebula_service.managers.space_manager import SpaceManager
 from sw_nebula_service.managers.tag_manager import TagManager
+from sw_nebula_service.managers.transfer_manager import SCHEMA_PROPAGATION_WAIT, TransferManager, TransferReport
+from sw_nebula_service.managers.traversal_manager import DIRECTORY_RELATION_CLASSES, Subtree, TraversalManager
+from sw_nebula_service.managers.vertex_cache import VertexCache
 from sw_nebula_service.managers.vertex_manager import VertexManager
 from sw_nebula_service.models.nodes import BaseNebulaNode, LibNode, OntologyNode, RootNode
 from sw_nebula_service.models.relations import BaseNebulaRelation
@@ -19,13 +30,18 @@ class EngineConfig(BaseModel):
 
 
 class Engine:
-    def __init__(self, connector: Connector):
+    def __init__(self, connector: Connector, vertex_cache: VertexCache | None = None):
         self.connector = connector
         self.space_manager = SpaceManager(connector)
-        self.tag_manager = TagManager(connector)
-        self.vertex_manager = VertexManager(connector)
+        self.index_manager = IndexManager(connector)
+        self.tag_manager = TagManager(connector, index_manager=self.index_manager)
+        self.vertex_manager = VertexManager(connector, cache=vertex_cache, index_manager=self.index_manager)
         self.edge_type_manager = EdgeTypeManager(connector)
         self.edge_manager = EdgeManager(connector)
+        self.bulk_load_manager = BulkLoadManager(self.vertex_manager, self.edge_manager)
+        self.schema_manager = SchemaManager(connector, self.tag_manager, self.edge_type_manager)
+        self.transfer_manager = TransferManager(self.tag_manager, self.edge_type_manager, self.vertex_manager, self.edge_manager)
+        self.traversal_manager = TraversalManager(connector)
 
     def create_defined_schemas(self, name_space: str, node_classes: list[type[BaseNode] | type[BaseNebulaNode]], relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]]):
         self.space_manager.create_namespace(name_space=name_space)
@@ -34,7 +50,64 @@ class Engine:
         for relation in relation_classes:
             self.edge_type_manager.create_edge_type_with_property(name_space=name_space, edge_class=relation)
 
+    def sync_schemas(
+        self,
+        name_space: str,
+        node_classes: list[type[BaseNode] | type[BaseNebulaNode]] | None = None,
+        relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]] | None = None,
+        force: bool = False,
+    ) -> SchemaSyncResult:
+        return self.schema_manager.sync(name_space=name_space, node_classes=node_classes, relation_classes=relation_classes, force=force)
+
+    def build_indexes(self, name_space: str, node_classes: list[type[BaseNode] | type[BaseNebulaNode]] | None = None, timeout: float = 300.0, poll_interval: float = 1.0) -> IndexBuildReport:
+        return self.index_manager.build_indexes(name_space=name_space, node_classes=node_classes, timeout=timeout, poll_interval=poll_interval)
+
+    def find_vertices(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode], **filters: Any) -> list[BaseNode | BaseNebulaNode]:
+        return self.vertex_manager.find_vertices(name_space, node_class, **filters)
+
+    def bulk_load(
+        self,
+        name_space: str,
+        nodes: Sequence[BaseNode | BaseNebulaNode | BaseModel],
+        vids: Sequence[str],
+        relations: Sequence[EdgeInput] = (),
+        workers: int | None = None,
+        batch_size: int = 500,
+        max_retries: int = 3,
+        on_progress: Callable[[BulkLoadProgress], None] | None = None,
+    ) -> BulkLoadReport:
+        return self.bulk_load_manager.bulk_load(
+            name_space=name_space, nodes=nodes, vids=vids, relations=relations, workers=workers, batch_size=batch_size, max_retries=max_retries, on_progress=on_progress
+        )
+
+    def get_subtree(
+        self,
+        name_space: str,
+        root_vid: str = "root",
+        edge_types: Sequence[str | type[BaseRelation] | type[BaseNebulaRelation]] = DIRECTORY_RELATION_CLASSES,
+        max_depth: int = 3,
+        limits: int | Sequence[int] | None = None,
+    ) -> Subtree:
+        return self.traversal_manager.get_subtree(name_space=name_space, root_vid=root_vid, edge_types=edge_types, max_depth=max_depth, limits=limits)
+
+    def buffered_writer(self, name_space: str, flush_size: int = 500, flush_interval: float = 1.0, max_buffer_size: int = 10_000) -> BufferedWriter:
+        return BufferedWriter(self.vertex_manager, name_space, flush_size=flush_size, flush_interval=flush_interval, max_buffer_size=max_buffer_size)
+
+    def export_space(self, name_space: str, directory: str | Path, file_format: str = "csv", page_size: int = FRAME_PAGE_SIZE) -> TransferReport:
+        return self.transfer_manager.export_space(name_space=name_space, directory=directory, file_format=file_format, page_size=page_size)
+
+    def import_space(self, name_space: str, directory: str | Path, batch_size: int = 500, resume: bool = True, schema_wait: float = SCHEMA_PROPAGATION_WAIT) -> TransferReport:
+        return self.transfer_manager.import_space(name_space=name_space, directory=directory, batch_size=batch_size, resume=resume, schema_wait=schema_wait)
+
+    def metrics_snapshot(self) -> dict:
+        return self.connector.metrics_snapshot()
+
+    def metrics_text(self) -> str:
+        return self.connector.metrics_text()
+
     def insert_directory_nodes(self, name_space: str):
+        from sw_onto_generation import DIR_STRUCTURE
+
         self.vertex_manager.insert_vertex(name_space=name_space, node=RootNode(name="root"), vid="root")
         self.vertex_manager.insert_vertex(name_space=name_space, node=RootNode(name="pdf_root"), vid="pdf_root")
 
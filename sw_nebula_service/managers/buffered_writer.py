@@ -0,0 +1,172 @@
+import threading
+import time
+from typing import Any
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+
+from sw_nebula_service.managers.utils import get_serialization_plan
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import BaseNebulaNode
+
+
+class BufferedWriterReport(BaseModel):
+    flushes: int = 0
+    vertices_written: int = 0
+    updates_written: int = 0
+    # Updates that were merged into an already buffered (vid, field) instead of being sent separately
+    updates_coalesced: int = 0
+    failed_vids: list[str] = []
+    errors: list[str] = []
+
+
+class BufferedWriter:
+    """Queues vertex inserts and field updates for one space and writes them in batches from a background thread.
+
+    A flush happens once `flush_size` entries are buffered or `flush_interval` seconds after the first entry was buffered. Writers block
+    while `max_buffer_size` entries are pending.
+    """
+
+    def __init__(self, vertex_manager: VertexManager, name_space: str, flush_size: int = 500, flush_interval: float = 1.0, max_buffer_size: int = 10_000, batch_size: int = 500):
+        self.vertex_manager = vertex_manager
+        self.name_space = name_space
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max(max_buffer_size, flush_size)
+        self.batch_size = batch_size
+        self.report = BufferedWriterReport()
+
+        self.lock = threading.Lock()
+        self.flush_needed = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        # Serialises flushes so buffers reach Nebula in the order they were taken
+        self.flush_lock = threading.Lock()
+        # Keyed like insert_vertices groups rows, a vid can carry one node per tag
+        self.pending_vertices: dict[tuple[str, str], BaseNode | BaseNebulaNode | BaseModel] = {}
+        self.pending_updates: dict[tuple[str, str], dict[str, Any]] = {}
+        self.size = 0
+        self.closed = False
+        self.pending_since = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name=f"nebula-buffered-writer-{name_space}", daemon=True)
+        self.thread.start()
+
+    def insert_vertex(self, node: BaseNode | BaseNebulaNode | BaseModel, vid: str) -> None:
+        tag_name = get_serialization_plan(node.__class__).tag_name
+        with self.lock:
+            self._wait_for_space()
+            self._start_interval()
+            # The insert rewrites the whole tag, so field updates queued before it are superseded
+            superseded = self.pending_updates.pop((tag_name, vid), {})
+            self.size -= len(superseded)
+            if (tag_name, vid) not in self.pending_vertices:
+                self.size += 1
+            self.pending_vertices[(tag_name, vid)] = node
+            self._notify_if_full()
+
+    def update_vertex_field(self, tag_name: str, vid: str, field_name: str, value: Any) -> None:
+        with self.lock:
+            self._wait_for_space()
+            self._start_interval()
+            fields = self.pending_updates.setdefault((tag_name, vid), {})
+            if field_name in fields:
+                self.report.updates_coalesced += 1
+            else:
+                self.size += 1
+            fields[field_name] = value
+            self._notify_if_full()
+
+    def flush(self) -> BufferedWriterReport:
+        with self.flush_lock:
+            with self.lock:
+                vertices, updates = self._take()
+            self._write(vertices, updates)
+        return self.report
+
+    def close(self) -> BufferedWriterReport:
+        with self.lock:
+            if self.closed:
+                return self.report
+            self.closed = True
+            self.flush_needed.notify()
+            self.not_full.notify_all()
+        self.thread.join()
+        return self.flush()
+
+    def __enter__(self) -> "BufferedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _wait_for_space(self) -> None:
+        if self.closed:
+            raise RuntimeError("BufferedWriter is closed")
+        while self.size >= self.max_buffer_size:
+            self.flush_needed.notify()
+            self.not_full.wait()
+            if self.closed:
+                raise RuntimeError("BufferedWriter is closed")
+
+    def _start_interval(self) -> None:
+        # The flush interval runs from the first buffered entry, the background thread sleeps untimed until then
+        if not self.size:
+            self.pending_since = time.monotonic()
+            self.flush_needed.notify()
+
+    def _notify_if_full(self) -> None:
+        if self.size >= self.flush_size:
+            self.flush_needed.notify()
+
+    def _take(self) -> tuple[dict[tuple[str, str], Any], dict[tuple[str, str], dict[str, Any]]]:
+        vertices, updates = self.pending_vertices, self.pending_updates
+        self.pending_vertices, self.pending_updates = {}, {}
+        self.size = 0
+        self.not_full.notify_all()
+        return vertices, updates
+
+    def _run(self) -> None:
+        while True:
+            with self.lock:
+                while not self.closed and self.size < self.flush_size:
+                    if self.size and time.monotonic() - self.pending_since >= self.flush_interval:
+                        break
+                    self.flush_needed.wait(self.pending_since + self.flush_interval - time.monotonic() if self.size else None)
+                if self.closed:
+                    return
+            with self.flush_lock:
+                with self.lock:
+                    vertices, updates = self._take()
+                try:
+                    self._write(vertices, updates)
+                except Exception as e:
+                    # There is no caller to raise to from the background thread, the failure is kept on the report
+                    self.report.errors.append(str(e))
+                    self.report.failed_vids.extend([*(vid for _, vid in vertices), *(vid for _, vid in updates)])
+
+    def _write(self, vertices: dict[tuple[str, str], Any], updates: dict[tuple[str, str], dict[str, Any]]) -> None:
+        if not vertices and not updates:
+            return
+        self.report.flushes += 1
+        # Inserts go first so that updates queued after an insert of the same vertex are applied on top of it
+        if vertices:
+            results = self.vertex_manager.insert_vertices(self.name_space, list(vertices.values()), [vid for _, vid in vertices], batch_size=self.batch_size)
+            for result in results:
+                self.report.vertices_written += len(result.vids) - len(result.failed_vids)
+                self.report.failed_vids.extend(result.failed_vids)
+                if not result.is_succeeded:
+                    self.report.errors.append(result.message)
+        if updates:
+            self._write_updates(updates)
+
+    def _write_updates(self, updates: dict[tuple[str, str], dict[str, Any]]) -> None:
+        patches_by_tag: dict[str, dict[str, dict[str, Any]]] = {}
+        for (tag_name, vid), fields in updates.items():
+            patches_by_tag.setdefault(tag_name, {})[vid] = fields
+        for tag_name, patches in patches_by_tag.items():
+            results = self.vertex_manager.update_vertices(self.name_space, tag_name, patches, batch_size=self.batch_size)
+            for vid, result in results.items():
+                if result.is_succeeded:
+                    self.report.updates_written += len(patches[vid])
+                else:
+                    self.report.failed_vids.append(vid)
+                    self.report.errors.append(result.message)
@@ -0,0 +1,142 @@
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+
+from sw_nebula_service.managers.edge_manager import EdgeInput, EdgeManager, get_edge_key
+from sw_nebula_service.managers.utils import chunked
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import BaseNebulaNode
+
+
+class BulkLoadProgress(BaseModel):
+    phase: str
+    rows_done: int
+    rows_failed: int
+    rows_total: int
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class BulkLoadReport(BaseModel):
+    vertices_inserted: int = 0
+    edges_inserted: int = 0
+    failed_vids: list[str] = []
+    failed_edges: list[tuple[str, str, str]] = []
+    # Edges not written because their src or dst vertex failed to insert
+    skipped_edges: list[tuple[str, str, str]] = []
+    retried_batches: int = 0
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+
+
+class BulkLoadManager:
+    def __init__(self, vertex_manager: VertexManager, edge_manager: EdgeManager):
+        self.vertex_manager = vertex_manager
+        self.edge_manager = edge_manager
+
+    def bulk_load(
+        self,
+        name_space: str,
+        nodes: Sequence[BaseNode | BaseNebulaNode | BaseModel],
+        vids: Sequence[str],
+        relations: Sequence[EdgeInput] = (),
+        workers: int | None = None,
+        batch_size: int = 500,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        on_progress: Callable[[BulkLoadProgress], None] | None = None,
+    ) -> BulkLoadReport:
+        workers = workers or self.vertex_manager.connector.config.max_connection_pool_size
+        report = BulkLoadReport()
+        start = time.perf_counter()
+
+        def insert_vertex_batch(batch: Sequence[tuple[Any, str]]) -> set[str]:
+            results = self.vertex_manager.insert_vertices(name_space, [node for node, _ in batch], [vid for _, vid in batch], batch_size=len(batch))
+            return {vid for result in results for vid in result.failed_vids}
+
+        def insert_edge_batch(batch: Sequence[EdgeInput]) -> set[tuple[str, str, str]]:
+            results = self.edge_manager.insert_edges(name_space, batch, batch_size=len(batch))
+            return {edge for result in results for edge in result.failed_edges}
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nebula-bulk-load") as executor:
+            # Every vertex batch has to land before any edge referencing it is written
+            vertex_items = list(zip(nodes, vids, strict=True))
+            failed_vertices = self._run_phase(executor, "vertices", vertex_items, insert_vertex_batch, lambda item: item[1], batch_size, max_retries, retry_backoff, report, on_progress)
+            failed_vids = {vid for _, vid in failed_vertices}
+            edge_items = [edge for edge in relations if edge[1] not in failed_vids and edge[2] not in failed_vids]
+            report.skipped_edges = [get_edge_key(edge) for edge in relations if edge[1] in failed_vids or edge[2] in failed_vids]
+            failed_edges = self._run_phase(executor, "edges", edge_items, insert_edge_batch, get_edge_key, batch_size, max_retries, retry_backoff, report, on_progress)
+
+        report.vertices_inserted = len(vertex_items) - len(failed_vertices)
+        report.edges_inserted = len(edge_items) - len(failed_edges)
+        report.failed_vids = [vid for _, vid in failed_vertices]
+        report.failed_edges = [get_edge_key(edge) for edge in failed_edges]
+        report.elapsed_seconds = time.perf_counter() - start
+        report.rows_per_second = (report.vertices_inserted + report.edges_inserted) / report.elapsed_seconds if report.elapsed_seconds else 0.0
+        return report
+
+    def _run_phase(
+        self,
+        executor: ThreadPoolExecutor,
+        phase: str,
+        items: list[Any],
+        insert_batch: Callable[[Sequence[Any]], set[Any]],
+        item_key: Callable[[Any], Any],
+        batch_size: int,
+        max_retries: int,
+        retry_backoff: float,
+        report: BulkLoadReport,
+        on_progress: Callable[[BulkLoadProgress], None] | None,
+    ) -> list[Any]:
+        start = time.perf_counter()
+        pending: dict[Future, tuple[Sequence[Any], int]] = {}
+
+        def submit(batch: Sequence[Any], attempt: int) -> None:
+            delay = retry_backoff * 2 ** (attempt - 1) if attempt else 0.0
+            pending[executor.submit(self._delayed, delay, insert_batch, batch)] = (batch, attempt)
+
+        for batch in chunked(items, batch_size):
+            submit(batch, 0)
+
+        rows_done = 0
+        failed: list[Any] = []
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, attempt = pending.pop(future)
+                try:
+                    failed_keys = future.result()
+                    failed_batch = [item for item in batch if item_key(item) in failed_keys]
+                except Exception:
+                    failed_batch = list(batch)
+
+                if failed_batch and attempt < max_retries:
+                    report.retried_batches += 1
+                    submit(failed_batch, attempt + 1)
+                else:
+                    failed.extend(failed_batch)
+                rows_done += len(batch) - len(failed_batch)
+
+                if on_progress is not None:
+                    elapsed = time.perf_counter() - start
+                    on_progress(
+                        BulkLoadProgress(
+                            phase=phase,
+                            rows_done=rows_done,
+                            rows_failed=len(failed),
+                            rows_total=len(items),
+                            elapsed_seconds=elapsed,
+                            rows_per_second=rows_done / elapsed if elapsed else 0.0,
+                        )
+                    )
+        return failed
+
+    @staticmethod
+    def _delayed(delay: float, func: Callable[[Sequence[Any]], set[Any]], batch: Sequence[Any]) -> set[Any]:
+        if delay:
+            time.sleep(delay)
+        return func(batch)
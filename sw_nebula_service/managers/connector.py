@@ -1,45 +1,215 @@
+import threading
+import time
+from collections.abc import Callable
 from contextlib import contextmanager
 
 from nebula3.Config import Config
-from nebula3.gclient.net import ConnectionPool
-from pydantic import BaseModel
+from nebula3.data.ResultSet import ResultSet
+from nebula3.Exception import IOErrorException
+from nebula3.gclient.net import ConnectionPool, Session
+from pydantic import BaseModel, model_validator
+
+from sw_nebula_service.managers.load_balancer import RETRYABLE_ERROR_CODES, HostSession, LoadBalancer
+from sw_nebula_service.managers.metrics import ConnectorMetrics
+from sw_nebula_service.managers.query_log import QueryLogConfig, QueryLogger
+from sw_nebula_service.managers.session_cache import PooledSession, SessionCache
 
 
 class ConnectorConfig(BaseModel):
-    host: str
-    port: int
+    host: str | None = None
+    port: int | None = None
     username: str
     password: str
+    # More graphd addresses to balance sessions across, host/port (when set) is added as the first one
+    addresses: list[tuple[str, int]] = []
+    load_balancing: str = "round_robin"
+    host_max_failures: int = 3
+    host_ejection_time: float = 30.0
+    # Eject a host once its average request latency goes above this many seconds
+    host_slow_threshold: float | None = None
+    # Connect/execute timeout in seconds, 0 means no timeout
+    request_timeout: float = 0.0
+    read_retries: int = 2
+    read_retry_backoff: float = 0.1
+    max_connection_pool_size: int = 10
+    # Keep authenticated sessions around between calls instead of signing in for every operation
+    session_reuse: bool = False
+    max_cached_sessions: int = 10
+    session_idle_timeout: float = 300.0
+    session_health_check_interval: float = 30.0
+    query_log: QueryLogConfig = QueryLogConfig()
+    metrics_enabled: bool = True
+
+    @property
+    def graphd_addresses(self) -> list[tuple[str, int]]:
+        addresses = [(self.host, self.port)] if self.host is not None and self.port is not None else []
+        return list(dict.fromkeys([*addresses, *self.addresses]))
+
+    @model_validator(mode="after")
+    def check_addresses(self) -> "ConnectorConfig":
+        if not self.graphd_addresses:
+            raise ValueError("Either host and port or addresses must be set")
+        return self
 
 
 class Connector:
-    def __init__(self, config: ConnectorConfig):
+    def __init__(self, config: ConnectorConfig, session_factory: Callable[[], Session] | None = None, connection_pool_factory: Callable[[], ConnectionPool] = ConnectionPool):
         self.connector_config = config
-        self.connection_pool = ConnectionPool()
+        # Replaces the nebula3 connection pools, e.g. with an in-memory backend in tests and benchmarks
+        self.session_factory = session_factory
+        # One pool per graphd, so the load balancer rather than nebula3 decides where each session goes
+        self.connection_pools = {address: connection_pool_factory() for address in config.graphd_addresses}
+        self.initialized_pools: set[tuple[str, int]] = set()
+        self.load_balancer = LoadBalancer(
+            config.graphd_addresses,
+            strategy=config.load_balancing,
+            max_failures=config.host_max_failures,
+            ejection_time=config.host_ejection_time,
+            slow_threshold=config.host_slow_threshold,
+        )
         self.is_connected = False
         self.config = Config()
-        self.config.max_connection_pool_size = 10
+        self.config.max_connection_pool_size = config.max_connection_pool_size
+        self.config.timeout = int(config.request_timeout * 1000)
+        self._connect_lock = threading.Lock()
+        # Left as None when disabled so sessions skip logging with a single check
+        self.query_logger = QueryLogger(config.query_log) if config.query_log.enabled else None
+        self.metrics = ConnectorMetrics() if config.metrics_enabled else None
+        self._active_lock = threading.Lock()
+        self.active_sessions = 0
+        self.session_cache: SessionCache | None = None
+        if config.session_reuse:
+            self.session_cache = SessionCache(
+                self._new_session,
+                max_size=min(config.max_cached_sessions, self.config.max_connection_pool_size),
+                idle_timeout=config.session_idle_timeout,
+                health_check_interval=config.session_health_check_interval,
+                query_logger=self.query_logger,
+                metrics=self.metrics,
+            )
 
     def connect(self) -> bool:
-        try:
-            self.is_connected = self.connection_pool.init([(self.connector_config.host, self.connector_config.port)], self.config)  # Pass config with timeout
+        # Sessions may be opened from several threads at once (AsyncEngine), the pool must only be initialised once
+        with self._connect_lock:
+            if self.is_connected:
+                return True
+            if self.session_factory is not None:
+                self.is_connected = True
+                return True
+            # Connected as long as one graphd is reachable, the others are ejected and retried later
+            for host in self.load_balancer.hosts:
+                if not self._init_pool(host.address):
+                    self.load_balancer.eject(host)
+            self.is_connected = bool(self.initialized_pools)
             return self.is_connected
+
+    def _init_pool(self, address: tuple[str, int]) -> bool:
+        if address in self.initialized_pools:
+            return True
+        try:
+            if not self.connection_pools[address].init([address], self.config):
+                return False
         except Exception:
             return False
+        self.initialized_pools.add(address)
+        return True
+
+    def _new_session(self) -> Session:
+        if self.session_factory is not None:
+            return self.session_factory()
+        tried: set[tuple[str, int]] = set()
+        error: Exception = ConnectionError("Cannot establish connection to Nebula Graph")
+        for _ in self.connection_pools:
+            host = self.load_balancer.pick(exclude=tried)
+            tried.add(host.address)
+            try:
+                with self._connect_lock:
+                    if not self._init_pool(host.address):
+                        raise ConnectionError(f"Cannot connect to graphd {host.address[0]}:{host.address[1]}")
+                session = self.connection_pools[host.address].get_session(self.connector_config.username, self.connector_config.password)
+            except Exception as e:
+                self.load_balancer.record_failure(host)
+                error = e
+                continue
+            return HostSession(session, host, self.load_balancer)
+        raise error
+
+    def execute_read(self, name_space: str | None, query: str, params: dict | None = None) -> ResultSet:
+        """Runs an idempotent read, retrying on another session (and usually another host) when the request fails in transit."""
+        retries = self.connector_config.read_retries
+        for attempt in range(retries + 1):
+            try:
+                with self.session(name_space) as session:
+                    result = session.execute_parameter(query, params)
+                if result.error_code() not in RETRYABLE_ERROR_CODES or attempt == retries:
+                    return result
+            except (IOErrorException, ConnectionError):
+                if attempt == retries:
+                    raise
+            time.sleep(self.connector_config.read_retry_backoff * 2**attempt)
+        raise AssertionError("unreachable")
 
     @contextmanager
     def session(self, name_space: str | None = None):
         if not self.is_connected:
             if not self.connect():
                 raise ConnectionError("Cannot establish connection to Nebula Graph")
+        if self.session_cache is not None:
+            start = time.perf_counter()
+            session = self.session_cache.acquire(name_space)
+            # Includes the USE statement when the cached session has to switch space
+            self._observe_acquire(start)
+            discard = False
+            try:
+                yield session
+            except IOErrorException:
+                discard = True
+                raise
+            finally:
+                self.session_cache.release(session, discard=discard)
+                self._track_active(-1)
+            return
+
         session = None
         try:
-            session = self.connection_pool.get_session(self.connector_config.username, self.connector_config.password)
+            start = time.perf_counter()
+            session = PooledSession(self._new_session, self.query_logger, self.metrics)
+            self._observe_acquire(start)
             if name_space:
-                result = session.execute(f"USE {name_space}")
-                if not result.is_succeeded():
-                    raise Exception(f"Failed to use namespace {name_space}: {result.error_msg()}")
+                session.use(name_space)
             yield session
         finally:
             if session:
                 session.release()
+                self._track_active(-1)
+
+    def _observe_acquire(self, start: float) -> None:
+        if self.metrics is not None:
+            self.metrics.observe("session_acquire_seconds", time.perf_counter() - start)
+        self._track_active(1)
+
+    def _track_active(self, delta: int) -> None:
+        with self._active_lock:
+            self.active_sessions += delta
+
+    def pool_stats(self) -> dict[str, int]:
+        idle = self.session_cache.idle_count if self.session_cache is not None else 0
+        available = sum(1 for host in self.load_balancer.hosts if self.load_balancer.is_available(host))
+        return {"active": self.active_sessions, "idle": idle, "max": self.config.max_connection_pool_size * len(self.connection_pools), "hosts_available": available}
+
+    def metrics_snapshot(self) -> dict:
+        if self.metrics is None:
+            return {"histograms": {}, "errors": {}, "pool": self.pool_stats()}
+        return self.metrics.snapshot(self.pool_stats())
+
+    def metrics_text(self) -> str:
+        metrics = self.metrics if self.metrics is not None else ConnectorMetrics()
+        return metrics.to_prometheus(self.pool_stats())
+
+    def close(self) -> None:
+        if self.session_cache is not None:
+            self.session_cache.close()
+        for address in self.initialized_pools:
+            self.connection_pools[address].close()
+        self.initialized_pools.clear()
+        self.is_connected = False
@@ -1,19 +1,117 @@
-from rich import print as rprint
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import pandas as pd
+from sw_onto_generation.base.base_relation import BaseRelation
 
 from sw_nebula_service.managers.connector import Connector
-from sw_nebula_service.managers.utils import NebulaBooleanQueryResult
+from sw_nebula_service.managers.frames import FRAME_PAGE_SIZE, result_to_frame
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement, quote_vid
+from sw_nebula_service.managers.utils import (
+    NebulaBooleanQueryResult,
+    NebulaEdgeBatchQueryResult,
+    chunked,
+    convert_properties_to_nebula_data,
+    convert_relation_to_nebula_data,
+    pascal_case_to_snake_case,
+)
+from sw_nebula_service.models.relations import BaseNebulaRelation
+from sw_nebula_service.registry import get_registry
+
+EDGE_FRAME_DTYPES = {"src": "string", "dst": "string", "rank": "Int64", "source_node": "string", "target_node": "string"}
+
+# Either (relation, src_vid, dst_vid) or (edge_type, src_vid, dst_vid, properties)
+EdgeInput = tuple[BaseRelation | BaseNebulaRelation, str, str] | tuple[str, str, str, dict[str, Any]]
+
 
+def get_edge_key(edge: EdgeInput) -> tuple[str, str, str]:
+    """(edge_type, src_vid, dst_vid) of an edge input, the key insert_edges reports edges by."""
+    if isinstance(edge[0], BaseRelation | BaseNebulaRelation):
+        return pascal_case_to_snake_case(edge[0].__class__.__name__), edge[1], edge[2]
+    return edge[0], edge[1], edge[2]
 
+
+@instrumented
 class EdgeManager:
     def __init__(self, connector: Connector):
         self.connector = connector
 
     def insert_edge_without_property(self, name_space: str, edge_type: str, src_vid: str, dst_vid: str) -> NebulaBooleanQueryResult:
         with self.connector.session(name_space) as session:
-            query = f'INSERT EDGE IF NOT EXISTS {edge_type} () VALUES "{src_vid}"->"{dst_vid}":()'  # noqa: S608
-            rprint(f"query: {query}")
+            query = get_statement("insert_edges", edge_type=edge_type, field_names="").render(rows=f"{quote_vid(src_vid)}->{quote_vid(dst_vid)}: ()")
             result = session.execute(query)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully inserted edge type {edge_type}")
             else:
                 return NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to insert edge type {edge_type}: {result.error_msg()}")
+
+    def insert_edges(self, name_space: str, edges: Sequence[EdgeInput], batch_size: int = 500) -> list[NebulaEdgeBatchQueryResult]:
+        groups: dict[tuple[str, str], list[tuple[str, str, str]]] = {}
+        for edge in edges:
+            if isinstance(edge[0], BaseRelation | BaseNebulaRelation):
+                relation, src_vid, dst_vid = edge
+                edge_type, field_names_str, values_str = convert_relation_to_nebula_data(relation)
+            else:
+                edge_type, src_vid, dst_vid, properties = edge
+                field_names_str, values_str = convert_properties_to_nebula_data(properties)
+            groups.setdefault((edge_type, field_names_str), []).append((src_vid, dst_vid, values_str))
+
+        results = []
+        with self.connector.session(name_space) as session:
+            for (edge_type, field_names_str), rows in groups.items():
+                statement = get_statement("insert_edges", edge_type=edge_type, field_names=field_names_str)
+                for batch in chunked(rows, batch_size):
+                    batch_edges = [(edge_type, src_vid, dst_vid) for src_vid, dst_vid, _ in batch]
+                    values = ", ".join([f"{quote_vid(src_vid)}->{quote_vid(dst_vid)}: ({values_str})" for src_vid, dst_vid, values_str in batch])
+                    result = session.execute(statement.render(rows=values))
+                    if result.is_succeeded():
+                        results.append(NebulaEdgeBatchQueryResult(is_succeeded=True, message=f"Inserted {len(batch)} edges for edge type {edge_type}", edges=batch_edges))
+                    else:
+                        results.append(
+                            NebulaEdgeBatchQueryResult(
+                                is_succeeded=False, message=f"Failed to insert edges for edge type {edge_type}: {result.error_msg()}", edges=batch_edges, failed_edges=batch_edges
+                            )
+                        )
+        return results
+
+    def get_edges_frame(self, name_space: str, edge_type: str | type[BaseRelation] | type[BaseNebulaRelation], columns: Sequence[str] | None = None) -> pd.DataFrame:
+        edge_type, columns = self._frame_columns(edge_type, columns)
+        yields = ", ".join(["src(edge) AS src", "dst(edge) AS dst", "rank(edge) AS rank", *(f"properties(edge).{column} AS {column}" for column in columns)])
+        result = self.connector.execute_read(name_space, get_statement("lookup_edge", edge_type=edge_type).render(yields=yields))
+        if not result.is_succeeded():
+            raise Exception(f"Failed to get edge frame for edge type {edge_type}: {result.error_msg()}")
+        return result_to_frame(result, EDGE_FRAME_DTYPES)
+
+    def iter_edges_frames(
+        self, name_space: str, edge_type: str | type[BaseRelation] | type[BaseNebulaRelation], columns: Sequence[str] | None = None, page_size: int = FRAME_PAGE_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        edge_type, columns = self._frame_columns(edge_type, columns)
+        returns = ", ".join(["src(e) AS src", "dst(e) AS dst", "rank(e) AS rank", *(f"e.{column} AS {column}" for column in columns)])
+        first_page = get_statement("match_edges_page", edge_type=edge_type)
+        # Edges are keyed by (src, dst, rank), so the cursor compares the whole key
+        next_page = get_statement("match_edges_page_after", edge_type=edge_type)
+        cursor: tuple[str, str, int] | None = None
+        with self.connector.session(name_space) as session:
+            while True:
+                if cursor is None:
+                    result = session.execute(first_page.render(returns=returns, page_size=page_size))
+                else:
+                    src_vid, dst_vid, rank = cursor
+                    result = session.execute_parameter(*next_page.bind({"src": src_vid, "dst": dst_vid, "rank": rank}, returns=returns, page_size=page_size))
+                if not result.is_succeeded():
+                    raise Exception(f"Failed to get edge frame page for edge type {edge_type}: {result.error_msg()}")
+                frame = result_to_frame(result, EDGE_FRAME_DTYPES)
+                if len(frame):
+                    yield frame
+                if len(frame) < page_size:
+                    return
+                last = frame.iloc[-1]
+                cursor = (last["src"], last["dst"], int(last["rank"]))
+
+    @staticmethod
+    def _frame_columns(edge_type: str | type[BaseRelation] | type[BaseNebulaRelation], columns: Sequence[str] | None) -> tuple[str, list[str]]:
+        if not isinstance(edge_type, str):
+            edge_type = get_registry().get_edge_type(edge_type)
+        # Edge types created by create_edge_type_with_property carry the source_node/target_node string properties
+        return edge_type, ["source_node", "target_node"] if columns is None else list(columns)
@@ -1,11 +1,13 @@
-from rich import print as rprint
 from sw_onto_generation.base.base_relation import BaseRelation
 
 from sw_nebula_service.managers.connector import Connector
-from sw_nebula_service.managers.utils import NebulaBooleanQueryResult, pascal_case_to_snake_case
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement
+from sw_nebula_service.managers.utils import NebulaBooleanQueryResult, get_edge_type_fields, pascal_case_to_snake_case
 from sw_nebula_service.models.relations import BaseNebulaRelation
 
 
+@instrumented
 class EdgeTypeManager:
     def __init__(self, connector: Connector):
         self.connector = connector
@@ -13,7 +15,7 @@ class EdgeTypeManager:
     def create_edge_type_without_property(self, name_space: str, edge_class: type[BaseNebulaRelation]) -> NebulaBooleanQueryResult:
         edge_type = pascal_case_to_snake_case(edge_class.__name__)
         with self.connector.session(name_space) as session:
-            query = f"CREATE EDGE IF NOT EXISTS {edge_type}()"
+            query = get_statement("create_edge").render(edge_type=edge_type, fields="")
             result = session.execute(query)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully created edge type {edge_type}")
@@ -21,36 +23,44 @@ class EdgeTypeManager:
                 return NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to create edge type {edge_type}: {result.error_msg()}")
 
     def create_edge_type_with_property(self, name_space: str, edge_class: type[BaseRelation] | type[BaseNebulaRelation]) -> NebulaBooleanQueryResult:
-        edge_type = pascal_case_to_snake_case(edge_class.__name__)
-        with self.connector.session(name_space) as session:
-            import types
-
-            source_annotation = edge_class.model_fields["source_node"].annotation
-            target_annotation = edge_class.model_fields["target_node"].annotation
-
-            if isinstance(source_annotation, types.UnionType):
-                source_default = f"{source_annotation.__args__[0].__name__} | {source_annotation.__args__[1].__name__}"
-            else:
-                source_default = source_annotation.__name__
-
-            if isinstance(target_annotation, types.UnionType):
-                target_default = f"{target_annotation.__args__[0].__name__} | {target_annotation.__args__[1].__name__}"
-            else:
-                target_default = target_annotation.__name__
-
-            rprint(f"source_default: {source_default}, target_default: {target_default}")
+        return self.create_edge_type_from_fields(name_space, pascal_case_to_snake_case(edge_class.__name__), get_edge_type_fields(edge_class))
 
-            query = f'CREATE EDGE IF NOT EXISTS {edge_type}(source_node string DEFAULT "{source_default}", target_node string DEFAULT "{target_default}")'  # noqa: S608
-            rprint(f"query: {query}")
+    def create_edge_type_from_fields(self, name_space: str, edge_type: str, fields: list[str]) -> NebulaBooleanQueryResult:
+        with self.connector.session(name_space) as session:
+            query = get_statement("create_edge").render(edge_type=edge_type, fields=", ".join(fields))
             result = session.execute(query)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully created edge type {edge_type}")
             else:
                 return NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to create edge type {edge_type}: {result.error_msg()}")
 
+    def get_all_edge_types(self, name_space: str) -> list[str]:
+        edge_types = []
+        result = self.connector.execute_read(name_space, get_statement("show_edges").text)
+        if result.is_succeeded():
+            for res in result.as_primitive():
+                edge_types.append(res["Name"])
+            return edge_types
+        else:
+            raise Exception(f"Failed to get all edge types: {result.error_msg()}")
+
+    def get_edge_type_schemas(self, name_space: str) -> dict[str, dict[str, str]]:
+        # SHOW EDGES plus one DESCRIBE EDGE per edge type, all on a single session
+        with self.connector.session(name_space) as session:
+            result = session.execute(get_statement("show_edges").text)
+            if not result.is_succeeded():
+                raise Exception(f"Failed to get all edge types: {result.error_msg()}")
+            schemas = {}
+            for res in result.as_primitive():
+                describe_result = session.execute(get_statement("describe_edge").render(edge_type=res["Name"]))
+                if not describe_result.is_succeeded():
+                    raise Exception(f"Failed to describe edge type {res['Name']}: {describe_result.error_msg()}")
+                schemas[res["Name"]] = {row["Field"]: row["Type"] for row in describe_result.as_primitive()}
+            return schemas
+
     def create_edge_type_index(self, name_space: str, edge_type: str, index_name: str) -> NebulaBooleanQueryResult:
         with self.connector.session(name_space) as session:
-            query = f"CREATE EDGE INDEX IF NOT EXISTS {index_name} ON {edge_type}()"
+            query = get_statement("create_edge_index").render(index_name=index_name, edge_type=edge_type)
             result = session.execute(query)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully created index {index_name} for edge type {edge_type}")
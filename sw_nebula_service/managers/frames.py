@@ -0,0 +1,58 @@
+from datetime import date, datetime, timezone
+from typing import Any
+
+import pandas as pd
+from nebula3.common.ttypes import Value
+from nebula3.data.DataObject import ValueWrapper
+from nebula3.data.ResultSet import ResultSet
+
+# Frames are columnar and cheap to hold, so they are paged in much larger chunks than models, see match_vertices_page
+FRAME_PAGE_SIZE = 100_000
+
+PANDAS_DTYPES: dict[Any, str] = {
+    str: "string",
+    int: "Int64",
+    float: "Float64",
+    bool: "boolean",
+    datetime: "datetime64[ns, UTC]",
+}
+
+
+def _decode_datetime(value: Any) -> datetime:
+    # Nebula returns datetimes in UTC, so they are decoded as UTC instead of going through the session timezone
+    return datetime(value.year, value.month, value.day, value.hour, value.minute, value.sec, value.microsec, tzinfo=timezone.utc)
+
+
+# Raw thrift value decoders, keyed by Value type. Anything not listed goes through nebula3's cast_primitive()
+VALUE_DECODERS = {
+    Value.NVAL: lambda value: None,
+    Value.BVAL: lambda value: value,
+    Value.IVAL: lambda value: value,
+    Value.FVAL: lambda value: value,
+    Value.SVAL: lambda value: value.decode("utf-8"),
+    Value.DTVAL: _decode_datetime,
+    Value.DVAL: lambda value: date(value.year, value.month, value.day),
+}
+
+
+def decode_column(values: list[Value]) -> list[Any]:
+    decoded = []
+    for value in values:
+        decoder = VALUE_DECODERS.get(value.getType())
+        decoded.append(decoder(value.value) if decoder is not None else ValueWrapper(value).cast_primitive())
+    return decoded
+
+
+def result_to_frame(result: ResultSet, dtypes: dict[str, str]) -> pd.DataFrame:
+    """Builds a DataFrame column by column from the raw thrift rows, without per-row dicts or models."""
+    column_names = result.keys()
+    rows = [row.values for row in result.rows()]
+    data = {}
+    for column_index, column_name in enumerate(column_names):
+        values = decode_column([row[column_index] for row in rows])
+        dtype = dtypes.get(column_name, "object")
+        if dtype.startswith("datetime64"):
+            data[column_name] = pd.to_datetime(pd.Series(values, dtype="object"), utc=True).astype(dtype)
+        else:
+            data[column_name] = pd.array(values, dtype=dtype)
+    return pd.DataFrame(data, columns=column_names)
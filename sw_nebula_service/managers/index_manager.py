@@ -0,0 +1,187 @@
+import functools
+import threading
+import time
+from collections.abc import Callable, Sequence
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement
+from sw_nebula_service.managers.utils import NebulaBooleanQueryResult, get_serialization_plan
+from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.registry import get_registry
+
+# Declared on a model field as Field(json_schema_extra={"nebula_index": True}), or with the index length for strings
+INDEX_METADATA_KEY = "nebula_index"
+# Nebula needs a prefix length for string index columns; 64 covers sha256 hex digests
+DEFAULT_STRING_INDEX_LENGTH = 64
+JOB_FINAL_STATUSES = {"FINISHED", "FAILED", "STOPPED"}
+# Indexes can be created, rebuilt or dropped by other clients, so the listing is re-read after this many seconds
+INDEX_CACHE_TTL = 60.0
+
+
+class TagIndex(BaseModel):
+    name: str
+    tag_name: str
+    fields: list[str]
+    # Prefix length per string field, only needed when creating the index
+    lengths: dict[str, int] = {}
+    # Status of the last REBUILD from SHOW TAG INDEX STATUS, None when the index was never rebuilt
+    status: str | None = None
+
+    @property
+    def field_spec(self) -> str:
+        return ", ".join(f"{field_name}({self.lengths[field_name]})" if field_name in self.lengths else field_name for field_name in self.fields)
+
+
+class IndexJobStatus(BaseModel):
+    index_name: str
+    job_id: int | None = None
+    status: str
+    is_succeeded: bool
+    message: str | None = None
+
+
+class IndexBuildReport(BaseModel):
+    created: list[str] = []
+    jobs: list[IndexJobStatus] = []
+    errors: list[str] = []
+
+    @property
+    def is_succeeded(self) -> bool:
+        return not self.errors and all(job.is_succeeded for job in self.jobs)
+
+
+@functools.cache
+def get_declared_indexes(node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]) -> tuple[TagIndex, ...]:
+    plan = get_serialization_plan(node_class)
+    tag_name = get_registry().get_tag_name(node_class)
+    indexes = []
+    for field_name, field_type in plan.field_types.items():
+        extra = node_class.model_fields[field_name].json_schema_extra
+        declared = extra.get(INDEX_METADATA_KEY) if isinstance(extra, dict) else None
+        if not declared:
+            continue
+        lengths = {}
+        if field_type is str:
+            lengths[field_name] = DEFAULT_STRING_INDEX_LENGTH if declared is True else int(declared)
+        indexes.append(TagIndex(name=f"{tag_name}_{field_name}_index", tag_name=tag_name, fields=[field_name], lengths=lengths))
+    return tuple(indexes)
+
+
+@instrumented
+class IndexManager:
+    def __init__(self, connector: Connector, cache_ttl: float = INDEX_CACHE_TTL, clock: Callable[[], float] = time.monotonic):
+        self.connector = connector
+        self.cache_ttl = cache_ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        # name_space -> (read at, tag indexes as last read from SHOW TAG INDEXES)
+        self.tag_indexes: dict[str, tuple[float, list[TagIndex]]] = {}
+
+    def get_tag_indexes(self, name_space: str, refresh: bool = False) -> list[TagIndex]:
+        with self.lock:
+            cached = self.tag_indexes.get(name_space)
+            if not refresh and cached is not None and self.clock() - cached[0] < self.cache_ttl:
+                return cached[1]
+        read_at = self.clock()
+        result = self.connector.execute_read(name_space, get_statement("show_tag_indexes").text)
+        if not result.is_succeeded():
+            raise Exception(f"Failed to get tag indexes: {result.error_msg()}")
+        status_result = self.connector.execute_read(name_space, get_statement("show_tag_index_status").text)
+        if not status_result.is_succeeded():
+            raise Exception(f"Failed to get tag index status: {status_result.error_msg()}")
+        statuses = {row["Name"]: row["Index Status"] for row in status_result.as_primitive()}
+        indexes = [TagIndex(name=row["Index Name"], tag_name=row["By Tag"], fields=row["Columns"], status=statuses.get(row["Index Name"])) for row in result.as_primitive()]
+        with self.lock:
+            self.tag_indexes[name_space] = (read_at, indexes)
+        return indexes
+
+    def invalidate(self, name_space: str) -> None:
+        with self.lock:
+            self.tag_indexes.pop(name_space, None)
+
+    def find_index(self, name_space: str, tag_name: str, fields: Sequence[str]) -> TagIndex | None:
+        """Returns an index LOOKUP can answer `fields` equality filters with: it covers every field and starts with one of them.
+
+        An index only holds the rows written after it was created until a REBUILD over the existing data finishes, so an
+        index that was never rebuilt, or whose rebuild is still running or failed, is not used.
+        """
+        for index in self.get_tag_indexes(name_space):
+            if index.status == "FINISHED" and index.tag_name == tag_name and index.fields and index.fields[0] in fields and set(fields) <= set(index.fields):
+                return index
+        return None
+
+    def create_indexes(self, name_space: str, node_classes: list[type[BaseNode] | type[BaseNebulaNode]] | None = None) -> list[NebulaBooleanQueryResult]:
+        node_classes = list(get_registry().tag_to_node_class.values()) if node_classes is None else node_classes
+        results = []
+        with self.connector.session(name_space) as session:
+            for node_class in node_classes:
+                for index in get_declared_indexes(node_class):
+                    result = session.execute(get_statement("create_tag_index").render(index_name=index.name, tag_name=index.tag_name, fields=index.field_spec))
+                    if result.is_succeeded():
+                        results.append(NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully created index {index.name} for tag {index.tag_name}"))
+                    else:
+                        results.append(NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to create index {index.name} for tag {index.tag_name}: {result.error_msg()}"))
+        self.invalidate(name_space)
+        return results
+
+    def rebuild_tag_index(self, name_space: str, index_name: str) -> int:
+        with self.connector.session(name_space) as session:
+            result = session.execute(get_statement("rebuild_tag_index").render(index_name=index_name))
+            if not result.is_succeeded():
+                raise Exception(f"Failed to rebuild index {index_name}: {result.error_msg()}")
+            return result.row_values(0)[0].cast()
+
+    def get_job_status(self, name_space: str, job_id: int) -> str:
+        result = self.connector.execute_read(name_space, get_statement("show_job").render(job_id=job_id))
+        if not result.is_succeeded():
+            raise Exception(f"Failed to get job {job_id}: {result.error_msg()}")
+        # The first row is the job itself, the rest are its per-storage tasks
+        return result.row_values(0)[2].cast()
+
+    def wait_for_job(self, name_space: str, job_id: int, index_name: str, timeout: float = 300.0, poll_interval: float = 1.0) -> IndexJobStatus:
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.get_job_status(name_space, job_id)
+            if status in JOB_FINAL_STATUSES:
+                # The index status changed with the job, so the cached listing is stale
+                self.invalidate(name_space)
+                return IndexJobStatus(index_name=index_name, job_id=job_id, status=status, is_succeeded=status == "FINISHED")
+            if time.monotonic() >= deadline:
+                return IndexJobStatus(index_name=index_name, job_id=job_id, status=status, is_succeeded=False, message=f"Job still {status} after {timeout} seconds")
+            time.sleep(poll_interval)
+
+    def build_indexes(self, name_space: str, node_classes: list[type[BaseNode] | type[BaseNebulaNode]] | None = None, timeout: float = 300.0, poll_interval: float = 1.0) -> IndexBuildReport:
+        """Creates the indexes declared on the models, then rebuilds each one over the existing data and waits for the jobs."""
+        node_classes = list(get_registry().tag_to_node_class.values()) if node_classes is None else node_classes
+        report = IndexBuildReport()
+        deadline = time.monotonic() + timeout
+        declared = [index for node_class in node_classes for index in get_declared_indexes(node_class)]
+        for index, result in zip(declared, self.create_indexes(name_space, node_classes), strict=True):
+            if result.is_succeeded:
+                report.created.append(index.name)
+            else:
+                report.errors.append(result.message)
+
+        for index_name in report.created:
+            try:
+                job_id = self._start_rebuild(name_space, index_name, deadline, poll_interval)
+            except Exception as e:
+                report.jobs.append(IndexJobStatus(index_name=index_name, status="NOT_STARTED", is_succeeded=False, message=str(e)))
+                continue
+            report.jobs.append(self.wait_for_job(name_space, job_id, index_name, timeout=max(deadline - time.monotonic(), 0.0), poll_interval=poll_interval))
+        self.invalidate(name_space)
+        return report
+
+    def _start_rebuild(self, name_space: str, index_name: str, deadline: float, poll_interval: float) -> int:
+        # A new index only reaches storaged with the next heartbeat and REBUILD fails until then, so it is retried
+        while True:
+            try:
+                return self.rebuild_tag_index(name_space, index_name)
+            except Exception:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(poll_interval)
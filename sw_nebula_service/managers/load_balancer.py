@@ -0,0 +1,159 @@
+import itertools
+import threading
+import time
+from collections.abc import Callable
+
+from nebula3.common.ttypes import ErrorCode
+from nebula3.data.ResultSet import ResultSet
+from nebula3.gclient.net import Session
+
+LOAD_BALANCING_STRATEGIES = ("round_robin", "least_outstanding")
+# Errors a read can be retried on, as graphd failed to reach storage rather than rejecting the query
+RETRYABLE_ERROR_CODES = {ErrorCode.E_RPC_FAILURE, ErrorCode.E_LEADER_CHANGED}
+# Weight of the newest sample in the per-host latency moving average
+LATENCY_SMOOTHING = 0.2
+# Only point reads and metadata statements are timed for slow host detection. LOOKUP, MATCH, GO, writes and jobs take
+# as long as the data they touch, so one export page or REBUILD would otherwise eject a healthy host
+LATENCY_SAMPLED_STATEMENTS = frozenset({"USE", "FETCH", "SHOW", "DESCRIBE"})
+
+
+class HostState:
+    def __init__(self, address: tuple[str, int]):
+        self.address = address
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.latency_average: float | None = None
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class LoadBalancer:
+    """Picks the graphd host for new sessions and ejects hosts that keep failing or are too slow.
+
+    An ejected host is re-admitted once `ejection_time` has passed; its counters start over at that point.
+    """
+
+    def __init__(
+        self,
+        addresses: list[tuple[str, int]],
+        strategy: str = "round_robin",
+        max_failures: int = 3,
+        ejection_time: float = 30.0,
+        slow_threshold: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if strategy not in LOAD_BALANCING_STRATEGIES:
+            raise ValueError(f"strategy: {strategy} is not supported, use one of {LOAD_BALANCING_STRATEGIES}")
+        self.hosts = [HostState(address) for address in addresses]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.slow_threshold = slow_threshold
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.round_robin = itertools.count()
+
+    def pick(self, exclude: set[tuple[str, int]] | frozenset = frozenset()) -> HostState:
+        with self.lock:
+            now = self.clock()
+            candidates = [host for host in self.hosts if host.address not in exclude] or self.hosts
+            available = [host for host in candidates if host.is_available(now)]
+            if not available:
+                # Every host is ejected; try the one that is due back first rather than failing outright
+                return min(candidates, key=lambda host: host.ejected_until)
+            for host in available:
+                if host.ejected_until and host.ejected_until <= now:
+                    host.ejected_until = 0.0
+                    host.consecutive_failures = 0
+                    host.latency_average = None
+            if self.strategy == "least_outstanding":
+                return min(available, key=lambda host: host.outstanding)
+            return available[next(self.round_robin) % len(available)]
+
+    def start(self, host: HostState) -> float:
+        with self.lock:
+            host.outstanding += 1
+        return self.clock()
+
+    def finish(self, host: HostState, start: float, failed: bool, sample_latency: bool = True) -> None:
+        elapsed = self.clock() - start
+        with self.lock:
+            host.outstanding -= 1
+            if failed:
+                self._record_failure(host)
+                return
+            host.consecutive_failures = 0
+            if not sample_latency:
+                return
+            host.latency_average = elapsed if host.latency_average is None else LATENCY_SMOOTHING * elapsed + (1 - LATENCY_SMOOTHING) * host.latency_average
+            if self.slow_threshold is not None and host.latency_average > self.slow_threshold:
+                self._eject(host)
+
+    def record_failure(self, host: HostState) -> None:
+        with self.lock:
+            self._record_failure(host)
+
+    def eject(self, host: HostState) -> None:
+        with self.lock:
+            self._eject(host)
+
+    def is_available(self, host: HostState) -> bool:
+        return host.is_available(self.clock())
+
+    def stats(self) -> list[dict]:
+        with self.lock:
+            now = self.clock()
+            return [
+                {
+                    "address": f"{host.address[0]}:{host.address[1]}",
+                    "available": host.is_available(now),
+                    "outstanding": host.outstanding,
+                    "consecutive_failures": host.consecutive_failures,
+                    "latency_average": host.latency_average,
+                    "ejections": host.ejections,
+                }
+                for host in self.hosts
+            ]
+
+    def _record_failure(self, host: HostState) -> None:
+        host.consecutive_failures += 1
+        if host.consecutive_failures >= self.max_failures:
+            self._eject(host)
+
+    def _eject(self, host: HostState) -> None:
+        if host.is_available(self.clock()):
+            host.ejected_until = self.clock() + self.ejection_time
+            host.ejections += 1
+
+
+class HostSession:
+    """nebula3 Session bound to one graphd host, reporting every request back to the load balancer."""
+
+    def __init__(self, session: Session, host: HostState, load_balancer: LoadBalancer):
+        self.session = session
+        self.host = host
+        self.load_balancer = load_balancer
+
+    def execute(self, query: str) -> ResultSet:
+        return self.execute_parameter(query, None)
+
+    def execute_parameter(self, query: str, params: dict | None) -> ResultSet:
+        start = self.load_balancer.start(self.host)
+        failed = True
+        try:
+            result = self.session.execute_parameter(query, params)
+            failed = False
+            return result
+        finally:
+            keyword = query.lstrip()[:16].split(" ", 1)[0].upper()
+            self.load_balancer.finish(self.host, start, failed, sample_latency=keyword in LATENCY_SAMPLED_STATEMENTS)
+
+    def ping(self) -> bool:
+        # Cached sessions on an ejected host fail their health check, so they are dropped instead of reused
+        return self.load_balancer.is_available(self.host) and self.session.ping()
+
+    def release(self) -> None:
+        self.session.release()
@@ -0,0 +1,165 @@
+import bisect
+import contextvars
+import functools
+import inspect
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from nebula3.common.ttypes import ErrorCode
+from nebula3.data.ResultSet import ResultSet
+
+METRIC_PREFIX = "sw_nebula"
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+HISTOGRAMS = {
+    "session_acquire_seconds": LATENCY_BUCKETS,
+    "use_seconds": LATENCY_BUCKETS,
+    "execute_seconds": LATENCY_BUCKETS,
+    "server_latency_seconds": LATENCY_BUCKETS,
+    "rows": ROW_BUCKETS,
+}
+
+# Error label for statements that raised instead of returning a ResultSet, such as transport failures
+EXCEPTION_ERROR = "EXCEPTION"
+
+# Name of the manager operation currently running on this thread/task, used as the metric label
+current_operation: contextvars.ContextVar[str] = contextvars.ContextVar("current_operation", default="unknown")
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # One count per bucket plus the trailing +Inf bucket, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        total = 0
+        cumulative = []
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            total += count
+            cumulative.append((str(bound), total))
+        return cumulative
+
+
+class ConnectorMetrics:
+    """In-process histograms and error counters, labelled by manager operation."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.errors: dict[tuple[str, str], int] = {}
+
+    def observe(self, name: str, value: float) -> None:
+        key = (name, current_operation.get())
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(HISTOGRAMS[name])
+            histogram.observe(value)
+
+    def observe_result(self, result: ResultSet, elapsed: float) -> None:
+        self.observe("execute_seconds", elapsed)
+        if result.is_succeeded():
+            self.observe("server_latency_seconds", result.latency() / 1_000_000)
+            self.observe("rows", result.row_size())
+        else:
+            self.count_error(ErrorCode._VALUES_TO_NAMES.get(result.error_code(), str(result.error_code())))
+
+    def observe_exception(self, elapsed: float) -> None:
+        self.observe("execute_seconds", elapsed)
+        self.count_error(EXCEPTION_ERROR)
+
+    def count_error(self, error_code: str) -> None:
+        key = (current_operation.get(), error_code)
+        with self.lock:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def reset(self) -> None:
+        with self.lock:
+            self.histograms.clear()
+            self.errors.clear()
+
+    def snapshot(self, pool: dict[str, int] | None = None) -> dict[str, Any]:
+        with self.lock:
+            histograms: dict[str, dict[str, Any]] = {}
+            for (name, operation), histogram in self.histograms.items():
+                histograms.setdefault(name, {})[operation] = {"count": histogram.count, "sum": histogram.sum, "buckets": dict(histogram.cumulative_counts())}
+            errors: dict[str, dict[str, int]] = {}
+            for (operation, error_code), count in self.errors.items():
+                errors.setdefault(operation, {})[error_code] = count
+        return {"histograms": histograms, "errors": errors, "pool": pool or {}}
+
+    def to_prometheus(self, pool: dict[str, int] | None = None) -> str:
+        snapshot = self.snapshot(pool)
+        lines = []
+        for name, operations in sorted(snapshot["histograms"].items()):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} histogram")
+            for operation, histogram in sorted(operations.items()):
+                for bound, count in histogram["buckets"].items():
+                    lines.append(f'{METRIC_PREFIX}_{name}_bucket{{operation="{operation}",le="{bound}"}} {count}')
+                lines.append(f'{METRIC_PREFIX}_{name}_sum{{operation="{operation}"}} {histogram["sum"]}')
+                lines.append(f'{METRIC_PREFIX}_{name}_count{{operation="{operation}"}} {histogram["count"]}')
+        lines.append(f"# TYPE {METRIC_PREFIX}_errors_total counter")
+        for operation, error_codes in sorted(snapshot["errors"].items()):
+            for error_code, count in sorted(error_codes.items()):
+                lines.append(f'{METRIC_PREFIX}_errors_total{{operation="{operation}",error_code="{error_code}"}} {count}')
+        pool = dict(snapshot["pool"])
+        # A host count, not a session count, so it gets its own gauge
+        hosts_available = pool.pop("hosts_available", None)
+        lines.append(f"# TYPE {METRIC_PREFIX}_pool_sessions gauge")
+        for state, count in pool.items():
+            lines.append(f'{METRIC_PREFIX}_pool_sessions{{state="{state}"}} {count}')
+        if hosts_available is not None:
+            lines.append(f"# TYPE {METRIC_PREFIX}_hosts_available gauge")
+            lines.append(f"{METRIC_PREFIX}_hosts_available {hosts_available}")
+        return "\n".join(lines) + "\n"
+
+
+def instrumented(cls: type) -> type:
+    """Class decorator that labels statements executed inside a public method with "ClassName.method", the innermost method wins."""
+    for name, func in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(func):
+            continue
+        setattr(cls, name, _with_operation(func, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _with_operation(func: Callable, operation: str) -> Callable:
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            # The label is only set while the generator body runs, not while the caller holds a yielded item
+            generator = func(*args, **kwargs)
+            try:
+                while True:
+                    token = current_operation.set(operation)
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        current_operation.reset(token)
+                    yield item
+            finally:
+                generator.close()
+
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_operation.set(operation)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+
+    return wrapper
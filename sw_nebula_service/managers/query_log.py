@@ -0,0 +1,65 @@
+import logging
+import random
+
+from nebula3.data.ResultSet import ResultSet
+from pydantic import BaseModel, field_validator
+
+QUERY_LOGGER_NAME = "sw_nebula_service.queries"
+
+
+class QueryLogConfig(BaseModel):
+    enabled: bool = False
+    # Level per statement keyword (INSERT, FETCH, USE, ...), anything not listed is logged at default_level
+    levels: dict[str, str] = {}
+    default_level: str = "DEBUG"
+    # Failed statements are always logged, at least at this level, regardless of sampling
+    error_level: str = "WARNING"
+    sample_rate: float = 1.0
+    max_length: int = 1000
+    logger_name: str = QUERY_LOGGER_NAME
+
+    @field_validator("default_level", "error_level")
+    @classmethod
+    def check_level(cls, level: str) -> str:
+        return _check_level_name(level)
+
+    @field_validator("levels")
+    @classmethod
+    def check_levels(cls, levels: dict[str, str]) -> dict[str, str]:
+        return {keyword.upper(): _check_level_name(level) for keyword, level in levels.items()}
+
+
+def _check_level_name(level: str) -> str:
+    # getLevelName maps an unknown name to the string "Level <name>" instead of failing
+    if not isinstance(logging.getLevelName(level.upper()), int):
+        raise ValueError(f"level: {level} is not a logging level name")
+    return level.upper()
+
+
+class QueryLogger:
+    """Logs executed statements through the standard logging module. Only built by the Connector when logging is enabled."""
+
+    def __init__(self, config: QueryLogConfig):
+        self.config = config
+        self.logger = logging.getLogger(config.logger_name)
+        self.levels = {keyword: logging.getLevelName(level) for keyword, level in config.levels.items()}
+        self.default_level = logging.getLevelName(config.default_level)
+        self.error_level = logging.getLevelName(config.error_level)
+
+    def log(self, query: str, result: ResultSet, name_space: str | None) -> None:
+        is_succeeded = result.is_succeeded()
+        if is_succeeded and self.config.sample_rate < 1.0 and random.random() >= self.config.sample_rate:  # noqa: S311
+            return
+        keyword = query.lstrip()[:16].split(" ", 1)[0].upper()
+        level = self.levels.get(keyword, self.default_level)
+        if not is_succeeded:
+            level = max(level, self.error_level)
+        if not self.logger.isEnabledFor(level):
+            return
+
+        statement = query if len(query) <= self.config.max_length else f"{query[: self.config.max_length]}... ({len(query)} chars)"
+        extra = {"statement": keyword, "name_space": name_space, "latency_us": result.latency(), "is_succeeded": is_succeeded}
+        if is_succeeded:
+            self.logger.log(level, "%s %dus: %s", keyword, extra["latency_us"], statement, extra=extra)
+        else:
+            self.logger.log(level, "%s failed (%s): %s", keyword, result.error_msg(), statement, extra=extra)
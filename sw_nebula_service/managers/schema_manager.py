@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+from sw_onto_generation.base.base_relation import BaseRelation
+
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.edge_type_manager import EdgeTypeManager
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement
+from sw_nebula_service.managers.tag_manager import TagManager
+from sw_nebula_service.managers.utils import convert_fields_of_class_to_nebula_types, get_edge_type_fields, get_relation_endpoint_defaults
+from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.models.relations import BaseNebulaRelation
+from sw_nebula_service.registry import get_registry
+
+DEFAULT_FINGERPRINT_CACHE = Path.home() / ".cache" / "sw_nebula_service" / "schema_fingerprints.json"
+
+# DESCRIBE reports canonical type names, which differ from some of the names used in CREATE statements
+NEBULA_TYPE_ALIASES = {"int": "int64"}
+
+
+class SchemaDiff(BaseModel):
+    statements: list[str] = []
+    # Properties whose type differs from the model; these are reported but never changed automatically
+    drift: list[str] = []
+
+
+class SchemaSyncResult(BaseModel):
+    is_succeeded: bool
+    skipped: bool = False
+    fingerprint: str
+    statements: list[str] = []
+    drift: list[str] = []
+    message: str | None = None
+
+
+@instrumented
+class SchemaManager:
+    def __init__(self, connector: Connector, tag_manager: TagManager, edge_type_manager: EdgeTypeManager, fingerprint_cache: Path = DEFAULT_FINGERPRINT_CACHE):
+        self.connector = connector
+        self.tag_manager = tag_manager
+        self.edge_type_manager = edge_type_manager
+        self.fingerprint_cache = fingerprint_cache
+
+    def sync(
+        self,
+        name_space: str,
+        node_classes: list[type[BaseNode] | type[BaseNebulaNode]] | None = None,
+        relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]] | None = None,
+        force: bool = False,
+    ) -> SchemaSyncResult:
+        registry = get_registry()
+        node_classes = list(registry.tag_to_node_class.values()) if node_classes is None else node_classes
+        relation_classes = list(registry.edge_type_to_relation_class.values()) if relation_classes is None else relation_classes
+        fingerprint = self.fingerprint(node_classes, relation_classes)
+        addresses = ",".join(f"{host}:{port}" for host, port in self.connector.connector_config.graphd_addresses)
+        cache_key = f"{addresses}/{name_space}"
+        fingerprints = self._load_fingerprints()
+        # The tag count catches a space that was dropped and recreated since the fingerprint was cached
+        existing_tags = set(self.tag_manager.get_all_tags(name_space))
+        if not force and fingerprints.get(cache_key) == {"fingerprint": fingerprint, "tags": len(existing_tags)}:
+            return SchemaSyncResult(is_succeeded=True, skipped=True, fingerprint=fingerprint, message="Schema unchanged since last sync")
+
+        diff = self.diff(name_space, node_classes, relation_classes)
+        if diff.statements:
+            with self.connector.session(name_space) as session:
+                result = session.execute("; ".join(diff.statements))
+                if not result.is_succeeded():
+                    return SchemaSyncResult(is_succeeded=False, fingerprint=fingerprint, statements=diff.statements, drift=diff.drift, message=f"Failed to sync schema: {result.error_msg()}")
+
+        # Drift is left for a human to resolve, so the fingerprint is only cached once the schema fully matches
+        if not diff.drift:
+            fingerprints[cache_key] = {"fingerprint": fingerprint, "tags": len(existing_tags | {registry.get_tag_name(node_class) for node_class in node_classes})}
+            self._save_fingerprints(fingerprints)
+        return SchemaSyncResult(is_succeeded=True, fingerprint=fingerprint, statements=diff.statements, drift=diff.drift, message=f"Applied {len(diff.statements)} schema statements")
+
+    def diff(self, name_space: str, node_classes: list[type[BaseNode] | type[BaseNebulaNode]], relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]]) -> SchemaDiff:
+        registry = get_registry()
+        diff = SchemaDiff()
+
+        current_tags = self.tag_manager.get_tag_schemas(name_space)
+        for node_class in node_classes:
+            tag_name = registry.get_tag_name(node_class)
+            fields = convert_fields_of_class_to_nebula_types(node_class)
+            if tag_name not in current_tags:
+                diff.statements.append(get_statement("create_tag").render(tag_name=tag_name, fields=", ".join(fields)))
+                continue
+            self._diff_properties("TAG", tag_name, fields, current_tags[tag_name], diff)
+
+        current_edges = self.edge_type_manager.get_edge_type_schemas(name_space)
+        for relation_class in relation_classes:
+            edge_type = registry.get_edge_type(relation_class)
+            fields = get_edge_type_fields(relation_class)
+            if edge_type not in current_edges:
+                diff.statements.append(get_statement("create_edge").render(edge_type=edge_type, fields=", ".join(fields)))
+                continue
+            self._diff_properties("EDGE", edge_type, fields, current_edges[edge_type], diff)
+        return diff
+
+    @staticmethod
+    def fingerprint(node_classes: list[type[BaseNode] | type[BaseNebulaNode]], relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]]) -> str:
+        registry = get_registry()
+        schema = {
+            "tags": {registry.get_tag_name(node_class): convert_fields_of_class_to_nebula_types(node_class) for node_class in node_classes},
+            "edges": {registry.get_edge_type(relation_class): get_relation_endpoint_defaults(relation_class) for relation_class in relation_classes},
+        }
+        return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def _diff_properties(kind: str, name: str, fields: list[str], current: dict[str, str], diff: SchemaDiff) -> None:
+        missing = []
+        for field in fields:
+            field_name, field_type = field.split(" ")[:2]
+            if field_name not in current:
+                missing.append(field)
+            elif NEBULA_TYPE_ALIASES.get(field_type, field_type) != current[field_name]:
+                diff.drift.append(f"{kind.lower()} {name}.{field_name} is {current[field_name]} but the model declares {field_type}")
+        if missing:
+            diff.statements.append(get_statement("alter_schema").render(kind=kind, name=name, fields=", ".join(missing)))
+
+    def _load_fingerprints(self) -> dict[str, dict[str, Any]]:
+        try:
+            return json.loads(self.fingerprint_cache.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_fingerprints(self, fingerprints: dict[str, dict[str, Any]]) -> None:
+        self.fingerprint_cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.fingerprint_cache.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(fingerprints, indent=2))
+        os.replace(tmp_path, self.fingerprint_cache)
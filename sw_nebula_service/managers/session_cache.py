@@ -0,0 +1,193 @@
+import threading
+import time
+from collections.abc import Callable
+
+from nebula3.common.ttypes import ErrorCode
+from nebula3.data.ResultSet import ResultSet
+from nebula3.gclient.net import Session
+
+from sw_nebula_service.managers.metrics import EXCEPTION_ERROR, ConnectorMetrics
+from sw_nebula_service.managers.query_log import QueryLogger
+from sw_nebula_service.managers.statements import get_statement
+
+SESSION_EXPIRED_ERROR_CODES = {ErrorCode.E_SESSION_INVALID, ErrorCode.E_SESSION_TIMEOUT}
+
+
+class PooledSession:
+    """Wraps an authenticated nebula3 session, remembers its current space and re-authenticates when the server expires it."""
+
+    def __init__(self, session_factory: Callable[[], Session], query_logger: QueryLogger | None = None, metrics: ConnectorMetrics | None = None):
+        self.session_factory = session_factory
+        self.query_logger = query_logger
+        self.metrics = metrics
+        self.session = session_factory()
+        self.name_space: str | None = None
+        self.last_used = time.monotonic()
+
+    def execute(self, query: str) -> ResultSet:
+        return self.execute_parameter(query, None)
+
+    def execute_parameter(self, query: str, params: dict | None) -> ResultSet:
+        if self.metrics is None:
+            return self._execute(query, params)
+        start = time.perf_counter()
+        try:
+            result = self._execute(query, params)
+        except Exception:
+            self.metrics.observe_exception(time.perf_counter() - start)
+            raise
+        self.metrics.observe_result(result, time.perf_counter() - start)
+        return result
+
+    def _execute(self, query: str, params: dict | None) -> ResultSet:
+        result = self.session.execute_parameter(query, params)
+        if result.error_code() in SESSION_EXPIRED_ERROR_CODES:
+            self.reauthenticate()
+            result = self.session.execute_parameter(query, params)
+        if self.query_logger is not None:
+            self.query_logger.log(query, result, self.name_space)
+        return result
+
+    def use(self, name_space: str) -> None:
+        if self.name_space == name_space:
+            return
+        start = time.perf_counter()
+        try:
+            result = self._execute(get_statement("use_space").render(name_space=name_space), None)
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.count_error(EXCEPTION_ERROR)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe("use_seconds", time.perf_counter() - start)
+        if not result.is_succeeded():
+            raise Exception(f"Failed to use namespace {name_space}: {result.error_msg()}")
+        self.name_space = name_space
+
+    def reauthenticate(self) -> None:
+        self.release()
+        self.session = self.session_factory()
+        if self.name_space:
+            # Set the space on the raw session so a second expiry cannot recurse through execute()
+            result = self.session.execute(get_statement("use_space").render(name_space=self.name_space))
+            if not result.is_succeeded():
+                self.name_space = None
+                raise Exception(f"Failed to use namespace after re-authentication: {result.error_msg()}")
+
+    def ping(self) -> bool:
+        try:
+            return self.session.ping()
+        except Exception:
+            return False
+
+    def release(self) -> None:
+        try:
+            self.session.release()
+        except Exception:  # noqa: S110
+            # The server may already have dropped an expired session
+            pass
+
+
+class SessionCache:
+    """Bounded pool of authenticated sessions, looked up by the space they are currently using."""
+
+    def __init__(
+        self, session_factory: Callable[[], Session], max_size: int, idle_timeout: float, health_check_interval: float, query_logger: QueryLogger | None = None, metrics: ConnectorMetrics | None = None
+    ):
+        self.session_factory = session_factory
+        self.query_logger = query_logger
+        self.metrics = metrics
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.idle_sessions: dict[str | None, list[PooledSession]] = {}
+        self.size = 0
+        self.condition = threading.Condition()
+
+    @property
+    def idle_count(self) -> int:
+        with self.condition:
+            return sum(len(sessions) for sessions in self.idle_sessions.values())
+
+    @property
+    def active_count(self) -> int:
+        with self.condition:
+            return self.size - sum(len(sessions) for sessions in self.idle_sessions.values())
+
+    def acquire(self, name_space: str | None = None) -> PooledSession:
+        while True:
+            with self.condition:
+                expired = self._pop_expired()
+                session = self._pop_idle(name_space)
+                while session is None and self.size >= self.max_size:
+                    self.condition.wait()
+                    session = self._pop_idle(name_space)
+                if session is None:
+                    self.size += 1
+            self._release_all(expired)
+
+            if session is None:
+                try:
+                    session = PooledSession(self.session_factory, self.query_logger, self.metrics)
+                except Exception:
+                    self._forget()
+                    raise
+            elif time.monotonic() - session.last_used > self.health_check_interval and not session.ping():
+                session.release()
+                self._forget()
+                continue
+
+            try:
+                if name_space:
+                    session.use(name_space)
+            except Exception:
+                self.release(session, discard=True)
+                raise
+            return session
+
+    def release(self, session: PooledSession, discard: bool = False) -> None:
+        if discard:
+            session.release()
+            self._forget()
+            return
+        session.last_used = time.monotonic()
+        with self.condition:
+            self.idle_sessions.setdefault(session.name_space, []).append(session)
+            self.condition.notify()
+
+    def close(self) -> None:
+        with self.condition:
+            sessions = [session for idle in self.idle_sessions.values() for session in idle]
+            self.size -= len(sessions)
+            self.idle_sessions.clear()
+        self._release_all(sessions)
+
+    def _pop_idle(self, name_space: str | None) -> PooledSession | None:
+        # Prefer a session already on the requested space, otherwise take the least recently used one and switch it
+        if self.idle_sessions.get(name_space):
+            return self.idle_sessions[name_space].pop()
+        candidates = [sessions for sessions in self.idle_sessions.values() if sessions]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda sessions: sessions[0].last_used).pop(0)
+
+    def _pop_expired(self) -> list[PooledSession]:
+        deadline = time.monotonic() - self.idle_timeout
+        expired = []
+        for name_space, sessions in self.idle_sessions.items():
+            expired.extend(session for session in sessions if session.last_used < deadline)
+            self.idle_sessions[name_space] = [session for session in sessions if session.last_used >= deadline]
+        self.size -= len(expired)
+        if expired:
+            self.condition.notify(len(expired))
+        return expired
+
+    def _forget(self) -> None:
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    @staticmethod
+    def _release_all(sessions: list[PooledSession]) -> None:
+        for session in sessions:
+            session.release()
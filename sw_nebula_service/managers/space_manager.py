@@ -1,20 +1,17 @@
 from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement
 from sw_nebula_service.managers.utils import NebulaBooleanQueryResult
 
 
+@instrumented
 class SpaceManager:
     def __init__(self, connector: Connector):
         self.connector = connector
 
     def create_namespace(self, name_space: str, partition_num: int = 100, replica_factor: int = 1, vid_type: str = "INT64") -> NebulaBooleanQueryResult:
         with self.connector.session() as session:
-            query = f"""
-            CREATE SPACE IF NOT EXISTS {name_space} (
-                partition_num = {partition_num},
-                replica_factor = {replica_factor},
-                vid_type = {vid_type}
-            )
-            """
+            query = get_statement("create_space").render(name_space=name_space, partition_num=partition_num, replica_factor=replica_factor, vid_type=vid_type)
             result = session.execute(query)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully created space {name_space}")
@@ -23,7 +20,7 @@ class SpaceManager:
 
     def delete_namespace(self, name_space: str) -> NebulaBooleanQueryResult:
         with self.connector.session() as session:
-            query = f"DROP SPACE {name_space}"
+            query = get_statement("drop_space").render(name_space=name_space)
             result = session.execute(query)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully deleted space {name_space}")
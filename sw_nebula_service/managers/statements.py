@@ -0,0 +1,138 @@
+import functools
+import re
+import string
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime
+from typing import Any
+
+from nebula3.common import ttypes
+
+from sw_nebula_service.managers.utils import format_string_value
+
+# $name placeholders, but not the $$ / $^ / $- references of GO and pipes
+PARAMETER_PATTERN = re.compile(r"\$([A-Za-z_]\w*)")
+
+# Only the tag or edge type and its field list are compiled in, so the cache is bounded by the schema
+FIXED_PARTS = frozenset({"tag_name", "edge_type", "field_names"})
+STATEMENT_CACHE_SIZE = 1024
+
+# `{slot}`s named in `get_statement` are compiled into the text once, the remaining ones are filled per call with
+# already rendered nGQL and `$name`s are bound through execute_parameter
+STATEMENTS = {
+    "use_space": "USE {name_space}",
+    "create_space": "CREATE SPACE IF NOT EXISTS {name_space} (partition_num = {partition_num}, replica_factor = {replica_factor}, vid_type = {vid_type})",
+    "drop_space": "DROP SPACE {name_space}",
+    "show_tags": "SHOW TAGS",
+    "create_tag": "CREATE TAG IF NOT EXISTS {tag_name} ({fields})",
+    "describe_tag": "DESCRIBE TAG {tag_name}",
+    "drop_tag": "DROP TAG IF EXISTS {tag_name}",
+    "create_tag_index": "CREATE TAG INDEX IF NOT EXISTS {index_name} ON {tag_name}({fields})",
+    "show_tag_indexes": "SHOW TAG INDEXES",
+    "show_tag_index_status": "SHOW TAG INDEX STATUS",
+    "rebuild_tag_index": "REBUILD TAG INDEX {index_name}",
+    "show_job": "SHOW JOB {job_id}",
+    "show_edges": "SHOW EDGES",
+    "create_edge": "CREATE EDGE IF NOT EXISTS {edge_type}({fields})",
+    "describe_edge": "DESCRIBE EDGE {edge_type}",
+    "create_edge_index": "CREATE EDGE INDEX IF NOT EXISTS {index_name} ON {edge_type}()",
+    # kind is TAG or EDGE
+    "alter_schema": "ALTER {kind} {name} ADD ({fields})",
+    "insert_vertices": "INSERT VERTEX {tag_name} ({field_names}) VALUES {rows}",
+    "update_vertex": "UPDATE VERTEX ON {tag_name} {vid} SET {assignments}",
+    "fetch_vertices": "FETCH PROP ON * {vids} YIELD vertex AS n",
+    "match_vertices": "MATCH (n:{tag_name}) RETURN n",
+    # Nebula does not push the cursor filter below ORDER BY: every page scans and sorts the whole tag or edge type, so
+    # reading N rows costs O(N^2 / page_size) on the server and the readers default to large pages
+    "match_vertices_page": "MATCH (n:{tag_name}) RETURN {returns} ORDER BY vid LIMIT {page_size}",
+    "match_vertices_page_after": "MATCH (n:{tag_name}) WHERE id(n) > $cursor RETURN {returns} ORDER BY vid LIMIT {page_size}",
+    "lookup_tag": "LOOKUP ON {tag_name} YIELD {yields}",
+    "lookup_tag_where": "LOOKUP ON {tag_name} WHERE {where} YIELD {yields}",
+    "match_vertices_where": "MATCH (n:{tag_name}) WHERE {where} RETURN n",
+    "insert_edges": "INSERT EDGE IF NOT EXISTS {edge_type} ({field_names}) VALUES {rows}",
+    "lookup_edge": "LOOKUP ON {edge_type} YIELD {yields}",
+    "match_edges_page": "MATCH ()-[e:{edge_type}]->() RETURN {returns} ORDER BY src, dst, rank LIMIT {page_size}",
+    "match_edges_page_after": (
+        "MATCH ()-[e:{edge_type}]->() WHERE src(e) > $src OR (src(e) == $src AND dst(e) > $dst) OR (src(e) == $src AND dst(e) == $dst AND rank(e) > $rank)"
+        " RETURN {returns} ORDER BY src, dst, rank LIMIT {page_size}"
+    ),
+    # The root is fetched in the same request, GO only yields the vertices it steps onto
+    "get_subtree": (
+        'FETCH PROP ON * {root_vid} YIELD "" AS src, id(vertex) AS dst, "" AS edge_type, vertex AS node'
+        " UNION ALL "
+        "GO 1 TO {max_depth} STEPS FROM {root_vid} OVER {over} YIELD src(edge) AS src, dst(edge) AS dst, type(edge) AS edge_type, $$ AS node{limit_clause}"
+    ),
+}
+
+
+class StatementTemplate:
+    """nGQL statement with its fixed parts rendered once, so a call only joins the per-call fragments back in."""
+
+    def __init__(self, text: str, parameters: frozenset[str] = frozenset()):
+        self.parts = [(literal, slot) for literal, slot, _, _ in string.Formatter().parse(text)]
+        self.slots = {slot for _, slot in self.parts if slot is not None}
+        # The finished statement when nothing is left to fill per call
+        self.text = text if self.slots else "".join([literal for literal, _ in self.parts])
+        # The `$name`s written in the STATEMENTS template, not ones that arrive inside fixed parts or slots
+        self.parameters = parameters
+
+    def render(self, **slots: str | int) -> str:
+        if not self.slots:
+            return self.text
+        return "".join([f"{literal}{slots[slot]}" if slot is not None else literal for literal, slot in self.parts])
+
+    def bind(self, params: Mapping[str, Any], **slots: str | int) -> tuple[str, dict[str, ttypes.Value]]:
+        """Returns the statement and its execute_parameter params; `params` covers the template's `$name`s and any a rendered slot adds."""
+        missing = self.parameters - params.keys()
+        if missing:
+            raise ValueError(f"Parameters {sorted(missing)} are not bound")
+        return self.render(**slots), {name: to_nebula_value(value) for name, value in params.items()}
+
+
+class _KeepSlots(dict):
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def get_statement(operation: str, **fixed: str) -> StatementTemplate:
+    """Compiles the statement for an operation and tag/edge type with its field list once and caches it."""
+    unknown = fixed.keys() - FIXED_PARTS
+    if unknown:
+        raise ValueError(f"Only {sorted(FIXED_PARTS)} can be compiled into a statement, render {sorted(unknown)} per call")
+    template = STATEMENTS[operation]
+    parameters = frozenset(name for literal, _, _, _ in string.Formatter().parse(template) for name in PARAMETER_PATTERN.findall(literal))
+    # Braces in the fixed parts are escaped so they survive the second parse as literal text
+    escaped = {key: value.replace("{", "{{").replace("}", "}}") for key, value in fixed.items()}
+    return StatementTemplate(template.format_map(_KeepSlots(escaped)), parameters)
+
+
+def quote_vid(vid: str) -> str:
+    return format_string_value(vid)
+
+
+def quote_vids(vids: Sequence[str]) -> str:
+    return ", ".join([format_string_value(vid) for vid in vids])
+
+
+def to_nebula_value(value: Any) -> ttypes.Value:
+    # Not nebula3's _cast_value, which checks date before datetime and so sends every datetime as a date
+    result = ttypes.Value()
+    if value is None:
+        result.set_nVal(ttypes.NullType.__NULL__)
+    elif isinstance(value, bool):
+        result.set_bVal(value)
+    elif isinstance(value, int):
+        result.set_iVal(value)
+    elif isinstance(value, float):
+        result.set_fVal(value)
+    elif isinstance(value, str):
+        result.set_sVal(value.encode())
+    elif isinstance(value, datetime):
+        result.set_dtVal(ttypes.DateTime(value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond))
+    elif isinstance(value, date):
+        result.set_dVal(ttypes.Date(value.year, value.month, value.day))
+    elif isinstance(value, list | tuple):
+        result.set_lVal(ttypes.NList([to_nebula_value(item) for item in value]))
+    else:
+        raise ValueError(f"value: {value} is not supported as a query parameter")
+    return result
@@ -2,18 +2,30 @@ from pydantic import BaseModel
 from sw_onto_generation.base.base_node import BaseNode
 
 from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.index_manager import IndexManager
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement
 from sw_nebula_service.managers.utils import NebulaBooleanQueryResult, convert_fields_of_class_to_nebula_types, pascal_case_to_snake_case
 from sw_nebula_service.models.nodes import BaseNebulaNode
 
 
+@instrumented
 class TagManager:
-    def __init__(self, connector: Connector):
+    def __init__(self, connector: Connector, index_manager: IndexManager | None = None):
         self.connector = connector
+        # Told about index changes, so find_vertices does not keep using a stale index listing
+        self.index_manager = index_manager
+
+    def _invalidate_indexes(self, name_space: str) -> None:
+        if self.index_manager is not None:
+            self.index_manager.invalidate(name_space)
 
     def create_tag(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]) -> NebulaBooleanQueryResult:
-        tag_name = pascal_case_to_snake_case(node_class.__name__)
-        fields = convert_fields_of_class_to_nebula_types(node_class)
-        query = f"CREATE TAG IF NOT EXISTS {tag_name} ({', '.join(fields)})"
+        return self.create_tag_from_fields(name_space, pascal_case_to_snake_case(node_class.__name__), convert_fields_of_class_to_nebula_types(node_class))
+
+    def create_tag_from_fields(self, name_space: str, tag_name: str, fields: list[str]) -> NebulaBooleanQueryResult:
+        # fields are nGQL property definitions such as "name string"
+        query = get_statement("create_tag").render(tag_name=tag_name, fields=", ".join(fields))
         with self.connector.session(name_space) as session:
             result = session.execute(query)
             if result.is_succeeded():
@@ -23,8 +35,9 @@ class TagManager:
 
     def create_tag_index(self, name_space: str, tag_name: str, index_name: str) -> NebulaBooleanQueryResult:
         with self.connector.session(name_space) as session:
-            query = f"CREATE TAG INDEX IF NOT EXISTS {index_name} ON {tag_name}()"
+            query = get_statement("create_tag_index").render(index_name=index_name, tag_name=tag_name, fields="")
             result = session.execute(query)
+            self._invalidate_indexes(name_space)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully created index {index_name} for tag {tag_name}")
             else:
@@ -32,27 +45,41 @@ class TagManager:
 
     def create_index_on_tag_property(self, name_space: str, tag_name: str, index_name: str, property_name: str, index_length: int = 100) -> NebulaBooleanQueryResult:
         with self.connector.session(name_space) as session:
-            query = f"CREATE TAG INDEX IF NOT EXISTS {index_name} ON {tag_name}({property_name}({index_length}))"
+            query = get_statement("create_tag_index").render(index_name=index_name, tag_name=tag_name, fields=f"{property_name}({index_length})")
             result = session.execute(query)
+            self._invalidate_indexes(name_space)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully created index {index_name} for tag {tag_name}")
             else:
                 return NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to create index {index_name} for tag {tag_name}: {result.error_msg()}")
 
     def get_all_tags(self, name_space: str) -> list[str]:
+        tags = []
+        result = self.connector.execute_read(name_space, get_statement("show_tags").text)
+        if result.is_succeeded():
+            for res in result.as_primitive():
+                tags.append(res["Name"])
+            return tags
+        else:
+            raise Exception(f"Failed to get all tags: {result.error_msg()}")
+
+    def get_tag_schemas(self, name_space: str) -> dict[str, dict[str, str]]:
+        # SHOW TAGS plus one DESCRIBE TAG per tag, all on a single session
         with self.connector.session(name_space) as session:
-            tags = []
-            result = session.execute("SHOW TAGS")
-            if result.is_succeeded():
-                for res in result.as_primitive():
-                    tags.append(res["Name"])
-                return tags
-            else:
+            result = session.execute(get_statement("show_tags").text)
+            if not result.is_succeeded():
                 raise Exception(f"Failed to get all tags: {result.error_msg()}")
+            schemas = {}
+            for res in result.as_primitive():
+                describe_result = session.execute(get_statement("describe_tag").render(tag_name=res["Name"]))
+                if not describe_result.is_succeeded():
+                    raise Exception(f"Failed to describe tag {res['Name']}: {describe_result.error_msg()}")
+                schemas[res["Name"]] = {row["Field"]: row["Type"] for row in describe_result.as_primitive()}
+            return schemas
 
     def drop_tag(self, name_space: str, tag_name: str) -> NebulaBooleanQueryResult:
         with self.connector.session(name_space) as session:
-            query = f"DROP TAG IF EXISTS {tag_name}"
+            query = get_statement("drop_tag").render(tag_name=tag_name)
             result = session.execute(query)
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Successfully dropped tag {tag_name}")
@@ -0,0 +1,198 @@
+import json
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+from sw_onto_generation.base.base_relation import BaseRelation
+
+from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.managers.edge_type_manager import EdgeTypeManager
+from sw_nebula_service.managers.frames import FRAME_PAGE_SIZE
+from sw_nebula_service.managers.tag_manager import TagManager
+from sw_nebula_service.managers.utils import convert_fields_of_class_to_nebula_types, get_edge_type_fields
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.models.relations import BaseNebulaRelation
+from sw_nebula_service.registry import get_registry
+
+MANIFEST_FILE = "manifest.json"
+CHECKPOINT_FILE = "checkpoint.json"
+# Marks NULL in CSV files so that empty strings survive a round trip
+CSV_NULL = r"\N"
+# graphd picks up new tags and edge types on its next heartbeats, two cycles at the default 10s interval
+SCHEMA_PROPAGATION_WAIT = 20.0
+
+
+class TransferReport(BaseModel):
+    vertices: int = 0
+    edges: int = 0
+    failed_vids: list[str] = []
+    failed_edges: list[tuple[str, str, str]] = []
+    files: list[str] = []
+
+
+class TransferManager:
+    """Streams a whole space to one CSV/Parquet file per tag and edge type, and loads such an export back."""
+
+    def __init__(self, tag_manager: TagManager, edge_type_manager: EdgeTypeManager, vertex_manager: VertexManager, edge_manager: EdgeManager):
+        self.tag_manager = tag_manager
+        self.edge_type_manager = edge_type_manager
+        self.vertex_manager = vertex_manager
+        self.edge_manager = edge_manager
+
+    def export_space(
+        self,
+        name_space: str,
+        directory: str | Path,
+        node_classes: list[type[BaseNode] | type[BaseNebulaNode]] | None = None,
+        relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]] | None = None,
+        file_format: str = "csv",
+        page_size: int = FRAME_PAGE_SIZE,
+    ) -> TransferReport:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        registry = get_registry()
+        node_classes = list(registry.tag_to_node_class.values()) if node_classes is None else node_classes
+        relation_classes = list(registry.edge_type_to_relation_class.values()) if relation_classes is None else relation_classes
+        existing_tags = set(self.tag_manager.get_all_tags(name_space))
+        existing_edge_types = set(self.edge_type_manager.get_all_edge_types(name_space))
+
+        report = TransferReport()
+        manifest: dict[str, Any] = {"name_space": name_space, "format": file_format, "tags": {}, "edges": {}}
+        for node_class in node_classes:
+            tag_name = registry.get_tag_name(node_class)
+            if tag_name not in existing_tags:
+                continue
+            file_name = f"tags/{tag_name}.{file_format}"
+            frames = self.vertex_manager.iter_vertices_frames(name_space, node_class, page_size=page_size)
+            report.vertices += self._write_frames(directory / file_name, frames, file_format)
+            manifest["tags"][tag_name] = {"fields": convert_fields_of_class_to_nebula_types(node_class), "file": file_name}
+            report.files.append(file_name)
+
+        for relation_class in relation_classes:
+            edge_type = registry.get_edge_type(relation_class)
+            if edge_type not in existing_edge_types:
+                continue
+            file_name = f"edges/{edge_type}.{file_format}"
+            frames = self.edge_manager.iter_edges_frames(name_space, relation_class, page_size=page_size)
+            report.edges += self._write_frames(directory / file_name, frames, file_format)
+            manifest["edges"][edge_type] = {"fields": get_edge_type_fields(relation_class), "file": file_name}
+            report.files.append(file_name)
+
+        (directory / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+        return report
+
+    def import_space(
+        self, name_space: str, directory: str | Path, batch_size: int = 500, chunk_size: int = 10_000, resume: bool = True, schema_wait: float = SCHEMA_PROPAGATION_WAIT
+    ) -> TransferReport:
+        directory = Path(directory)
+        manifest = json.loads((directory / MANIFEST_FILE).read_text())
+        if self._create_schema(name_space, manifest):
+            time.sleep(schema_wait)
+        checkpoint_path = directory / CHECKPOINT_FILE
+        checkpoint: dict[str, int] = json.loads(checkpoint_path.read_text()) if resume and checkpoint_path.exists() else {}
+        registry = get_registry()
+        report = TransferReport()
+
+        # Vertices first, so every edge endpoint exists by the time edges are written
+        for tag_name, entry in manifest["tags"].items():
+            node_class = registry.get_node_class(tag_name)
+            for frame in self._read_frames(directory / entry["file"], manifest["format"], chunk_size, skip_rows=checkpoint.get(entry["file"], 0)):
+                records = frame.to_dict("records")
+                nodes = [node_class(**{key: value for key, value in record.items() if key != "vid"}) for record in records]
+                results = self.vertex_manager.insert_vertices(name_space, nodes, [record["vid"] for record in records], batch_size=batch_size)
+                report.vertices += len(records)
+                report.failed_vids.extend(vid for result in results for vid in result.failed_vids)
+                self._save_checkpoint(checkpoint_path, checkpoint, entry["file"], len(records))
+            report.files.append(entry["file"])
+
+        for edge_type, entry in manifest["edges"].items():
+            for frame in self._read_frames(directory / entry["file"], manifest["format"], chunk_size, skip_rows=checkpoint.get(entry["file"], 0)):
+                records = frame.to_dict("records")
+                edges = [(edge_type, record["src"], record["dst"], {key: value for key, value in record.items() if key not in ("src", "dst", "rank")}) for record in records]
+                results = self.edge_manager.insert_edges(name_space, edges, batch_size=batch_size)
+                report.edges += len(records)
+                report.failed_edges.extend(edge for result in results for edge in result.failed_edges)
+                self._save_checkpoint(checkpoint_path, checkpoint, entry["file"], len(records))
+            report.files.append(entry["file"])
+        # Every file is in, so a later import starts over instead of resuming past the end of each file
+        checkpoint_path.unlink(missing_ok=True)
+        return report
+
+    def _create_schema(self, name_space: str, manifest: dict[str, Any]) -> bool:
+        """Creates the tags and edge types of the manifest that the space does not have yet, returns whether any were created."""
+        existing_tags = set(self.tag_manager.get_all_tags(name_space))
+        existing_edge_types = set(self.edge_type_manager.get_all_edge_types(name_space))
+        results = [self.tag_manager.create_tag_from_fields(name_space, tag_name, entry["fields"]) for tag_name, entry in manifest["tags"].items() if tag_name not in existing_tags]
+        results += [
+            self.edge_type_manager.create_edge_type_from_fields(name_space, edge_type, entry["fields"]) for edge_type, entry in manifest["edges"].items() if edge_type not in existing_edge_types
+        ]
+        for result in results:
+            if not result.is_succeeded:
+                raise Exception(f"Failed to create the schema of space {name_space}: {result.message}")
+        return bool(results)
+
+    @staticmethod
+    def _write_frames(path: Path, frames: Iterator[pd.DataFrame], file_format: str) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        rows = 0
+        writer = None
+        try:
+            for frame in frames:
+                if file_format == "csv":
+                    frame.to_csv(path, mode="a", header=rows == 0, index=False, na_rep=CSV_NULL)
+                elif file_format == "parquet":
+                    pa, pq = _import_pyarrow()
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(path, table.schema)
+                    writer.write_table(table)
+                else:
+                    raise ValueError(f"file_format: {file_format} is not supported")
+                rows += len(frame)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    @staticmethod
+    def _read_frames(path: Path, file_format: str, chunk_size: int, skip_rows: int = 0) -> Iterator[pd.DataFrame]:
+        if not path.exists():
+            return
+        if file_format == "csv":
+            chunks = pd.read_csv(path, chunksize=chunk_size, dtype=str, na_values=[CSV_NULL], keep_default_na=False)
+        elif file_format == "parquet":
+            _, pq = _import_pyarrow()
+            chunks = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+        else:
+            raise ValueError(f"file_format: {file_format} is not supported")
+        for chunk in chunks:
+            if skip_rows >= len(chunk):
+                skip_rows -= len(chunk)
+                continue
+            chunk = chunk.iloc[skip_rows:]
+            skip_rows = 0
+            # Pydantic expects None for missing values, not pandas NA/NaN/NaT
+            yield chunk.astype(object).where(chunk.notna(), None)
+
+    @staticmethod
+    def _save_checkpoint(path: Path, checkpoint: dict[str, int], file_name: str, rows: int) -> None:
+        checkpoint[file_name] = checkpoint.get(file_name, 0) + rows
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(checkpoint))
+        os.replace(tmp_path, path)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export/import requires pyarrow, install it with `uv add pyarrow`") from e
+    return pa, pq
@@ -0,0 +1,108 @@
+from collections import deque
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+from sw_onto_generation.base.base_relation import BaseRelation
+
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement, quote_vid
+from sw_nebula_service.managers.utils import convert_vertex_to_node
+from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.models.relations import BaseNebulaRelation, HasLib, HasOntology, HasPdf
+from sw_nebula_service.registry import get_registry
+
+# root -> lib -> ontology -> pdf, as built by Engine.insert_directory_nodes
+DIRECTORY_RELATION_CLASSES = (HasLib, HasOntology, HasPdf)
+
+
+class SubtreeNode(BaseModel):
+    vid: str
+    depth: int
+    node: BaseNode | BaseNebulaNode
+    # Edge type of the edge from the parent, None for the root
+    edge_type: str | None = None
+    children: list["SubtreeNode"] = []
+
+
+class Subtree(BaseModel):
+    root: SubtreeNode
+    # (edge_type, src_vid, dst_vid) for every edge in the tree
+    edges: list[tuple[str, str, str]] = []
+    # Edges followed to a vertex without any tag (e.g. left behind when the vertex was deleted), not part of the tree
+    dangling_edges: list[tuple[str, str, str]] = []
+
+    def iter_nodes(self) -> Iterator[SubtreeNode]:
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+@instrumented
+class TraversalManager:
+    def __init__(self, connector: Connector):
+        self.connector = connector
+
+    def get_subtree(
+        self,
+        name_space: str,
+        root_vid: str,
+        edge_types: Sequence[str | type[BaseRelation] | type[BaseNebulaRelation]] = DIRECTORY_RELATION_CLASSES,
+        max_depth: int = 3,
+        limits: int | Sequence[int] | None = None,
+    ) -> Subtree:
+        """Fetches the root and everything reachable over `edge_types` within `max_depth` steps in one request.
+
+        `limits` caps how many edges are followed at each step (one value for every step, or one per step).
+        """
+        if max_depth < 1:
+            raise ValueError(f"max_depth must be at least 1, got {max_depth}")
+        if isinstance(limits, int):
+            limits = [limits] * max_depth
+        if limits is not None and len(limits) != max_depth:
+            raise ValueError(f"limits must have one entry per step, got {len(limits)} for max_depth {max_depth}")
+
+        over = ", ".join(edge_type if isinstance(edge_type, str) else get_registry().get_edge_type(edge_type) for edge_type in edge_types)
+        limit_clause = "" if limits is None else f" LIMIT [{', '.join(str(limit) for limit in limits)}]"
+        query = get_statement("get_subtree").render(root_vid=quote_vid(root_vid), max_depth=max_depth, over=over, limit_clause=limit_clause)
+        result = self.connector.execute_read(name_space, query)
+        if not result.is_succeeded():
+            raise Exception(f"Failed to get subtree for vid {root_vid}: {result.error_msg()}")
+        rows = [result.row_values(row_index) for row_index in range(result.row_size())]
+        return self._build_subtree(root_vid, rows)
+
+    @staticmethod
+    def _build_subtree(root_vid: str, rows: list[list[Any]]) -> Subtree:
+        root = None
+        children: dict[str, list[tuple[str, str, Any]]] = {}
+        for src, dst, edge_type, node in rows:
+            src_vid, dst_vid = src.cast(), dst.cast()
+            if not src_vid:
+                root = SubtreeNode(vid=dst_vid, depth=0, node=convert_vertex_to_node(node.as_node()))
+            else:
+                children.setdefault(src_vid, []).append((edge_type.cast(), dst_vid, node))
+        if root is None:
+            raise Exception(f"Failed to get subtree for vid {root_vid}: vertex not found")
+
+        subtree = Subtree(root=root)
+        # Breadth first, so each vertex is attached once at its shallowest depth and shared children cannot form cycles
+        seen = {root_vid}
+        queue = deque([root])
+        while queue:
+            parent = queue.popleft()
+            for edge_type, dst_vid, node in children.get(parent.vid, []):
+                if not node.is_vertex() or not node.as_node().tags():
+                    subtree.dangling_edges.append((edge_type, parent.vid, dst_vid))
+                    continue
+                if dst_vid in seen:
+                    continue
+                seen.add(dst_vid)
+                child = SubtreeNode(vid=dst_vid, depth=parent.depth + 1, node=convert_vertex_to_node(node.as_node()), edge_type=edge_type)
+                parent.children.append(child)
+                subtree.edges.append((edge_type, parent.vid, dst_vid))
+                queue.append(child)
+        return subtree
@@ -1,12 +1,18 @@
+import functools
+import operator
 import types
+import typing
+from collections.abc import Callable, Iterator, Sequence
 from datetime import datetime
-from typing import Any
+from typing import Any, TypeVar
 
+from nebula3.data.DataObject import Node
 from pydantic import BaseModel
 from sw_onto_generation.base.base_node import BaseNode
+from sw_onto_generation.base.base_relation import BaseRelation
 
-from sw_nebula_service import NODE_CLASSES
 from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.models.relations import BaseNebulaRelation
 
 
 class NebulaBooleanQueryResult(BaseModel):
@@ -14,6 +20,23 @@ class NebulaBooleanQueryResult(BaseModel):
     message: str | None = None
 
 
+class NebulaBatchQueryResult(BaseModel):
+    is_succeeded: bool
+    message: str | None = None
+    vids: list[str] = []
+    failed_vids: list[str] = []
+
+
+class NebulaEdgeBatchQueryResult(BaseModel):
+    is_succeeded: bool
+    message: str | None = None
+    # (edge_type, src_vid, dst_vid)
+    edges: list[tuple[str, str, str]] = []
+    failed_edges: list[tuple[str, str, str]] = []
+
+
+T = TypeVar("T")
+
 TYPE_MAPPING = {
     int: "int",
     float: "float",
@@ -23,13 +46,44 @@ TYPE_MAPPING = {
 }
 
 
+@functools.cache
 def pascal_case_to_snake_case(name: str) -> str:
     return "".join(["_" + i.lower() if i.isupper() else i for i in name]).lstrip("_")
 
 
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    if size < 1:
+        raise ValueError(f"size: {size} must be positive")
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def format_string_value(value: str) -> str:
+    # nGQL string literals use backslash escapes; chained replace() is several times faster than str.translate here
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+    return f'"{escaped}"'
+
+
+def format_datetime_value(value: datetime) -> str:
+    return f'datetime("{value.strftime("%Y-%m-%dT%H:%M:%S")}")'
+
+
+def format_bool_value(value: bool) -> str:
+    return "true" if value else "false"
+
+
+FIELD_FORMATTERS: dict[Any, Callable[[Any], str]] = {
+    str: format_string_value,
+    int: str,
+    float: str,
+    bool: format_bool_value,
+    datetime: format_datetime_value,
+}
+
+
 def format_field_value(value: Any) -> str:
     if isinstance(value, datetime):
-        return f'datetime("{value.strftime("%Y-%m-%dT%H:%M:%S")}")'
+        return format_datetime_value(value)
     elif isinstance(value, float):
         return str(value)
     elif value is None:
@@ -39,52 +93,117 @@ def format_field_value(value: Any) -> str:
     elif isinstance(value, int):
         return str(value)
     elif isinstance(value, str):
-        return f'"{str(value)}"'
+        return format_string_value(value)
     else:
         raise ValueError(f"value: {value} is not supported")
 
 
-def convert_node_to_nebula_data(node: BaseNode | BaseNebulaNode | BaseModel) -> dict[str, Any]:
-    data = node.model_dump()
-    tag_name = pascal_case_to_snake_case(node.__class__.__name__)
-    formatted_data = []
-    field_names = []
-    for field_name in list(data.keys()):
-        field_names.append(field_name)
-        value = data.get(field_name)
-        formatted_data.append(format_field_value(value))
-    field_names_str = ", ".join(field_names)
-    values_str = ", ".join(formatted_data)
-    return tag_name, field_names_str, values_str
+def resolve_field_type(annotation: Any) -> Any | None:
+    """Returns the scalar type stored for a model field, or None for nested models, which are not stored on the tag."""
+    if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None) and not (isinstance(arg, type) and issubclass(arg, BaseModel))]
+        return args[-1] if args else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return None
+    return annotation
+
+
+def get_field_formatter(annotation: Any) -> Callable[[Any], str]:
+    if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+        # Mixed unions such as int | str are formatted by the runtime type of each value
+        if len([arg for arg in typing.get_args(annotation) if arg is not type(None)]) > 1:
+            return format_field_value
+    formatter = FIELD_FORMATTERS.get(resolve_field_type(annotation), format_field_value)
+    if formatter is format_field_value or type(None) not in typing.get_args(annotation):
+        return formatter
+    return lambda value: "NULL" if value is None else formatter(value)
+
 
+class NodeSerializationPlan:
+    """Per-class precomputed tag name, field order and value formatters used to build INSERT VERTEX values."""
 
-def convert_fields_of_class_to_nebula_types(node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]) -> str:
+    def __init__(self, node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]):
+        self.tag_name = pascal_case_to_snake_case(node_class.__name__)
+        field_types = {field_name: resolve_field_type(field_info.annotation) for field_name, field_info in node_class.model_fields.items()}
+        self.field_types = {field_name: field_type for field_name, field_type in field_types.items() if field_type is not None}
+        self.fields = [(field_name, get_field_formatter(node_class.model_fields[field_name].annotation)) for field_name in self.field_types]
+        self.field_names_str = ", ".join(field_name for field_name, _ in self.fields)
+        self.formatters = [formatter for _, formatter in self.fields]
+        field_names = [field_name for field_name, _ in self.fields]
+        # attrgetter returns a bare value for a single name, so always read through a tuple
+        self.get_values = operator.attrgetter(*field_names) if len(field_names) > 1 else lambda node: tuple(getattr(node, field_name) for field_name in field_names)
+
+    def format_values(self, node: BaseNode | BaseNebulaNode | BaseModel) -> str:
+        return ", ".join([formatter(value) for formatter, value in zip(self.formatters, self.get_values(node), strict=True)])
+
+
+@functools.cache
+def get_serialization_plan(node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]) -> NodeSerializationPlan:
+    return NodeSerializationPlan(node_class)
+
+
+def convert_node_to_nebula_data(node: BaseNode | BaseNebulaNode | BaseModel) -> tuple[str, str, str]:
+    plan = get_serialization_plan(node.__class__)
+    return plan.tag_name, plan.field_names_str, plan.format_values(node)
+
+
+def convert_relation_to_nebula_data(relation: BaseRelation | BaseNebulaRelation) -> tuple[str, str, str]:
+    # Mirrors the source_node/target_node string properties declared by create_edge_type_with_property
+    edge_type = pascal_case_to_snake_case(relation.__class__.__name__)
+    values_str = f"{format_field_value(relation.source_node.__class__.__name__)}, {format_field_value(relation.target_node.__class__.__name__)}"
+    return edge_type, "source_node, target_node", values_str
+
+
+def convert_properties_to_nebula_data(properties: dict[str, Any]) -> tuple[str, str]:
+    field_names_str = ", ".join(properties.keys())
+    values_str = ", ".join(format_field_value(value) for value in properties.values())
+    return field_names_str, values_str
+
+
+def convert_vertex_properties(vertex: Node, tag_name: str) -> dict[str, Any]:
+    return {field_name: value.cast_primitive() for field_name, value in vertex.properties(tag_name).items()}
+
+
+def convert_fields_of_class_to_nebula_types(node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]) -> list[str]:
     fields = []
     for field_name, field_info in node_class.model_fields.items():
-        # rprint(f"field_info.annotation: {field_info.annotation}")
         if field_info.annotation is None:
             raise ValueError(f"field_name: {field_name} is None")
-        #! BaseModel check added to skip like Adres inside of Insan
-        elif isinstance(field_info.annotation, types.UnionType):
-            args = getattr(field_info.annotation, "__args__", ())
-            for arg in args:
-                if arg is type(None):
-                    continue
-                elif issubclass(arg, BaseModel):
-                    continue
-                else:
-                    possible_type = arg
-        elif issubclass(field_info.annotation, BaseModel):
+        #! Nested models (like Adres inside of Insan) are not stored on the tag
+        possible_type = resolve_field_type(field_info.annotation)
+        if possible_type is None:
             continue
-        else:
-            possible_type = field_info.annotation
         fields.append(f"{field_name} {TYPE_MAPPING.get(possible_type)}")
     return fields
 
 
+def get_relation_endpoint_defaults(edge_class: type[BaseRelation] | type[BaseNebulaRelation]) -> tuple[str, str]:
+    # The source_node/target_node edge properties default to the endpoint class names, e.g. "PdfNode" or "LibNode | OntologyNode"
+    defaults = []
+    for field_name in ("source_node", "target_node"):
+        annotation = edge_class.model_fields[field_name].annotation
+        if isinstance(annotation, types.UnionType):
+            defaults.append(f"{annotation.__args__[0].__name__} | {annotation.__args__[1].__name__}")
+        else:
+            defaults.append(annotation.__name__)
+    return defaults[0], defaults[1]
+
+
+def get_edge_type_fields(edge_class: type[BaseRelation] | type[BaseNebulaRelation]) -> list[str]:
+    source_default, target_default = get_relation_endpoint_defaults(edge_class)
+    return [f"source_node string DEFAULT {format_string_value(source_default)}", f"target_node string DEFAULT {format_string_value(target_default)}"]
+
+
 def get_node_class_by_tag_name(tag_name: str) -> type[BaseNode] | type[BaseNebulaNode]:
-    for node_class in NODE_CLASSES:
-        if pascal_case_to_snake_case(node_class.__name__) == tag_name:
-            return node_class
-    else:
-        raise ValueError(f"Node class name not found for tag name: {tag_name}")
+    from sw_nebula_service.registry import get_registry
+
+    return get_registry().get_node_class(tag_name)
+
+
+def convert_vertex_to_node(vertex: Node) -> BaseNode | BaseNebulaNode:
+    # Vertices written by this package carry a single tag
+    tags = vertex.tags()
+    if not tags:
+        raise ValueError(f"Vertex {vertex.get_id().cast()} has no tag, it only exists as the end of an edge")
+    tag_name = tags[0]
+    return get_node_class_by_tag_name(tag_name)(**convert_vertex_properties(vertex, tag_name))
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+
+from sw_nebula_service.models.nodes import BaseNebulaNode
+
+
+class VertexCacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class VertexCache:
+    """Process-local LRU + TTL cache of decoded vertices keyed by (space, vid)."""
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[tuple[str, str], tuple[float, BaseNode | BaseNebulaNode]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        # Bumped on every invalidation; a read-through fill carries the generation it started at, so an invalidation
+        # that lands while the FETCH is in flight wins over the stale row it returns
+        self.generation = 0
+        # (space, vid) -> generation of its last invalidation, bounded like the entries. Invalidations dropped from it
+        # are only known to be at or below invalidation_floor
+        self.invalidations: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self.invalidation_floor = 0
+
+    def get(self, name_space: str, vid: str) -> BaseNode | BaseNebulaNode | None:
+        key = (name_space, vid)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        # Hand out copies so callers mutating a model cannot corrupt the cached one
+        return entry[1].model_copy()
+
+    def fill_token(self) -> int:
+        """Generation to pass to `put` for a row read after this call."""
+        with self.lock:
+            return self.generation
+
+    def put(self, name_space: str, vid: str, node: BaseNode | BaseNebulaNode, token: int | None = None) -> None:
+        key = (name_space, vid)
+        with self.lock:
+            if token is not None and self._invalidated_since(key, token):
+                return
+            self.entries[key] = (time.monotonic() + self.ttl, node.model_copy())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, name_space: str, vid: str) -> None:
+        key = (name_space, vid)
+        with self.lock:
+            self.entries.pop(key, None)
+            self.generation += 1
+            self.invalidations[key] = self.generation
+            self.invalidations.move_to_end(key)
+            while len(self.invalidations) > self.max_size:
+                _, generation = self.invalidations.popitem(last=False)
+                self.invalidation_floor = max(self.invalidation_floor, generation)
+
+    def _invalidated_since(self, key: tuple[str, str], token: int) -> bool:
+        generation = self.invalidations.get(key)
+        if generation is not None:
+            return generation > token
+        return token < self.invalidation_floor
+
+    def clear(self, name_space: str | None = None) -> None:
+        with self.lock:
+            # Fills in flight for any key are dropped, which is simpler than tracking the cleared ones
+            self.generation += 1
+            self.invalidation_floor = self.generation
+            if name_space is None:
+                self.entries.clear()
+            else:
+                for key in [key for key in self.entries if key[0] == name_space]:
+                    del self.entries[key]
+
+    def stats(self) -> VertexCacheStats:
+        with self.lock:
+            return VertexCacheStats(hits=self.hits, misses=self.misses, evictions=self.evictions, size=len(self.entries))
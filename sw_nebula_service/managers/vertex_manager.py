@@ -1,65 +1,263 @@
+import logging
+from collections.abc import Iterator, Mapping, Sequence
 from typing import Any
 
+import pandas as pd
 from pydantic import BaseModel
-from rich import print as rprint
 from sw_onto_generation.base.base_node import BaseNode
 
 from sw_nebula_service.managers.connector import Connector
-from sw_nebula_service.managers.utils import NebulaBooleanQueryResult, convert_node_to_nebula_data, format_field_value, get_node_class_by_tag_name, pascal_case_to_snake_case
+from sw_nebula_service.managers.frames import FRAME_PAGE_SIZE, PANDAS_DTYPES, result_to_frame
+from sw_nebula_service.managers.index_manager import IndexManager
+from sw_nebula_service.managers.metrics import instrumented
+from sw_nebula_service.managers.statements import get_statement, quote_vid, quote_vids
+from sw_nebula_service.managers.utils import (
+    NebulaBatchQueryResult,
+    NebulaBooleanQueryResult,
+    chunked,
+    convert_node_to_nebula_data,
+    convert_vertex_properties,
+    convert_vertex_to_node,
+    format_field_value,
+    get_serialization_plan,
+)
+from sw_nebula_service.managers.vertex_cache import VertexCache
 from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.registry import get_registry
 
+logger = logging.getLogger(__name__)
 
+
+@instrumented
 class VertexManager:
-    def __init__(self, connector: Connector):
+    def __init__(self, connector: Connector, cache: VertexCache | None = None, index_manager: IndexManager | None = None):
         self.connector = connector
+        self.cache = cache
+        self.index_manager = index_manager if index_manager is not None else IndexManager(connector)
+        # (tag_name, fields) already warned about, so a scan in a loop logs once
+        self._unindexed_lookups: set[tuple[str, tuple[str, ...]]] = set()
+
+    def _invalidate(self, name_space: str, vids: Sequence[str]) -> None:
+        if self.cache is not None:
+            for vid in vids:
+                self.cache.invalidate(name_space, vid)
 
     def insert_vertex(self, name_space: str, node: BaseNode | BaseNebulaNode | BaseModel, vid: str) -> NebulaBooleanQueryResult:
         tag_name, field_names_str, values_str = convert_node_to_nebula_data(node)
-        query = f'INSERT VERTEX {tag_name} ({field_names_str}) VALUES "{vid}": ({values_str})'  # noqa: S608
-        rprint(f"query: {query}")
+        query = get_statement("insert_vertices", tag_name=tag_name, field_names=field_names_str).render(rows=f"{quote_vid(vid)}: ({values_str})")
         with self.connector.session(name_space) as session:
             result = session.execute(query)
+            self._invalidate(name_space, [vid])
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Node {vid} inserted successfully")
             else:
                 return NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to insert node instance for tag {tag_name}: {result.error_msg()}")
 
+    def insert_vertices(self, name_space: str, nodes: Sequence[BaseNode | BaseNebulaNode | BaseModel], vids: Sequence[str], batch_size: int = 500) -> list[NebulaBatchQueryResult]:
+        # Nodes of the same tag share the field list, so they can go into one multi-row statement
+        groups: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        for node, vid in zip(nodes, vids, strict=True):
+            tag_name, field_names_str, values_str = convert_node_to_nebula_data(node)
+            groups.setdefault((tag_name, field_names_str), []).append((vid, values_str))
+
+        results = []
+        with self.connector.session(name_space) as session:
+            for (tag_name, field_names_str), rows in groups.items():
+                statement = get_statement("insert_vertices", tag_name=tag_name, field_names=field_names_str)
+                for batch in chunked(rows, batch_size):
+                    batch_vids = [vid for vid, _ in batch]
+                    result = session.execute(statement.render(rows=", ".join([f"{quote_vid(vid)}: ({values_str})" for vid, values_str in batch])))
+                    if result.is_succeeded():
+                        results.append(NebulaBatchQueryResult(is_succeeded=True, message=f"Inserted {len(batch)} nodes for tag {tag_name}", vids=batch_vids))
+                    else:
+                        results.append(NebulaBatchQueryResult(is_succeeded=False, message=f"Failed to insert nodes for tag {tag_name}: {result.error_msg()}", vids=batch_vids, failed_vids=batch_vids))
+                    self._invalidate(name_space, batch_vids)
+        return results
+
     def get_vertices_of_node_class(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode]) -> list[BaseNode | BaseNebulaNode]:
-        tag_name = pascal_case_to_snake_case(node_class.__name__)
-        query = f"MATCH (n:{tag_name}) RETURN n"
+        tag_name = get_registry().get_tag_name(node_class)
         nodes = []
-        with self.connector.session(name_space) as session:
-            result = session.execute(query)
-            if result.is_succeeded():
-                for res in result.as_primitive():
-                    data = res["n"]["tags"]
-                    node = node_class(**data[tag_name])
-                    nodes.append(node)
-            else:
-                raise Exception(f"Failed to get vertex for tag {tag_name}: {result.error_msg()}")
+        result = self.connector.execute_read(name_space, get_statement("match_vertices", tag_name=tag_name).text)
+        if result.is_succeeded():
+            for res in result.as_primitive():
+                data = res["n"]["tags"]
+                node = node_class(**data[tag_name])
+                nodes.append(node)
+        else:
+            raise Exception(f"Failed to get vertex for tag {tag_name}: {result.error_msg()}")
         return nodes
 
-    def get_vertex_by_vid(self, name_space: str, vid: str) -> BaseNode | BaseNebulaNode:
-        query = f"MATCH (n) WHERE id(n) == '{vid}' RETURN n"
+    def find_vertices(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode], **filters: Any) -> list[BaseNode | BaseNebulaNode]:
+        """Returns the vertices of `node_class` whose properties equal `filters`, through LOOKUP when a tag index covers them."""
+        if not filters:
+            raise ValueError("find_vertices needs at least one filter, use get_vertices_of_node_class to read the whole tag")
+        tag_name = get_registry().get_tag_name(node_class)
+        self._frame_columns(node_class, list(filters))
+        fields = tuple(filters)
+        index = self.index_manager.find_index(name_space, tag_name, fields)
+        if index is None:
+            return self._match_vertices(name_space, node_class, tag_name, filters)
+
+        columns = list(get_serialization_plan(node_class).field_types)
+        yields = ", ".join(["id(vertex) AS vid", *(f"properties(vertex).{column} AS {column}" for column in columns)])
+        where = " AND ".join([f"{tag_name}.{field_name} == {format_field_value(value)}" for field_name, value in filters.items()])
+        result = self.connector.execute_read(name_space, get_statement("lookup_tag_where", tag_name=tag_name).render(where=where, yields=yields))
+        if not result.is_succeeded():
+            # Most likely the index was dropped since it was listed
+            self.index_manager.invalidate(name_space)
+            raise Exception(f"Failed to find vertices for tag {tag_name} with index {index.name}: {result.error_msg()}")
+        nodes = []
+        for row_index in range(result.row_size()):
+            values = result.row_values(row_index)
+            nodes.append(node_class(**{column: value.cast_primitive() for column, value in zip(columns, values[1:], strict=True)}))
+        return nodes
+
+    def _match_vertices(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode], tag_name: str, filters: dict[str, Any]) -> list[BaseNode | BaseNebulaNode]:
+        fields = tuple(filters)
+        if (tag_name, fields) not in self._unindexed_lookups:
+            self._unindexed_lookups.add((tag_name, fields))
+            logger.warning("No index on %s covers %s, find_vertices falls back to MATCH, which scans the tag", tag_name, ", ".join(fields))
+        where = " AND ".join([f"n.{tag_name}.{field_name} == ${field_name}" for field_name in fields])
+        result = self.connector.execute_read(name_space, *get_statement("match_vertices_where", tag_name=tag_name).bind(filters, where=where))
+        if not result.is_succeeded():
+            raise Exception(f"Failed to find vertices for tag {tag_name}: {result.error_msg()}")
+        return [node_class(**convert_vertex_properties(result.row_values(row_index)[0].as_node(), tag_name)) for row_index in range(result.row_size())]
+
+    def iter_vertices_of_node_class(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode], page_size: int = 10_000) -> Iterator[BaseNode | BaseNebulaNode]:
+        # Pages are keyed on the last vid seen, which bounds client memory but not server work, see match_vertices_page
+        tag_name = get_registry().get_tag_name(node_class)
+        first_page = get_statement("match_vertices_page", tag_name=tag_name)
+        next_page = get_statement("match_vertices_page_after", tag_name=tag_name)
+        returns = "n, id(n) AS vid"
+        cursor: str | None = None
         with self.connector.session(name_space) as session:
-            result = session.execute(query)
-            if result.is_succeeded():
-                result = result.as_primitive()
-                tag_name = list(result[0]["n"]["tags"].keys())[0]
-                node_class = get_node_class_by_tag_name(tag_name)
-                data = result[0]["n"]["tags"][tag_name]
-                node = node_class(**data)
-                return node
+            while True:
+                if cursor is None:
+                    result = session.execute(first_page.render(returns=returns, page_size=page_size))
+                else:
+                    result = session.execute_parameter(*next_page.bind({"cursor": cursor}, returns=returns, page_size=page_size))
+                if not result.is_succeeded():
+                    raise Exception(f"Failed to get vertex page for tag {tag_name}: {result.error_msg()}")
+                for row_index in range(result.row_size()):
+                    yield node_class(**convert_vertex_properties(result.row_values(row_index)[0].as_node(), tag_name))
+                if result.row_size() < page_size:
+                    return
+                cursor = result.row_values(result.row_size() - 1)[1].cast()
+
+    def get_vertices_frame(self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode], columns: Sequence[str] | None = None) -> pd.DataFrame:
+        tag_name = get_registry().get_tag_name(node_class)
+        columns, dtypes = self._frame_columns(node_class, columns)
+        # Only the projected properties are yielded, so unused columns never leave the server
+        yields = ", ".join(["id(vertex) AS vid", *(f"properties(vertex).{column} AS {column}" for column in columns)])
+        result = self.connector.execute_read(name_space, get_statement("lookup_tag", tag_name=tag_name).render(yields=yields))
+        if not result.is_succeeded():
+            raise Exception(f"Failed to get vertex frame for tag {tag_name}: {result.error_msg()}")
+        return result_to_frame(result, dtypes)
+
+    def iter_vertices_frames(
+        self, name_space: str, node_class: type[BaseNode] | type[BaseNebulaNode], columns: Sequence[str] | None = None, page_size: int = FRAME_PAGE_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        tag_name = get_registry().get_tag_name(node_class)
+        columns, dtypes = self._frame_columns(node_class, columns)
+        returns = ", ".join(["id(n) AS vid", *(f"n.{tag_name}.{column} AS {column}" for column in columns)])
+        first_page = get_statement("match_vertices_page", tag_name=tag_name)
+        next_page = get_statement("match_vertices_page_after", tag_name=tag_name)
+        cursor: str | None = None
+        with self.connector.session(name_space) as session:
+            while True:
+                if cursor is None:
+                    result = session.execute(first_page.render(returns=returns, page_size=page_size))
+                else:
+                    result = session.execute_parameter(*next_page.bind({"cursor": cursor}, returns=returns, page_size=page_size))
+                if not result.is_succeeded():
+                    raise Exception(f"Failed to get vertex frame page for tag {tag_name}: {result.error_msg()}")
+                frame = result_to_frame(result, dtypes)
+                if len(frame):
+                    yield frame
+                if len(frame) < page_size:
+                    return
+                cursor = frame["vid"].iloc[-1]
+
+    @staticmethod
+    def _frame_columns(node_class: type[BaseNode] | type[BaseNebulaNode], columns: Sequence[str] | None) -> tuple[list[str], dict[str, str]]:
+        field_types = get_serialization_plan(node_class).field_types
+        columns = list(field_types) if columns is None else list(columns)
+        unknown_columns = [column for column in columns if column not in field_types]
+        if unknown_columns:
+            raise ValueError(f"Columns {unknown_columns} are not properties of {node_class.__name__}")
+        return columns, {"vid": "string", **{column: PANDAS_DTYPES.get(field_types[column], "object") for column in columns}}
+
+    def get_vertex_by_vid(self, name_space: str, vid: str) -> BaseNode | BaseNebulaNode:
+        nodes = self.get_vertices_by_vids(name_space=name_space, vids=[vid])
+        if vid not in nodes:
+            raise Exception(f"Failed to get vertex for vid {vid}: vertex not found")
+        return nodes[vid]
+
+    def get_vertices_by_vids(self, name_space: str, vids: Sequence[str], batch_size: int = 500) -> dict[str, BaseNode | BaseNebulaNode]:
+        nodes = {}
+        missing_vids = []
+        for vid in dict.fromkeys(vids):
+            node = self.cache.get(name_space, vid) if self.cache is not None else None
+            if node is None:
+                missing_vids.append(vid)
             else:
-                raise Exception(f"Failed to get vertex for vid {vid}: {result.error_msg()}")
+                nodes[vid] = node
+        if not missing_vids:
+            return nodes
 
-    def update_vertex_field(self, name_space: str, tag_name: str, vid: str, field_name: str, value: Any) -> None:
-        nebula_value = format_field_value(value)
+        statement = get_statement("fetch_vertices")
+        # Taken before the FETCH, so a write that invalidates one of these vids meanwhile keeps its stale row out of the cache
+        token = self.cache.fill_token() if self.cache is not None else None
         with self.connector.session(name_space) as session:
-            query = f'UPDATE VERTEX ON {tag_name} "{vid}" SET {field_name} = {nebula_value}'  # noqa: S608
-            result = session.execute(query)
-            rprint(f"query: {query}")
+            for batch in chunked(missing_vids, batch_size):
+                vids_str = quote_vids(batch)
+                result = session.execute(statement.render(vids=vids_str))
+                if not result.is_succeeded():
+                    raise Exception(f"Failed to get vertices for vids {vids_str}: {result.error_msg()}")
+                for row_index in range(result.row_size()):
+                    vertex = result.row_values(row_index)[0].as_node()
+                    vid = vertex.get_id().cast()
+                    nodes[vid] = convert_vertex_to_node(vertex)
+                    if self.cache is not None:
+                        self.cache.put(name_space, vid, nodes[vid], token=token)
+        return nodes
+
+    def update_vertex_field(self, name_space: str, tag_name: str, vid: str, field_name: str, value: Any) -> NebulaBooleanQueryResult:
+        return self.update_vertex(name_space, tag_name, vid, {field_name: value})
+
+    def update_vertex(self, name_space: str, tag_name: str, vid: str, patch: Mapping[str, Any]) -> NebulaBooleanQueryResult:
+        if not patch:
+            # UPDATE needs at least one assignment, and there is nothing to change anyway
+            return NebulaBooleanQueryResult(is_succeeded=True, message=f"Node {vid} has no fields to update")
+        with self.connector.session(name_space) as session:
+            result = session.execute(self._update_statement(tag_name, vid, patch))
+            self._invalidate(name_space, [vid])
             if result.is_succeeded():
                 return NebulaBooleanQueryResult(is_succeeded=True, message=f"Node {vid} updated successfully")
             else:
-                return NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to update node field value for tag {tag_name}: {result.error_msg()}")
+                return NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to update node fields for tag {tag_name}: {result.error_msg()}")
+
+    def update_vertices(self, name_space: str, tag_name: str, patches: Mapping[str, Mapping[str, Any]], batch_size: int = 500) -> dict[str, NebulaBooleanQueryResult]:
+        results = {vid: NebulaBooleanQueryResult(is_succeeded=True, message=f"Node {vid} has no fields to update") for vid, patch in patches.items() if not patch}
+        with self.connector.session(name_space) as session:
+            for batch in chunked([(vid, patch) for vid, patch in patches.items() if patch], batch_size):
+                # One request per batch; Nebula stops at the first failing statement, so a failed batch is replayed
+                # statement by statement to find out which vids failed. Replaying the applied ones is harmless, SET is idempotent
+                statements = [self._update_statement(tag_name, vid, patch) for vid, patch in batch]
+                result = session.execute("; ".join(statements))
+                if result.is_succeeded():
+                    results.update((vid, NebulaBooleanQueryResult(is_succeeded=True, message=f"Node {vid} updated successfully")) for vid, _ in batch)
+                else:
+                    for (vid, _), statement in zip(batch, statements, strict=True):
+                        result = session.execute(statement)
+                        if result.is_succeeded():
+                            results[vid] = NebulaBooleanQueryResult(is_succeeded=True, message=f"Node {vid} updated successfully")
+                        else:
+                            results[vid] = NebulaBooleanQueryResult(is_succeeded=False, message=f"Failed to update node fields for tag {tag_name}: {result.error_msg()}")
+                self._invalidate(name_space, [vid for vid, _ in batch])
+        return results
+
+    @staticmethod
+    def _update_statement(tag_name: str, vid: str, patch: Mapping[str, Any]) -> str:
+        assignments = ", ".join([f"{field_name} = {format_field_value(value)}" for field_name, value in patch.items()])
+        return get_statement("update_vertex", tag_name=tag_name).render(vid=quote_vid(vid), assignments=assignments)
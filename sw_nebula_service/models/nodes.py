@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class BaseNebulaNode(BaseModel):
@@ -21,9 +21,9 @@ class OntologyNode(BaseNebulaNode):
 
 class PdfNode(BaseNebulaNode):
     # Metadata
-    user_id: str
+    user_id: str = Field(json_schema_extra={"nebula_index": True})
     node_id: str
-    pdf_file_hash: str
+    pdf_file_hash: str = Field(json_schema_extra={"nebula_index": True})
     pdf_file_name: str
     time_of_upload: datetime
     file_load_status: bool
@@ -0,0 +1,62 @@
+import functools
+
+from pydantic import BaseModel
+from sw_onto_generation.base.base_node import BaseNode
+from sw_onto_generation.base.base_relation import BaseRelation
+
+from sw_nebula_service.managers.utils import pascal_case_to_snake_case
+from sw_nebula_service.models.nodes import BaseNebulaNode
+from sw_nebula_service.models.relations import BaseNebulaRelation
+
+
+class ClassRegistry:
+    """Two-way lookup between Nebula tag / edge type names and the pydantic classes that model them."""
+
+    def __init__(self, node_classes: list[type[BaseNode] | type[BaseNebulaNode]] | None = None, relation_classes: list[type[BaseRelation] | type[BaseNebulaRelation]] | None = None):
+        self.tag_to_node_class: dict[str, type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]] = {}
+        self.node_class_to_tag: dict[type[BaseNode] | type[BaseNebulaNode] | type[BaseModel], str] = {}
+        self.edge_type_to_relation_class: dict[str, type[BaseRelation] | type[BaseNebulaRelation]] = {}
+        self.relation_class_to_edge_type: dict[type[BaseRelation] | type[BaseNebulaRelation], str] = {}
+        for node_class in node_classes or []:
+            self.register_node_class(node_class)
+        for relation_class in relation_classes or []:
+            self.register_relation_class(relation_class)
+
+    def register_node_class(self, node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]) -> str:
+        tag_name = pascal_case_to_snake_case(node_class.__name__)
+        self.tag_to_node_class[tag_name] = node_class
+        self.node_class_to_tag[node_class] = tag_name
+        return tag_name
+
+    def register_relation_class(self, relation_class: type[BaseRelation] | type[BaseNebulaRelation]) -> str:
+        edge_type = pascal_case_to_snake_case(relation_class.__name__)
+        self.edge_type_to_relation_class[edge_type] = relation_class
+        self.relation_class_to_edge_type[relation_class] = edge_type
+        return edge_type
+
+    def get_node_class(self, tag_name: str) -> type[BaseNode] | type[BaseNebulaNode]:
+        try:
+            return self.tag_to_node_class[tag_name]
+        except KeyError:
+            raise ValueError(f"Node class name not found for tag name: {tag_name}") from None
+
+    def get_relation_class(self, edge_type: str) -> type[BaseRelation] | type[BaseNebulaRelation]:
+        try:
+            return self.edge_type_to_relation_class[edge_type]
+        except KeyError:
+            raise ValueError(f"Relation class name not found for edge type: {edge_type}") from None
+
+    def get_tag_name(self, node_class: type[BaseNode] | type[BaseNebulaNode] | type[BaseModel]) -> str:
+        tag_name = self.node_class_to_tag.get(node_class)
+        return tag_name if tag_name is not None else pascal_case_to_snake_case(node_class.__name__)
+
+    def get_edge_type(self, relation_class: type[BaseRelation] | type[BaseNebulaRelation]) -> str:
+        edge_type = self.relation_class_to_edge_type.get(relation_class)
+        return edge_type if edge_type is not None else pascal_case_to_snake_case(relation_class.__name__)
+
+
+@functools.cache
+def get_registry() -> ClassRegistry:
+    from sw_nebula_service import NODE_CLASSES, RELATION_CLASSES
+
+    return ClassRegistry(node_classes=NODE_CLASSES, relation_classes=RELATION_CLASSES)
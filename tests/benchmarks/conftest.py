@@ -0,0 +1,42 @@
+import pytest
+
+from sw_nebula_service.managers.connector import Connector, ConnectorConfig
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import OntologyNode, PdfNode
+from sw_nebula_service.models.relations import HasPdf
+from tests.factories import make_pdf_nodes
+from tests.fake_nebula import FakeNebulaBackend
+
+NAME_SPACE = "benchmark"
+NODE_COUNT = 1_000
+
+
+@pytest.fixture
+def connector(backend: FakeNebulaBackend) -> Connector:
+    # Benchmarks measure statement cost, not sign-in, so sessions are reused
+    config = ConnectorConfig(host="fake", port=0, username="root", password="nebula", session_reuse=True)  # noqa: S106
+    connector = Connector(config, session_factory=backend.session_factory())
+    yield connector
+    connector.close()
+
+
+@pytest.fixture(scope="session")
+def pdf_nodes() -> list[PdfNode]:
+    return make_pdf_nodes(NODE_COUNT)
+
+
+@pytest.fixture(scope="session")
+def pdf_vids() -> list[str]:
+    return [f"pdf_{i:06d}" for i in range(NODE_COUNT)]
+
+
+@pytest.fixture(scope="session")
+def relations(pdf_nodes: list[PdfNode], pdf_vids: list[str]) -> list[tuple[HasPdf, str, str]]:
+    ontology = OntologyNode(name="kira")
+    return [(HasPdf(source_node=ontology, target_node=node), "ontology_kira", vid) for node, vid in zip(pdf_nodes, pdf_vids, strict=True)]
+
+
+@pytest.fixture
+def loaded_vertices(vertex_manager: VertexManager, pdf_nodes: list[PdfNode], pdf_vids: list[str]) -> list[str]:
+    vertex_manager.insert_vertices(NAME_SPACE, pdf_nodes, pdf_vids)
+    return pdf_vids
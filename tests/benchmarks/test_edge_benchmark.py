@@ -0,0 +1,30 @@
+import pytest
+
+from sw_nebula_service.models.relations import HasPdf
+from tests.benchmarks.conftest import NAME_SPACE
+
+SINGLE_INSERTS = 100
+
+
+@pytest.mark.benchmark(group="insert_edge")
+def test_insert_edge_single(benchmark, edge_manager, pdf_vids):
+    def insert():
+        return [edge_manager.insert_edge_without_property(NAME_SPACE, "has_pdf", "ontology_kira", vid) for vid in pdf_vids[:SINGLE_INSERTS]]
+
+    results = benchmark(insert)
+    assert all(result.is_succeeded for result in results)
+
+
+@pytest.mark.benchmark(group="insert_edge")
+def test_insert_edges_batched(benchmark, edge_manager, backend, relations):
+    results = benchmark(edge_manager.insert_edges, NAME_SPACE, relations)
+    assert all(result.is_succeeded for result in results)
+    assert len(backend.edges[NAME_SPACE]["has_pdf"]) == len(relations)
+
+
+@pytest.mark.benchmark(group="read_edge")
+def test_get_edges_frame(benchmark, edge_manager, relations):
+    edge_manager.insert_edges(NAME_SPACE, relations)
+    frame = benchmark(edge_manager.get_edges_frame, NAME_SPACE, HasPdf)
+    assert len(frame) == len(relations)
+    assert set(frame["target_node"]) == {"PdfNode"}
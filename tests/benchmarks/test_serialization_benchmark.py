@@ -0,0 +1,47 @@
+"""convert_node_to_nebula_data with cached serialization plans (after) against the per-node model_dump() path it replaced (before)."""
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from sw_nebula_service.managers.utils import convert_node_to_nebula_data, pascal_case_to_snake_case
+from sw_nebula_service.models.nodes import PdfNode
+
+
+def legacy_format_field_value(value: Any) -> str:
+    if isinstance(value, datetime):
+        return f'datetime("{value.strftime("%Y-%m-%dT%H:%M:%S")}")'
+    elif isinstance(value, float):
+        return str(value)
+    elif value is None:
+        return "NULL"
+    elif isinstance(value, bool):
+        return str(value).lower()
+    elif isinstance(value, int):
+        return str(value)
+    elif isinstance(value, str):
+        return f'"{value}"'
+    else:
+        raise ValueError(f"value: {value} is not supported")
+
+
+def legacy_convert_node_to_nebula_data(node: PdfNode) -> tuple[str, str, str]:
+    # The per-node model_dump() path that the cached serialization plans replaced, kept as the baseline
+    data = node.model_dump()
+    tag_name = pascal_case_to_snake_case.__wrapped__(node.__class__.__name__)
+    field_names = list(data.keys())
+    values = [legacy_format_field_value(data[field_name]) for field_name in field_names]
+    return tag_name, ", ".join(field_names), ", ".join(values)
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_serialization_plan(benchmark, pdf_nodes):
+    converted = benchmark(lambda: [convert_node_to_nebula_data(node) for node in pdf_nodes])
+    assert converted[0][0] == "pdf_node"
+
+
+@pytest.mark.benchmark(group="serialization")
+def test_serialization_legacy_model_dump(benchmark, pdf_nodes):
+    converted = benchmark(lambda: [legacy_convert_node_to_nebula_data(node) for node in pdf_nodes])
+    assert [(tag, fields) for tag, fields, _ in converted[:1]] == [convert_node_to_nebula_data(pdf_nodes[0])[:2]]
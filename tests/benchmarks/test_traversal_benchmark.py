@@ -0,0 +1,33 @@
+import pytest
+
+from sw_nebula_service.managers.traversal_manager import TraversalManager
+from sw_nebula_service.models.nodes import LibNode, OntologyNode, RootNode
+from tests.benchmarks.conftest import NAME_SPACE
+
+LIBS = 5
+ONTOLOGIES_PER_LIB = 10
+
+
+@pytest.fixture
+def hierarchy(vertex_manager, edge_manager, pdf_nodes, pdf_vids) -> int:
+    ontology_vids = [f"onto_{lib}_{ontology}" for lib in range(LIBS) for ontology in range(ONTOLOGIES_PER_LIB)]
+    nodes = [RootNode(name="root"), *(LibNode(name=f"lib_{lib}") for lib in range(LIBS)), *(OntologyNode(name=vid) for vid in ontology_vids), *pdf_nodes]
+    vids = ["root", *(f"lib_{lib}" for lib in range(LIBS)), *ontology_vids, *pdf_vids]
+    vertex_manager.insert_vertices(NAME_SPACE, nodes, vids)
+    edges = [("has_lib", "root", f"lib_{lib}", {}) for lib in range(LIBS)]
+    edges += [("has_ontology", f"lib_{vid.split('_')[1]}", vid, {}) for vid in ontology_vids]
+    edges += [("has_pdf", ontology_vids[index % len(ontology_vids)], vid, {}) for index, vid in enumerate(pdf_vids)]
+    edge_manager.insert_edges(NAME_SPACE, edges)
+    return len(vids)
+
+
+@pytest.mark.benchmark(group="traversal")
+def test_get_subtree(benchmark, connector, hierarchy):
+    subtree = benchmark(TraversalManager(connector).get_subtree, NAME_SPACE, "root")
+    assert len(list(subtree.iter_nodes())) == hierarchy
+
+
+@pytest.mark.benchmark(group="traversal")
+def test_get_subtree_with_limits(benchmark, connector, hierarchy):
+    subtree = benchmark(TraversalManager(connector).get_subtree, NAME_SPACE, "root", limits=[LIBS, 20, 100])
+    assert len(list(subtree.iter_nodes())) == 1 + LIBS + 20 + 100
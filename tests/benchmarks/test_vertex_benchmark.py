@@ -0,0 +1,86 @@
+import pytest
+
+from sw_nebula_service.managers.buffered_writer import BufferedWriter
+from sw_nebula_service.managers.frames import result_to_frame
+from sw_nebula_service.managers.utils import convert_vertex_properties
+from sw_nebula_service.models.nodes import PdfNode
+from tests.benchmarks.conftest import NAME_SPACE
+
+SINGLE_INSERTS = 100
+
+
+@pytest.mark.benchmark(group="insert_vertex")
+def test_insert_vertex_single(benchmark, vertex_manager, pdf_nodes, pdf_vids):
+    def insert():
+        return [vertex_manager.insert_vertex(NAME_SPACE, node, vid) for node, vid in zip(pdf_nodes[:SINGLE_INSERTS], pdf_vids, strict=False)]
+
+    results = benchmark(insert)
+    assert all(result.is_succeeded for result in results)
+
+
+@pytest.mark.benchmark(group="insert_vertex")
+def test_insert_vertices_batched(benchmark, vertex_manager, backend, pdf_nodes, pdf_vids):
+    results = benchmark(vertex_manager.insert_vertices, NAME_SPACE, pdf_nodes, pdf_vids)
+    assert all(result.is_succeeded for result in results)
+    assert len(backend.vertices[NAME_SPACE]) == len(pdf_vids)
+
+
+@pytest.mark.benchmark(group="read_vertex")
+def test_get_vertices_by_vids(benchmark, vertex_manager, loaded_vertices):
+    nodes = benchmark(vertex_manager.get_vertices_by_vids, NAME_SPACE, loaded_vertices)
+    assert len(nodes) == len(loaded_vertices)
+
+
+@pytest.mark.benchmark(group="read_vertex")
+def test_iter_vertices_of_node_class(benchmark, vertex_manager, loaded_vertices):
+    nodes = benchmark(lambda: list(vertex_manager.iter_vertices_of_node_class(NAME_SPACE, PdfNode, page_size=250)))
+    assert len(nodes) == len(loaded_vertices)
+
+
+@pytest.mark.benchmark(group="read_vertex")
+def test_get_vertices_frame(benchmark, vertex_manager, loaded_vertices):
+    frame = benchmark(vertex_manager.get_vertices_frame, NAME_SPACE, PdfNode)
+    assert len(frame) == len(loaded_vertices)
+
+
+@pytest.mark.benchmark(group="decode")
+def test_result_to_frame(benchmark, backend, loaded_vertices):
+    result = backend.execute(NAME_SPACE, "LOOKUP ON pdf_node YIELD id(vertex) AS vid, properties(vertex).pdf_file_name AS pdf_file_name, properties(vertex).time_of_upload AS time_of_upload")
+    frame = benchmark(result_to_frame, result, {"vid": "string", "pdf_file_name": "string", "time_of_upload": "datetime64[ns, UTC]"})
+    assert len(frame) == len(loaded_vertices)
+
+
+@pytest.mark.benchmark(group="decode")
+def test_decode_vertices_as_nodes(benchmark, backend, loaded_vertices):
+    vids = ", ".join(f'"{vid}"' for vid in loaded_vertices)
+    result = backend.execute(NAME_SPACE, f"FETCH PROP ON * {vids} YIELD vertex AS n")
+    nodes = benchmark(lambda: [PdfNode(**convert_vertex_properties(value.as_node(), "pdf_node")) for value in result.column_values("n")])
+    assert len(nodes) == len(loaded_vertices)
+
+
+@pytest.mark.benchmark(group="update_vertex")
+def test_update_vertex_field_single(benchmark, vertex_manager, loaded_vertices):
+    def update():
+        return [vertex_manager.update_vertex_field(NAME_SPACE, "pdf_node", vid, "kg_extraction_status", True) for vid in loaded_vertices[:SINGLE_INSERTS]]
+
+    results = benchmark(update)
+    assert all(result.is_succeeded for result in results)
+
+
+@pytest.mark.benchmark(group="update_vertex")
+def test_update_vertices_batched(benchmark, vertex_manager, loaded_vertices):
+    patches = {vid: {"kg_extraction_status": True, "ai_lib_name": "hukuk"} for vid in loaded_vertices[:SINGLE_INSERTS]}
+    results = benchmark(vertex_manager.update_vertices, NAME_SPACE, "pdf_node", patches)
+    assert all(result.is_succeeded for result in results.values())
+
+
+@pytest.mark.benchmark(group="update_vertex")
+def test_buffered_writer_updates(benchmark, vertex_manager, loaded_vertices):
+    def update():
+        with BufferedWriter(vertex_manager, NAME_SPACE, flush_size=SINGLE_INSERTS) as writer:
+            for vid in loaded_vertices[:SINGLE_INSERTS]:
+                writer.update_vertex_field("pdf_node", vid, "kg_extraction_status", True)
+        return writer.report
+
+    report = benchmark(update)
+    assert report.updates_written == SINGLE_INSERTS
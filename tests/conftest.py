@@ -0,0 +1,29 @@
+import pytest
+
+from sw_nebula_service.managers.connector import Connector, ConnectorConfig
+from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from tests.fake_nebula import FakeNebulaBackend
+
+
+@pytest.fixture
+def backend() -> FakeNebulaBackend:
+    return FakeNebulaBackend()
+
+
+@pytest.fixture
+def connector(backend: FakeNebulaBackend) -> Connector:
+    config = ConnectorConfig(host="fake", port=0, username="root", password="nebula")  # noqa: S106
+    connector = Connector(config, session_factory=backend.session_factory())
+    yield connector
+    connector.close()
+
+
+@pytest.fixture
+def vertex_manager(connector: Connector) -> VertexManager:
+    return VertexManager(connector)
+
+
+@pytest.fixture
+def edge_manager(connector: Connector) -> EdgeManager:
+    return EdgeManager(connector)
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sw_nebula_service.models.nodes import PdfNode
+
+
+def make_pdf_nodes(count: int) -> list[PdfNode]:
+    return [
+        PdfNode(
+            user_id=f"user_{i}",
+            node_id=f"node_{i}",
+            pdf_file_hash=f"{i:064x}",
+            pdf_file_name=f"pdf_file_{i}.pdf",
+            time_of_upload=datetime(2025, 1, 1, 12, 0, 0),
+            file_load_status=True,
+            kg_extraction_status=False,
+            general_document_info_id=f"gdi_{i}",
+            ai_lib_name="hukuk",
+            ai_ontology_name="kira",
+            ai_reasoning_for_classification='Document mentions a "rental" agreement',
+            user_chosen_lib_name="hukuk",
+            user_chosen_ontology_name="kira",
+        )
+        for i in range(count)
+    ]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
@@ -0,0 +1,421 @@
+"""In-memory stand-in for a Nebula Graph cluster.
+
+It understands exactly the statements the managers emit and answers them with real nebula3 ResultSets, so the
+decoding paths run unchanged. It is a test fixture, not an nGQL implementation.
+"""
+
+import re
+import threading
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from nebula3.common import ttypes
+from nebula3.common.ttypes import ErrorCode
+from nebula3.data.DataObject import ValueWrapper
+from nebula3.data.ResultSet import ResultSet
+from nebula3.graph.ttypes import ExecutionResponse
+
+from sw_nebula_service.managers.utils import format_field_value
+
+TOKEN_PATTERN = re.compile(r'datetime\("[^"]*"\)|"(?:[^"\\]|\\.)*"|->|[(),:=@]|[^\s(),:="@]+')
+UNESCAPES = {"n": "\n", "r": "\r", "t": "\t"}
+
+STATEMENT_PATTERN = re.compile(r'(?:"(?:[^"\\]|\\.)*"|[^;"])+')
+USE_PATTERN = re.compile(r"USE (\w+)")
+INSERT_VERTEX_PATTERN = re.compile(r"INSERT VERTEX (?:IF NOT EXISTS )?(\w+) \(([^)]*)\) VALUES (.*)", re.DOTALL)
+INSERT_EDGE_PATTERN = re.compile(r"INSERT EDGE (?:IF NOT EXISTS )?(\w+) \(([^)]*)\) VALUES (.*)", re.DOTALL)
+UPDATE_VERTEX_PATTERN = re.compile(r'UPDATE VERTEX ON (\w+) ("(?:[^"\\]|\\.)*") SET (.*)', re.DOTALL)
+FETCH_PATTERN = re.compile(r"FETCH PROP ON \* (.*?) YIELD (.*)", re.DOTALL)
+GO_PATTERN = re.compile(r'GO 1 TO (\d+) STEPS FROM ("(?:[^"\\]|\\.)*") OVER (.*?) YIELD (.*?)(?: LIMIT \[(.*)\])?')
+MATCH_VERTEX_PATTERN = re.compile(r'MATCH \(n:(\w+)\)(?: WHERE id\(n\) > ("(?:[^"\\]|\\.)*"))? RETURN (.*?)(?: ORDER BY vid LIMIT (\d+))?')
+MATCH_EDGE_PATTERN = re.compile(r"MATCH \(\)-\[e:(\w+)\]->\(\)(?: WHERE (.*?))? RETURN (.*?) ORDER BY src, dst, rank LIMIT (\d+)")
+EDGE_CURSOR_PATTERN = re.compile(r'src\(e\) > ("(?:[^"\\]|\\.)*") OR .* dst\(e\) == ("(?:[^"\\]|\\.)*") AND rank\(e\) > (-?\d+)\)')
+MATCH_VERTEX_FILTER_PATTERN = re.compile(r"MATCH \(n:(\w+)\) WHERE (.*) RETURN n")
+LOOKUP_PATTERN = re.compile(r"LOOKUP ON (\w+)(?: WHERE (.*?))? YIELD (.*)")
+CONDITION_PATTERN = re.compile(r'[\w.]+\.(\w+) == (datetime\("[^"]*"\)|"(?:[^"\\]|\\.)*"|\S+)')
+CREATE_TAG_INDEX_PATTERN = re.compile(r"CREATE TAG INDEX IF NOT EXISTS (\w+) ON (\w+)\((.*)\)")
+SHOW_TAG_INDEXES_PATTERN = re.compile(r"SHOW TAG INDEXES")
+SHOW_TAG_INDEX_STATUS_PATTERN = re.compile(r"SHOW TAG INDEX STATUS")
+SHOW_TAGS_PATTERN = re.compile(r"SHOW TAGS")
+SHOW_EDGES_PATTERN = re.compile(r"SHOW EDGES")
+REBUILD_TAG_INDEX_PATTERN = re.compile(r"REBUILD TAG INDEX (\w+)")
+SHOW_JOB_PATTERN = re.compile(r"SHOW JOB (\d+)")
+CREATE_SCHEMA_PATTERN = re.compile(r"CREATE (TAG|EDGE) IF NOT EXISTS (\w+) ?\((.*)\)")
+ALTER_SCHEMA_PATTERN = re.compile(r"ALTER (TAG|EDGE) (\w+) ADD \((.*)\)")
+DESCRIBE_SCHEMA_PATTERN = re.compile(r"DESCRIBE (TAG|EDGE) (\w+)")
+SCHEMA_FIELD_PATTERN = re.compile(r'(\w+) (\w+)(?: DEFAULT (?:"(?:[^"\\]|\\.)*"|\S+))?')
+# DESCRIBE reports canonical type names
+CANONICAL_TYPES = {"int": "int64"}
+PARAMETER_PATTERN = re.compile(r"\$([A-Za-z_]\w*)")
+
+
+def parse_literal(literal: str) -> Any:
+    if literal.startswith('"'):
+        return re.sub(r"\\(.)", lambda match: UNESCAPES.get(match[1], match[1]), literal[1:-1])
+    if literal.startswith("datetime("):
+        return datetime.fromisoformat(literal[10:-2])
+    if literal == "NULL":
+        return None
+    if literal in ("true", "false"):
+        return literal == "true"
+    return float(literal) if any(char in literal for char in ".eE") else int(literal)
+
+
+def to_value(value: Any) -> ttypes.Value:
+    result = ttypes.Value()
+    if value is None:
+        result.set_nVal(ttypes.NullType.__NULL__)
+    elif isinstance(value, bool):
+        result.set_bVal(value)
+    elif isinstance(value, int):
+        result.set_iVal(value)
+    elif isinstance(value, float):
+        result.set_fVal(value)
+    elif isinstance(value, str):
+        result.set_sVal(value.encode())
+    elif isinstance(value, datetime):
+        result.set_dtVal(ttypes.DateTime(value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond))
+    elif isinstance(value, ttypes.Vertex):
+        result.set_vVal(value)
+    elif isinstance(value, list):
+        result.set_lVal(ttypes.NList([to_value(item) for item in value]))
+    else:
+        raise TypeError(f"value: {value} is not supported")
+    return result
+
+
+def make_result(columns: list[str], rows: list[list[Any]], error_code: int = ErrorCode.SUCCEEDED, error_msg: str | None = None) -> ResultSet:
+    data = ttypes.DataSet(column_names=[column.encode() for column in columns], rows=[ttypes.Row(values=[to_value(value) for value in row]) for row in rows])
+    response = ExecutionResponse(error_code=error_code, latency_in_us=0, data=data, error_msg=error_msg.encode() if error_msg else None)
+    return ResultSet(response, all_latency=0)
+
+
+Rows = tuple[list[str], list[list[Any]]]
+
+
+class FakeNebulaError(Exception):
+    def __init__(self, error_code: int, message: str):
+        super().__init__(message)
+        self.error_code = error_code
+
+
+def split_expressions(expressions: str) -> list[tuple[str, str]]:
+    # "id(n) AS vid, n.tag.name AS name" -> [("id(n)", "vid"), ("n.tag.name", "name")]
+    parsed = []
+    for expression in expressions.split(", "):
+        expression, _, alias = expression.partition(" AS ")
+        parsed.append((expression, alias or expression))
+    return parsed
+
+
+class FakeNebulaBackend:
+    """Holds the graph for every space; all sessions created from one backend share it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # space -> vid -> tag -> properties
+        self.vertices: dict[str, dict[str, dict[str, dict[str, Any]]]] = {}
+        # space -> edge type -> (src, dst, rank) -> properties
+        self.edges: dict[str, dict[str, dict[tuple[str, str, int], dict[str, Any]]]] = {}
+        # space -> index name -> (tag, fields); rebuild jobs finish immediately
+        self.tag_indexes: dict[str, dict[str, tuple[str, list[str]]]] = {}
+        # space -> index name -> status of its last rebuild
+        self.tag_index_status: dict[str, dict[str, str]] = {}
+        self.jobs: dict[int, str] = {}
+        # space -> "TAG" / "EDGE" -> name -> property -> type, as declared by CREATE and ALTER
+        self.schemas: dict[str, dict[str, dict[str, dict[str, str]]]] = {}
+        # Nebula rejects inserts into a tag or edge type that was never created, the fake only does when this is set
+        self.require_schema = False
+        self.statements = 0
+        # Statements containing any of these fail with an execution error, to test partial failures
+        self.failing_markers: set[str] = set()
+
+    def session_factory(self) -> Callable[[], "FakeSession"]:
+        return lambda: FakeSession(self)
+
+    def vertex(self, name_space: str, vid: str) -> ttypes.Vertex:
+        # An edge can point at a vid that has no vertex, Nebula returns it as a vertex without tags
+        tags = self.vertices.get(name_space, {}).get(vid, {})
+        return ttypes.Vertex(vid=to_value(vid), tags=[ttypes.Tag(name=tag.encode(), props={key.encode(): to_value(value) for key, value in props.items()}) for tag, props in tags.items()])
+
+    def execute(self, name_space: str | None, query: str) -> ResultSet:
+        with self.lock:
+            self.statements += 1
+            if any(marker in query for marker in self.failing_markers):
+                return make_result([], [], ErrorCode.E_EXECUTION_ERROR, "Storage Error: injected failure")
+            try:
+                # Each side of a UNION ALL yields the same columns, their rows are concatenated
+                columns, rows = [], []
+                for part in query.split(" UNION ALL "):
+                    columns, part_rows = self._execute(name_space, part.strip())
+                    rows.extend(part_rows)
+            except FakeNebulaError as e:
+                return make_result([], [], e.error_code, str(e))
+        return make_result(columns, rows)
+
+    def _execute(self, name_space: str | None, query: str) -> Rows:
+        for pattern, handler in (
+            (INSERT_VERTEX_PATTERN, self._insert_vertex),
+            (INSERT_EDGE_PATTERN, self._insert_edge),
+            (UPDATE_VERTEX_PATTERN, self._update_vertex),
+            (FETCH_PATTERN, self._fetch),
+            (MATCH_VERTEX_PATTERN, self._match_vertex),
+            (MATCH_VERTEX_FILTER_PATTERN, self._match_vertex_filter),
+            (MATCH_EDGE_PATTERN, self._match_edge),
+            (LOOKUP_PATTERN, self._lookup),
+            (GO_PATTERN, self._go),
+            (CREATE_TAG_INDEX_PATTERN, self._create_tag_index),
+            (SHOW_TAG_INDEXES_PATTERN, self._show_tag_indexes),
+            (SHOW_TAG_INDEX_STATUS_PATTERN, self._show_tag_index_status),
+            (SHOW_TAGS_PATTERN, self._show_tags),
+            (SHOW_EDGES_PATTERN, self._show_edges),
+            (REBUILD_TAG_INDEX_PATTERN, self._rebuild_tag_index),
+            (SHOW_JOB_PATTERN, self._show_job),
+            (CREATE_SCHEMA_PATTERN, self._create_schema),
+            (ALTER_SCHEMA_PATTERN, self._alter_schema),
+            (DESCRIBE_SCHEMA_PATTERN, self._describe_schema),
+        ):
+            match = pattern.fullmatch(query)
+            if match is not None:
+                return handler(name_space, *match.groups())
+        raise FakeNebulaError(ErrorCode.E_SYNTAX_ERROR, f"Unsupported statement: {query[:100]}")
+
+    def _insert_vertex(self, name_space: str, tag: str, fields: str, values: str) -> Rows:
+        self._check_schema(name_space, "TAG", tag)
+        field_names = fields.split(", ") if fields else []
+        vertices = self.vertices.setdefault(name_space, {})
+        tokens = TOKEN_PATTERN.findall(values)
+        position = 0
+        while position < len(tokens):
+            vid = parse_literal(tokens[position])
+            row, position = self._read_row(tokens, position + 2)
+            vertices.setdefault(vid, {})[tag] = dict(zip(field_names, row, strict=True))
+        return [], []
+
+    def _insert_edge(self, name_space: str, edge_type: str, fields: str, values: str) -> Rows:
+        self._check_schema(name_space, "EDGE", edge_type)
+        field_names = fields.split(", ") if fields else []
+        edges = self.edges.setdefault(name_space, {}).setdefault(edge_type, {})
+        tokens = TOKEN_PATTERN.findall(values)
+        position = 0
+        while position < len(tokens):
+            src, dst = parse_literal(tokens[position]), parse_literal(tokens[position + 2])
+            position += 3
+            rank = 0
+            if tokens[position] == "@":
+                rank = int(tokens[position + 1])
+                position += 2
+            row, position = self._read_row(tokens, position + 1)
+            edges.setdefault((src, dst, rank), dict(zip(field_names, row, strict=True)))
+        return [], []
+
+    @staticmethod
+    def _read_row(tokens: list[str], position: int) -> tuple[list[Any], int]:
+        # tokens[position] is the opening parenthesis; returns the values and the position after the trailing comma
+        row = []
+        position += 1
+        while tokens[position] != ")":
+            if tokens[position] != ",":
+                row.append(parse_literal(tokens[position]))
+            position += 1
+        position += 1
+        if position < len(tokens) and tokens[position] == ",":
+            position += 1
+        return row, position
+
+    def _update_vertex(self, name_space: str, tag: str, vid: str, assignments: str) -> Rows:
+        props = self.vertices.get(name_space, {}).get(parse_literal(vid), {}).get(tag)
+        if props is None:
+            raise FakeNebulaError(ErrorCode.E_EXECUTION_ERROR, "Vertex or tag not found")
+        tokens = TOKEN_PATTERN.findall(assignments)
+        for position in range(0, len(tokens), 4):
+            props[tokens[position]] = parse_literal(tokens[position + 2])
+        return [], []
+
+    def _fetch(self, name_space: str, vids: str, yields: str) -> Rows:
+        vertices = self.vertices.get(name_space, {})
+        expressions = split_expressions(yields)
+        rows = []
+        for vid in map(parse_literal, TOKEN_PATTERN.findall(vids)[::2]):
+            if vid in vertices:
+                rows.append([self.vertex(name_space, vid) if expression == "vertex" else vid if expression == "id(vertex)" else parse_literal(expression) for expression, _ in expressions])
+        return [alias for _, alias in expressions], rows
+
+    def _go(self, name_space: str, max_depth: str, root_vid: str, over: str, yields: str, limits: str | None) -> Rows:
+        edge_types = over.split(", ")
+        step_limits = [int(limit) for limit in limits.split(", ")] if limits else [None] * int(max_depth)
+        expressions = split_expressions(yields)
+        rows = []
+        frontier = [parse_literal(root_vid)]
+        for limit in step_limits:
+            step = [(edge_type, key, props) for src in frontier for edge_type in edge_types for key, props in self.edges.get(name_space, {}).get(edge_type, {}).items() if key[0] == src][:limit]
+            for edge_type, key, props in step:
+                row = []
+                for expression, _ in expressions:
+                    if expression == "$$":
+                        row.append(self.vertex(name_space, key[1]))
+                    elif expression == "type(edge)":
+                        row.append(edge_type)
+                    else:
+                        row.append(self._edge_expression(key, props, expression))
+                rows.append(row)
+            frontier = list(dict.fromkeys(key[1] for _, key, _ in step))
+        return [alias for _, alias in expressions], rows
+
+    def _match_vertex(self, name_space: str, tag: str, cursor: str | None, returns: str, limit: str | None) -> Rows:
+        vertices = self.vertices.get(name_space, {})
+        vids = sorted(vid for vid, tags in vertices.items() if tag in tags)
+        if cursor is not None:
+            vids = [vid for vid in vids if vid > parse_literal(cursor)]
+        if limit is not None:
+            vids = vids[: int(limit)]
+        expressions = split_expressions(returns)
+        rows = []
+        for vid in vids:
+            row = []
+            for expression, _ in expressions:
+                if expression == "n":
+                    row.append(self.vertex(name_space, vid))
+                elif expression == "id(n)":
+                    row.append(vid)
+                else:
+                    row.append(vertices[vid][tag].get(expression.rsplit(".", 1)[1]))
+            rows.append(row)
+        return [alias for _, alias in expressions], rows
+
+    def _match_edge(self, name_space: str, edge_type: str, where: str | None, returns: str, limit: str) -> Rows:
+        edges = self.edges.get(name_space, {}).get(edge_type, {})
+        keys = sorted(edges)
+        if where is not None:
+            src, dst, rank = EDGE_CURSOR_PATTERN.search(where).groups()
+            cursor = (parse_literal(src), parse_literal(dst), int(rank))
+            keys = [key for key in keys if key > cursor]
+        expressions = split_expressions(returns)
+        rows = [[self._edge_expression(key, edges[key], expression) for expression, _ in expressions] for key in keys[: int(limit)]]
+        return [alias for _, alias in expressions], rows
+
+    def _match_vertex_filter(self, name_space: str, tag: str, where: str) -> Rows:
+        filters = self._parse_filters(where)
+        vertices = self.vertices.get(name_space, {})
+        vids = [vid for vid, tags in vertices.items() if tag in tags and all(tags[tag].get(field) == value for field, value in filters.items())]
+        return ["n"], [[self.vertex(name_space, vid)] for vid in vids]
+
+    def _lookup(self, name_space: str, name: str, where: str | None, yields: str) -> Rows:
+        expressions = split_expressions(yields)
+        columns = [alias for _, alias in expressions]
+        if name in self.edges.get(name_space, {}):
+            edges = self.edges[name_space][name]
+            return columns, [[self._edge_expression(key, props, expression) for expression, _ in expressions] for key, props in edges.items()]
+        filters = self._parse_filters(where) if where else {}
+        if filters and not any(tag == name and set(filters) <= set(fields) for tag, fields in self.tag_indexes.get(name_space, {}).values()):
+            raise FakeNebulaError(ErrorCode.E_SEMANTIC_ERROR, "There is no index to use at runtime")
+        rows = []
+        for vid, tags in self.vertices.get(name_space, {}).items():
+            if name in tags and all(tags[name].get(field) == value for field, value in filters.items()):
+                rows.append([vid if expression == "id(vertex)" else tags[name].get(expression.rsplit(".", 1)[1]) for expression, _ in expressions])
+        return columns, rows
+
+    def _create_tag_index(self, name_space: str, index_name: str, tag: str, fields: str) -> Rows:
+        self.tag_indexes.setdefault(name_space, {})[index_name] = (tag, [field.split("(")[0].strip() for field in fields.split(",") if field.strip()])
+        return [], []
+
+    def _show_tags(self, name_space: str) -> Rows:
+        # Inserts don't check the schema, so a tag also exists once a vertex carries it
+        declared = self.schemas.get(name_space, {}).get("TAG", {})
+        tags = dict.fromkeys([*declared, *(tag for tags in self.vertices.get(name_space, {}).values() for tag in tags)])
+        return ["Name"], [[tag] for tag in tags]
+
+    def _show_edges(self, name_space: str) -> Rows:
+        edge_types = dict.fromkeys([*self.schemas.get(name_space, {}).get("EDGE", {}), *self.edges.get(name_space, {})])
+        return ["Name"], [[edge_type] for edge_type in edge_types]
+
+    def _create_schema(self, name_space: str, kind: str, name: str, fields: str) -> Rows:
+        schemas = self.schemas.setdefault(name_space, {}).setdefault(kind, {})
+        if name not in schemas:
+            schemas[name] = {field: CANONICAL_TYPES.get(field_type, field_type) for field, field_type in SCHEMA_FIELD_PATTERN.findall(fields)}
+        return [], []
+
+    def _alter_schema(self, name_space: str, kind: str, name: str, fields: str) -> Rows:
+        schema = self._schema(name_space, kind, name)
+        for field, field_type in SCHEMA_FIELD_PATTERN.findall(fields):
+            if field in schema:
+                raise FakeNebulaError(ErrorCode.E_EXISTED, "Existed!")
+            schema[field] = CANONICAL_TYPES.get(field_type, field_type)
+        return [], []
+
+    def _describe_schema(self, name_space: str, kind: str, name: str) -> Rows:
+        return ["Field", "Type"], [[field, field_type] for field, field_type in self._schema(name_space, kind, name).items()]
+
+    def _check_schema(self, name_space: str, kind: str, name: str) -> None:
+        if self.require_schema and name not in self.schemas.get(name_space, {}).get(kind, {}):
+            raise FakeNebulaError(ErrorCode.E_SEMANTIC_ERROR, f"No schema found for `{name}'")
+
+    def _schema(self, name_space: str, kind: str, name: str) -> dict[str, str]:
+        schema = self.schemas.get(name_space, {}).get(kind, {}).get(name)
+        if schema is None:
+            raise FakeNebulaError(ErrorCode.E_TAG_NOT_FOUND if kind == "TAG" else ErrorCode.E_EDGE_NOT_FOUND, f"{kind.capitalize()} not existed!")
+        return schema
+
+    def _show_tag_indexes(self, name_space: str) -> Rows:
+        return ["Index Name", "By Tag", "Columns"], [[index_name, tag, fields] for index_name, (tag, fields) in self.tag_indexes.get(name_space, {}).items()]
+
+    def _show_tag_index_status(self, name_space: str) -> Rows:
+        return ["Name", "Index Status"], [[index_name, status] for index_name, status in self.tag_index_status.get(name_space, {}).items()]
+
+    def _rebuild_tag_index(self, name_space: str, index_name: str) -> Rows:
+        if index_name not in self.tag_indexes.get(name_space, {}):
+            raise FakeNebulaError(ErrorCode.E_INDEX_NOT_FOUND, f"Index not found: {index_name}")
+        job_id = len(self.jobs) + 1
+        self.jobs[job_id] = "FINISHED"
+        self.tag_index_status.setdefault(name_space, {})[index_name] = "FINISHED"
+        return ["New Job Id"], [[job_id]]
+
+    def _show_job(self, name_space: str, job_id: str) -> Rows:
+        return ["Job Id(TaskId)", "Command(Dest)", "Status", "Start Time", "Stop Time"], [[int(job_id), "REBUILD_TAG_INDEX", self.jobs[int(job_id)], None, None]]
+
+    @staticmethod
+    def _parse_filters(where: str) -> dict[str, Any]:
+        return {field: parse_literal(literal) for field, literal in CONDITION_PATTERN.findall(where)}
+
+    @staticmethod
+    def _edge_expression(key: tuple[str, str, int], props: dict[str, Any], expression: str) -> Any:
+        if expression.startswith(("src(", "dst(", "rank(")):
+            return key[("src(", "dst(", "rank(").index(expression[: expression.index("(") + 1])]
+        return props.get(expression.rsplit(".", 1)[1])
+
+
+class FakeSession:
+    """Implements the part of nebula3's Session that PooledSession uses."""
+
+    def __init__(self, backend: FakeNebulaBackend):
+        self.backend = backend
+        self.name_space: str | None = None
+
+    def execute(self, query: str) -> ResultSet:
+        return self.execute_parameter(query, None)
+
+    def execute_parameter(self, query: str, params: dict | None) -> ResultSet:
+        if params:
+            # Parameters are inlined as literals, so the handlers only ever see plain statements
+            query = PARAMETER_PATTERN.sub(lambda match: format_field_value(ValueWrapper(params[match[1]]).cast()), query)
+        # Like Nebula, several statements separated by ";" run in order and the first failure stops the rest
+        result = make_result([], [])
+        for statement in STATEMENT_PATTERN.findall(query):
+            if not statement.strip():
+                continue
+            match = USE_PATTERN.fullmatch(statement.strip())
+            if match is not None:
+                self.name_space = match[1]
+                result = make_result([], [])
+            else:
+                result = self.backend.execute(self.name_space, statement)
+            if not result.is_succeeded():
+                return result
+        return result
+
+    def ping(self) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
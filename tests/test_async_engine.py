@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+from sw_nebula_service.async_engine import AsyncBridge, AsyncEngine, AsyncManager
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.models.nodes import LibNode, RootNode
+from sw_nebula_service.models.relations import HasLib
+from tests.fake_nebula import FakeNebulaBackend, FakeSession
+
+NAME_SPACE = "async"
+
+
+def test_managers_run_on_the_bridge(backend: FakeNebulaBackend, connector: Connector):
+    async def main():
+        async with AsyncEngine(connector, max_concurrency=2) as engine:
+            await asyncio.gather(*(engine.vertex_manager.insert_vertex(NAME_SPACE, LibNode(name=name), name) for name in "abcd"))
+            return await engine.vertex_manager.get_vertices_by_vids(NAME_SPACE, list("abcd"))
+
+    nodes = asyncio.run(main())
+    assert {vid: node.name for vid, node in nodes.items()} == {vid: vid for vid in "abcd"}
+
+
+def test_generator_methods_page_on_the_bridge(connector: Connector, monkeypatch):
+    threads = []
+    execute_parameter = FakeSession.execute_parameter
+
+    def record_thread(session, query, params):
+        if query.startswith("MATCH"):
+            threads.append(threading.current_thread().name)
+        return execute_parameter(session, query, params)
+
+    monkeypatch.setattr(FakeSession, "execute_parameter", record_thread)
+
+    async def main():
+        async with AsyncEngine(connector, max_concurrency=2) as engine:
+            await engine.vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=name) for name in "abcde"], list("abcde"))
+            return [node.name async for node in engine.vertex_manager.iter_vertices_of_node_class(NAME_SPACE, LibNode, page_size=2)]
+
+    assert sorted(asyncio.run(main())) == list("abcde")
+    # Three pages, none of them queried on the event loop thread
+    assert len(threads) == 3
+    assert all(thread.startswith("nebula") for thread in threads)
+
+
+def test_engine_apis_are_mirrored(connector: Connector):
+    async def main():
+        async with AsyncEngine(connector, max_concurrency=2) as engine:
+            root, lib = RootNode(name="root"), LibNode(name="hukuk")
+            await engine.bulk_load(NAME_SPACE, [root, lib], ["root", "hukuk"], [(HasLib(source_node=root, target_node=lib), "root", "hukuk")])
+            return await engine.get_subtree(NAME_SPACE, "root"), engine.metrics_snapshot()
+
+    subtree, snapshot = asyncio.run(main())
+    assert [node.vid for node in subtree.iter_nodes()] == ["root", "hukuk"]
+    assert "TraversalManager.get_subtree" in snapshot["histograms"]["execute_seconds"]
+
+
+def test_bridge_bounds_calls_in_flight():
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def work(value: int) -> int:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return value * 2
+
+    async def main():
+        bridge = AsyncBridge(max_concurrency=2)
+        try:
+            return await asyncio.gather(*(bridge.run(work, value) for value in range(6)))
+        finally:
+            bridge.shutdown()
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8, 10]
+    assert peak == 2
+
+
+def test_async_manager_wraps_only_public_methods():
+    class Manager:
+        name_space = "space"
+
+        def double(self, value: int) -> int:
+            return value * 2
+
+        def _private(self) -> str:
+            return "sync"
+
+    async def main():
+        bridge = AsyncBridge(max_concurrency=1)
+        try:
+            manager = AsyncManager(Manager(), bridge)
+            assert manager.name_space == "space"
+            assert manager._private() == "sync"
+            return await manager.double(21)
+        finally:
+            bridge.shutdown()
+
+    assert asyncio.run(main()) == 42
+
+
+def test_generator_methods_become_async_iterators():
+    class Manager:
+        def pages(self, count: int):
+            for page in range(count):
+                yield page, threading.current_thread().name
+
+    async def main():
+        bridge = AsyncBridge(max_concurrency=1)
+        try:
+            return [item async for item in AsyncManager(Manager(), bridge).pages(3)]
+        finally:
+            bridge.shutdown()
+
+    items = asyncio.run(main())
+    assert [page for page, _ in items] == [0, 1, 2]
+    # Every page is produced on the bridge, not on the event loop thread
+    assert all(thread.startswith("nebula") for _, thread in items)
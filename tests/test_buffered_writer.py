@@ -0,0 +1,36 @@
+import time
+
+from sw_nebula_service.managers.buffered_writer import BufferedWriter
+from sw_nebula_service.models.nodes import LibNode, OntologyNode
+from tests.fake_nebula import FakeNebulaBackend
+
+NAME_SPACE = "buffered"
+
+
+def test_partial_buffer_is_flushed_after_the_interval(backend: FakeNebulaBackend, vertex_manager):
+    with BufferedWriter(vertex_manager, NAME_SPACE, flush_size=100, flush_interval=0.05) as writer:
+        for name in ("a", "b", "c"):
+            writer.insert_vertex(LibNode(name=name), name)
+        deadline = time.monotonic() + 5.0
+        while len(backend.vertices.get(NAME_SPACE, {})) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert set(backend.vertices[NAME_SPACE]) == {"a", "b", "c"}
+        assert writer.report.flushes == 1
+
+
+def test_nodes_of_different_tags_share_a_vid(backend: FakeNebulaBackend, vertex_manager):
+    with BufferedWriter(vertex_manager, NAME_SPACE, flush_interval=60.0) as writer:
+        writer.insert_vertex(LibNode(name="hukuk"), "x")
+        writer.insert_vertex(OntologyNode(name="kira"), "x")
+    assert set(backend.vertices[NAME_SPACE]["x"]) == {"lib_node", "ontology_node"}
+    assert writer.report.vertices_written == 2
+
+
+def test_updates_are_coalesced_and_applied_after_inserts(backend: FakeNebulaBackend, vertex_manager):
+    with BufferedWriter(vertex_manager, NAME_SPACE, flush_interval=60.0) as writer:
+        writer.update_vertex_field("lib_node", "x", "name", "first")
+        writer.insert_vertex(LibNode(name="inserted"), "x")
+        writer.update_vertex_field("lib_node", "x", "name", "second")
+        writer.update_vertex_field("lib_node", "x", "name", "third")
+    assert backend.vertices[NAME_SPACE]["x"]["lib_node"]["name"] == "third"
+    assert (writer.report.updates_coalesced, writer.report.updates_written) == (1, 1)
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sw_nebula_service.managers import bulk_load_manager as bulk_load_manager_module
+from sw_nebula_service.managers.bulk_load_manager import BulkLoadManager, BulkLoadProgress
+from sw_nebula_service.managers.connector import Connector, ConnectorConfig
+from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import OntologyNode
+from sw_nebula_service.models.relations import HasPdf
+from tests.factories import make_pdf_nodes
+from tests.fake_nebula import FakeNebulaBackend, make_result
+
+NAME_SPACE = "bulk"
+NODE_COUNT = 10
+
+
+@pytest.fixture
+def bulk_load_manager(vertex_manager, edge_manager) -> BulkLoadManager:
+    return BulkLoadManager(vertex_manager, edge_manager)
+
+
+@pytest.fixture
+def rows():
+    nodes = make_pdf_nodes(NODE_COUNT)
+    vids = [f"pdf_{i}" for i in range(NODE_COUNT)]
+    ontology = OntologyNode(name="kira")
+    relations = [(HasPdf(source_node=ontology, target_node=node), "kira", vid) for node, vid in zip(nodes, vids, strict=True)]
+    return [ontology, *nodes], ["kira", *vids], relations
+
+
+def test_bulk_load_writes_vertices_then_edges(backend: FakeNebulaBackend, bulk_load_manager: BulkLoadManager, rows):
+    nodes, vids, relations = rows
+    progress: list[BulkLoadProgress] = []
+    report = bulk_load_manager.bulk_load(NAME_SPACE, nodes, vids, relations, workers=3, batch_size=3, on_progress=progress.append)
+
+    assert (report.vertices_inserted, report.edges_inserted) == (NODE_COUNT + 1, NODE_COUNT)
+    assert not report.failed_vids and not report.failed_edges and report.retried_batches == 0
+    assert len(backend.vertices[NAME_SPACE]) == NODE_COUNT + 1
+    assert len(backend.edges[NAME_SPACE]["has_pdf"]) == NODE_COUNT
+    # Every edge batch starts after the last vertex batch finished
+    phases = [update.phase for update in progress]
+    assert phases == sorted(phases, key=["vertices", "edges"].index)
+    assert (progress[-1].rows_done, progress[-1].rows_total) == (NODE_COUNT, NODE_COUNT)
+
+
+def test_failed_batch_is_retried(backend: FakeNebulaBackend, bulk_load_manager: BulkLoadManager, rows, monkeypatch):
+    nodes, vids, _ = rows
+    execute = backend.execute
+    failures = []
+
+    def fail_once(name_space, query):
+        if '"pdf_4"' in query and not failures:
+            failures.append(query)
+            return make_result([], [], -1005, "Storage Error: part leader changed")
+        return execute(name_space, query)
+
+    monkeypatch.setattr(backend, "execute", fail_once)
+    report = bulk_load_manager.bulk_load(NAME_SPACE, nodes, vids, batch_size=4, retry_backoff=0)
+    assert report.retried_batches == 1
+    assert report.vertices_inserted == NODE_COUNT + 1
+    assert not report.failed_vids
+
+
+def test_batches_that_keep_failing_are_reported(backend: FakeNebulaBackend, bulk_load_manager: BulkLoadManager, rows):
+    nodes, vids, relations = rows
+    backend.failing_markers.add('"pdf_4"')
+    report = bulk_load_manager.bulk_load(NAME_SPACE, nodes, vids, relations, batch_size=4, max_retries=2, retry_backoff=0)
+
+    # The vertex batch holding pdf_4 gets two retries, the edges pointing into it are never sent
+    assert report.retried_batches == 2
+    assert report.failed_vids == ["pdf_3", "pdf_4", "pdf_5", "pdf_6"]
+    assert report.skipped_edges == [("has_pdf", "kira", f"pdf_{i}") for i in range(3, 7)]
+    assert not report.failed_edges
+    assert (report.vertices_inserted, report.edges_inserted) == (NODE_COUNT + 1 - 4, NODE_COUNT - 4)
+    assert {dst for _, dst, _ in backend.edges[NAME_SPACE]["has_pdf"]}.isdisjoint(report.failed_vids)
+
+
+def test_failing_edge_batches_are_reported(backend: FakeNebulaBackend, bulk_load_manager: BulkLoadManager, rows):
+    nodes, vids, relations = rows
+    backend.failing_markers.add('"kira"->"pdf_4"')
+    report = bulk_load_manager.bulk_load(NAME_SPACE, nodes, vids, relations, batch_size=4, max_retries=1, retry_backoff=0)
+
+    assert report.retried_batches == 1
+    assert report.failed_edges == [("has_pdf", "kira", f"pdf_{i}") for i in range(4, 8)]
+    assert report.edges_inserted == NODE_COUNT - 4
+
+
+def test_workers_default_to_the_pool_size(backend: FakeNebulaBackend, rows, monkeypatch):
+    config = ConnectorConfig(host="fake", port=0, username="root", password="nebula", max_connection_pool_size=3)  # noqa: S106
+    connector = Connector(config, session_factory=backend.session_factory())
+    workers = []
+
+    def executor(max_workers: int, thread_name_prefix: str) -> ThreadPoolExecutor:
+        workers.append(max_workers)
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    monkeypatch.setattr(bulk_load_manager_module, "ThreadPoolExecutor", executor)
+    nodes, vids, _ = rows
+    BulkLoadManager(VertexManager(connector), EdgeManager(connector)).bulk_load(NAME_SPACE, nodes, vids)
+    assert workers == [3]
+    assert connector.config.max_connection_pool_size == 3
@@ -0,0 +1,51 @@
+from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.models.nodes import LibNode, OntologyNode, RootNode
+from sw_nebula_service.models.relations import HasLib, HasOntology
+from tests.fake_nebula import FakeNebulaBackend
+
+NAME_SPACE = "edges"
+
+
+def test_insert_edges_batches_relations_and_raw_edges(backend: FakeNebulaBackend, edge_manager: EdgeManager):
+    root, hukuk = RootNode(name="root"), LibNode(name="hukuk")
+    edges = [
+        (HasLib(source_node=root, target_node=hukuk), "root", "hukuk"),
+        (HasLib(source_node=root, target_node=LibNode(name="finans")), "root", "finans"),
+        (HasLib(source_node=root, target_node=LibNode(name="vergi")), "root", "vergi"),
+        (HasOntology(source_node=hukuk, target_node=OntologyNode(name="kira")), "hukuk", "kira"),
+        ("has_ontology", "hukuk", "is", {"source_node": "LibNode", "target_node": "OntologyNode"}),
+    ]
+    results = edge_manager.insert_edges(NAME_SPACE, edges, batch_size=2)
+
+    assert [result.edges for result in results] == [
+        [("has_lib", "root", "hukuk"), ("has_lib", "root", "finans")],
+        [("has_lib", "root", "vergi")],
+        [("has_ontology", "hukuk", "kira"), ("has_ontology", "hukuk", "is")],
+    ]
+    assert all(result.is_succeeded for result in results)
+    assert backend.edges[NAME_SPACE]["has_lib"][("root", "vergi", 0)] == {"source_node": "RootNode", "target_node": "LibNode"}
+    assert set(backend.edges[NAME_SPACE]["has_ontology"]) == {("hukuk", "kira", 0), ("hukuk", "is", 0)}
+
+
+def test_insert_edges_reports_failed_batches(backend: FakeNebulaBackend, edge_manager: EdgeManager):
+    backend.failing_markers.add('"b"')
+    edges = [("has_lib", "root", vid, {}) for vid in "abc"]
+    results = edge_manager.insert_edges(NAME_SPACE, edges, batch_size=2)
+
+    assert [(result.is_succeeded, result.failed_edges) for result in results] == [(False, [("has_lib", "root", "a"), ("has_lib", "root", "b")]), (True, [])]
+    assert "injected failure" in results[0].message
+    assert set(backend.edges[NAME_SPACE]["has_lib"]) == {("root", "c", 0)}
+
+
+def test_failed_edges_carry_the_edge_type(backend: FakeNebulaBackend, edge_manager: EdgeManager):
+    backend.failing_markers.add("has_ontology")
+    results = edge_manager.insert_edges(NAME_SPACE, [("has_lib", "a", "b", {}), ("has_ontology", "a", "b", {})])
+    # Both edge types connect the same pair, only the one that failed is reported
+    assert [edge for result in results for edge in result.failed_edges] == [("has_ontology", "a", "b")]
+
+
+def test_insert_edges_keeps_the_first_edge(backend: FakeNebulaBackend, edge_manager: EdgeManager):
+    # INSERT EDGE IF NOT EXISTS leaves an existing edge untouched
+    edge_manager.insert_edges(NAME_SPACE, [("has_lib", "root", "a", {"source_node": "first"})])
+    edge_manager.insert_edges(NAME_SPACE, [("has_lib", "root", "a", {"source_node": "second"})])
+    assert backend.edges[NAME_SPACE]["has_lib"][("root", "a", 0)] == {"source_node": "first"}
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.managers.frames import result_to_frame
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import PdfNode
+from sw_nebula_service.models.relations import HasPdf
+from tests.factories import make_pdf_nodes
+from tests.fake_nebula import make_result
+
+NAME_SPACE = "frames"
+
+
+def test_result_to_frame_decodes_typed_columns():
+    result = make_result(["name", "count", "done", "at", "other"], [["a", 1, True, datetime(2025, 1, 1, 12), 1.5], [None, None, None, None, None]])
+    frame = result_to_frame(result, {"name": "string", "count": "Int64", "done": "boolean", "at": "datetime64[ns, UTC]"})
+
+    assert {column: str(dtype) for column, dtype in frame.dtypes.items()} == {"name": "string", "count": "Int64", "done": "boolean", "at": "datetime64[ns, UTC]", "other": "object"}
+    assert frame["at"].iloc[0].isoformat() == "2025-01-01T12:00:00+00:00"
+    assert frame.iloc[1][["name", "count", "done", "at"]].isna().all()
+
+
+def test_get_vertices_frame_projects_columns(vertex_manager: VertexManager):
+    vertex_manager.insert_vertices(NAME_SPACE, make_pdf_nodes(3), [f"pdf_{i}" for i in range(3)])
+    frame = vertex_manager.get_vertices_frame(NAME_SPACE, PdfNode, columns=["pdf_file_name", "file_load_status", "time_of_upload"])
+
+    assert list(frame.columns) == ["vid", "pdf_file_name", "file_load_status", "time_of_upload"]
+    assert [str(dtype) for dtype in frame.dtypes] == ["string", "string", "boolean", "datetime64[ns, UTC]"]
+    assert sorted(frame["pdf_file_name"]) == [f"pdf_file_{i}.pdf" for i in range(3)]
+    assert len(vertex_manager.get_vertices_frame(NAME_SPACE, PdfNode).columns) == len(PdfNode.model_fields) + 1
+    with pytest.raises(ValueError, match="not_a_field"):
+        vertex_manager.get_vertices_frame(NAME_SPACE, PdfNode, columns=["not_a_field"])
+
+
+def test_iter_vertices_frames_pages_by_vid(vertex_manager: VertexManager):
+    vids = [f"pdf_{i}" for i in range(5)]
+    vertex_manager.insert_vertices(NAME_SPACE, make_pdf_nodes(5), vids)
+    frames = list(vertex_manager.iter_vertices_frames(NAME_SPACE, PdfNode, columns=["user_id"], page_size=2))
+
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+    assert [vid for frame in frames for vid in frame["vid"]] == vids
+
+
+def test_edge_frames_carry_the_edge_key(edge_manager: EdgeManager):
+    edges = [("has_pdf", "kira", f"pdf_{i}", {"source_node": "OntologyNode", "target_node": "PdfNode"}) for i in range(3)]
+    edge_manager.insert_edges(NAME_SPACE, edges)
+    frame = edge_manager.get_edges_frame(NAME_SPACE, HasPdf)
+
+    assert list(frame.columns) == ["src", "dst", "rank", "source_node", "target_node"]
+    assert str(frame["rank"].dtype) == "Int64"
+    assert sorted(frame["dst"]) == ["pdf_0", "pdf_1", "pdf_2"]
+    pages = list(edge_manager.iter_edges_frames(NAME_SPACE, "has_pdf", columns=[], page_size=2))
+    assert [list(page["dst"]) for page in pages] == [["pdf_0", "pdf_1"], ["pdf_2"]]
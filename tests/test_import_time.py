@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+# Generous ceilings: these catch an ontology load creeping back into import time, not small regressions
+IMPORT_BUDGETS_US = {
+    "sw_nebula_service": 200_000,
+    "sw_nebula_service.managers.connector": 1_500_000,
+}
+
+
+def cumulative_import_times(module: str) -> dict[str, int]:
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True)  # noqa: S603
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_connector_import_does_not_load_ontology_classes():
+    code = "import sys, sw_nebula_service.managers.connector; print('sw_onto_generation.utils' in sys.modules, 'NODE_CLASSES' in vars(sys.modules['sw_nebula_service']))"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # noqa: S603
+    assert completed.stdout.split() == ["False", "False"]
+
+
+def test_node_classes_are_loaded_on_first_access():
+    import sw_nebula_service
+    from sw_nebula_service.models.nodes import PREDEFINED_NODE_CLASSES
+    from sw_nebula_service.models.relations import PREDEFINED_RELATION_CLASSES
+
+    assert sw_nebula_service.NODE_CLASSES == sw_nebula_service.WRITTEN_NODE_CLASSES + PREDEFINED_NODE_CLASSES
+    assert sw_nebula_service.RELATION_CLASSES == sw_nebula_service.WRITTEN_RELATION_CLASSES + PREDEFINED_RELATION_CLASSES
+    assert "NODE_CLASSES" in vars(sw_nebula_service)
+
+
+def test_import_time_budget(record_property):
+    for module, budget in IMPORT_BUDGETS_US.items():
+        cumulative = cumulative_import_times(module)[module]
+        record_property(f"import_time_us[{module}]", cumulative)
+        assert cumulative < budget, f"importing {module} took {cumulative}us, budget is {budget}us"
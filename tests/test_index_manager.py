@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.index_manager import IndexManager, get_declared_indexes
+from sw_nebula_service.managers.tag_manager import TagManager
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import LibNode, PdfNode
+from tests.factories import FakeClock, make_pdf_nodes
+from tests.fake_nebula import FakeNebulaBackend
+
+NAME_SPACE = "indexes"
+
+
+@pytest.fixture
+def index_manager(connector: Connector) -> IndexManager:
+    return IndexManager(connector)
+
+
+@pytest.fixture
+def vertex_manager(connector: Connector, index_manager: IndexManager) -> VertexManager:
+    vertex_manager = VertexManager(connector, index_manager=index_manager)
+    nodes = make_pdf_nodes(20)
+    vertex_manager.insert_vertices(NAME_SPACE, nodes, [f"pdf_{i}" for i in range(len(nodes))])
+    return vertex_manager
+
+
+def test_indexes_are_declared_from_model_metadata():
+    indexes = {index.name: index for index in get_declared_indexes(PdfNode)}
+    assert set(indexes) == {"pdf_node_user_id_index", "pdf_node_pdf_file_hash_index"}
+    assert indexes["pdf_node_pdf_file_hash_index"].field_spec == "pdf_file_hash(64)"
+    assert get_declared_indexes(LibNode) == ()
+
+
+def test_build_indexes_creates_and_rebuilds(backend, index_manager):
+    report = index_manager.build_indexes(NAME_SPACE, [PdfNode, LibNode], poll_interval=0)
+    assert report.is_succeeded
+    assert sorted(report.created) == ["pdf_node_pdf_file_hash_index", "pdf_node_user_id_index"]
+    assert [job.status for job in report.jobs] == ["FINISHED", "FINISHED"]
+    assert index_manager.find_index(NAME_SPACE, "pdf_node", ["user_id"]).name == "pdf_node_user_id_index"
+
+
+def test_find_vertices_uses_lookup_when_indexed(index_manager, vertex_manager, caplog):
+    index_manager.build_indexes(NAME_SPACE, [PdfNode], poll_interval=0)
+    with caplog.at_level(logging.WARNING):
+        nodes = vertex_manager.find_vertices(NAME_SPACE, PdfNode, user_id="user_3")
+    assert [node.node_id for node in nodes] == ["node_3"]
+    assert nodes[0] == make_pdf_nodes(4)[3]
+    assert not caplog.records
+
+
+def test_find_vertices_falls_back_to_match_with_a_warning(vertex_manager, caplog):
+    with caplog.at_level(logging.WARNING):
+        nodes = vertex_manager.find_vertices(NAME_SPACE, PdfNode, user_id="user_3", pdf_file_name="pdf_file_3.pdf")
+        vertex_manager.find_vertices(NAME_SPACE, PdfNode, user_id="user_3", pdf_file_name="pdf_file_3.pdf")
+    assert [node.node_id for node in nodes] == ["node_3"]
+    assert len(caplog.records) == 1
+    assert "falls back to MATCH" in caplog.records[0].getMessage()
+
+
+def test_find_vertices_rejects_unknown_fields(vertex_manager):
+    with pytest.raises(ValueError, match="not properties of PdfNode"):
+        vertex_manager.find_vertices(NAME_SPACE, PdfNode, owner="user_3")
+
+
+def test_indexes_are_only_used_once_rebuilt(index_manager):
+    index_manager.create_indexes(NAME_SPACE, [PdfNode])
+    assert index_manager.find_index(NAME_SPACE, "pdf_node", ["user_id"]) is None
+
+    job_id = index_manager.rebuild_tag_index(NAME_SPACE, "pdf_node_user_id_index")
+    assert index_manager.find_index(NAME_SPACE, "pdf_node", ["user_id"]) is None
+    index_manager.wait_for_job(NAME_SPACE, job_id, "pdf_node_user_id_index", poll_interval=0)
+    assert index_manager.find_index(NAME_SPACE, "pdf_node", ["user_id"]).status == "FINISHED"
+
+
+def test_index_listing_expires(backend: FakeNebulaBackend, connector: Connector):
+    clock = FakeClock()
+    index_manager = IndexManager(connector, cache_ttl=10.0, clock=clock)
+    assert index_manager.get_tag_indexes(NAME_SPACE) == []
+    # Another client builds an index
+    IndexManager(connector).build_indexes(NAME_SPACE, [PdfNode], poll_interval=0)
+    assert index_manager.get_tag_indexes(NAME_SPACE) == []
+    clock.now = 10.0
+    assert len(index_manager.get_tag_indexes(NAME_SPACE)) == 2
+
+
+def test_tag_manager_invalidates_the_index_listing(connector: Connector, index_manager):
+    index_manager.get_tag_indexes(NAME_SPACE)
+    TagManager(connector, index_manager=index_manager).create_index_on_tag_property(NAME_SPACE, "pdf_node", "pdf_node_name_index", "pdf_file_name")
+    assert NAME_SPACE not in index_manager.tag_indexes
+    assert [index.name for index in index_manager.get_tag_indexes(NAME_SPACE)] == ["pdf_node_name_index"]
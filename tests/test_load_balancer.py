@@ -0,0 +1,172 @@
+from collections import Counter
+
+import pytest
+from nebula3.common.ttypes import ErrorCode
+from nebula3.Exception import IOErrorException
+
+from sw_nebula_service.managers.connector import Connector, ConnectorConfig
+from sw_nebula_service.managers.load_balancer import HostSession, LoadBalancer
+from tests.factories import FakeClock
+from tests.fake_nebula import FakeNebulaBackend, FakeSession, make_result
+
+ADDRESSES = [("graphd-0", 9669), ("graphd-1", 9669), ("graphd-2", 9669)]
+
+
+class StandInPool:
+    """Stands in for one nebula3 ConnectionPool, records which graphd every session came from."""
+
+    def __init__(self, backend: FakeNebulaBackend, sessions: Counter):
+        self.backend = backend
+        self.sessions = sessions
+        self.address: tuple[str, int] | None = None
+        self.reachable = True
+        self.closed = False
+
+    def init(self, addresses, config) -> bool:
+        self.address = addresses[0]
+        return self.reachable
+
+    def get_session(self, username: str, password: str) -> FakeSession:
+        if not self.reachable:
+            raise IOErrorException(IOErrorException.E_CONNECT_BROKEN, f"{self.address} is down")
+        self.sessions[self.address] += 1
+        return FakeSession(self.backend)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def sessions() -> Counter:
+    return Counter()
+
+
+@pytest.fixture
+def pools(sessions: Counter) -> list[StandInPool]:
+    backend = FakeNebulaBackend()
+    return [StandInPool(backend, sessions) for _ in ADDRESSES]
+
+
+def make_connector(pools: list[StandInPool], **config) -> Connector:
+    remaining = iter(pools)
+    return Connector(ConnectorConfig(username="root", password="nebula", addresses=ADDRESSES, read_retry_backoff=0, **config), connection_pool_factory=lambda: next(remaining))  # noqa: S106
+
+
+def test_config_requires_an_address():
+    with pytest.raises(ValueError, match="addresses must be set"):
+        ConnectorConfig(username="root", password="nebula")  # noqa: S106
+    config = ConnectorConfig(host="graphd-0", port=9669, username="root", password="nebula", addresses=ADDRESSES)  # noqa: S106
+    assert config.graphd_addresses == ADDRESSES
+
+
+def test_round_robin_spreads_sessions(pools, sessions):
+    connector = make_connector(pools)
+    for _ in range(9):
+        with connector.session() as session:
+            session.execute("SHOW SPACES")
+    assert sessions == dict.fromkeys(ADDRESSES, 3)
+
+
+def test_least_outstanding_avoids_busy_host():
+    load_balancer = LoadBalancer(ADDRESSES, strategy="least_outstanding", clock=FakeClock())
+    busy = load_balancer.pick()
+    load_balancer.start(busy)
+    assert load_balancer.pick() is not busy
+
+
+def test_host_is_ejected_after_failures_and_readmitted():
+    clock = FakeClock()
+    load_balancer = LoadBalancer(ADDRESSES, max_failures=2, ejection_time=10.0, clock=clock)
+    host = load_balancer.hosts[0]
+    load_balancer.record_failure(host)
+    assert load_balancer.is_available(host)
+    load_balancer.record_failure(host)
+    assert not load_balancer.is_available(host)
+    assert all(load_balancer.pick() is not host for _ in range(6))
+
+    clock.now = 10.0
+    assert host in {load_balancer.pick() for _ in range(3)}
+    assert host.consecutive_failures == 0
+
+
+def test_slow_host_is_ejected():
+    clock = FakeClock()
+    load_balancer = LoadBalancer(ADDRESSES, slow_threshold=0.5, clock=clock)
+    host = load_balancer.hosts[1]
+    start = load_balancer.start(host)
+    clock.now += 2.0
+    load_balancer.finish(host, start, failed=False)
+    assert not load_balancer.is_available(host)
+    assert load_balancer.stats()[1]["ejections"] == 1
+
+
+class TimedSession:
+    """Session whose statements take as many seconds on the fake clock as they are given."""
+
+    def __init__(self, clock: FakeClock, durations: dict[str, float]):
+        self.clock = clock
+        self.durations = durations
+
+    def execute_parameter(self, query: str, params: dict | None):
+        self.clock.now += self.durations[query.split(" ", 1)[0]]
+        return make_result([], [])
+
+
+def test_single_slow_scan_does_not_eject_host():
+    clock = FakeClock()
+    load_balancer = LoadBalancer(ADDRESSES, slow_threshold=0.5, clock=clock)
+    host = load_balancer.hosts[0]
+    session = HostSession(TimedSession(clock, {"FETCH": 0.01, "LOOKUP": 30.0, "REBUILD": 5.0}), host, load_balancer)
+    session.execute('FETCH PROP ON * "a" YIELD vertex AS n')
+    session.execute("LOOKUP ON pdf_node YIELD id(vertex) AS vid")
+    session.execute("REBUILD TAG INDEX pdf_node_user_id_index")
+    assert load_balancer.is_available(host)
+    assert host.latency_average == pytest.approx(0.01)
+
+    # Point reads still count, the moving average ejects once they stay slow
+    session.session.durations["FETCH"] = 2.0
+    session.execute('FETCH PROP ON * "a" YIELD vertex AS n')
+    assert load_balancer.is_available(host)
+    session.execute('FETCH PROP ON * "a" YIELD vertex AS n')
+    assert not load_balancer.is_available(host)
+
+
+def test_unreachable_host_fails_over(pools, sessions):
+    pools[1].reachable = False
+    connector = make_connector(pools)
+    assert connector.connect()
+    assert connector.pool_stats()["hosts_available"] == 2
+    for _ in range(6):
+        with connector.session() as session:
+            session.execute("SHOW SPACES")
+    assert sessions[ADDRESSES[1]] == 0
+    assert sum(sessions.values()) == 6
+
+    connector.close()
+    assert [pool.closed for pool in pools] == [True, False, True]
+
+
+def test_session_failure_fails_over(pools, sessions):
+    connector = make_connector(pools)
+    assert connector.connect()
+    pools[0].reachable = False
+    for _ in range(3):
+        with connector.session() as session:
+            session.execute("SHOW SPACES")
+    assert sessions[ADDRESSES[0]] == 0
+    assert sum(sessions.values()) == 3
+
+
+def test_execute_read_retries_on_rpc_failure(pools, monkeypatch):
+    connector = make_connector(pools, read_retries=2)
+    responses = [make_result([], [], ErrorCode.E_RPC_FAILURE, "storage unreachable"), make_result(["n"], [[1]])]
+    monkeypatch.setattr(FakeSession, "execute_parameter", lambda self, query, params: responses.pop(0))
+    result = connector.execute_read(None, "SHOW SPACES")
+    assert result.is_succeeded()
+    assert not responses
+
+
+def test_execute_read_gives_up_after_retries(pools, monkeypatch):
+    connector = make_connector(pools, read_retries=1)
+    monkeypatch.setattr(FakeSession, "execute_parameter", lambda self, query, params: make_result([], [], ErrorCode.E_LEADER_CHANGED, "leader changed"))
+    assert connector.execute_read(None, "SHOW SPACES").error_code() == ErrorCode.E_LEADER_CHANGED
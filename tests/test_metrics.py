@@ -0,0 +1,90 @@
+import pytest
+
+from sw_nebula_service.managers.connector import Connector, ConnectorConfig
+from sw_nebula_service.managers.metrics import ConnectorMetrics, current_operation
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import LibNode
+from tests.fake_nebula import FakeNebulaBackend, FakeSession, make_result
+
+NAME_SPACE = "metrics"
+
+
+def test_statements_are_counted_per_operation(backend: FakeNebulaBackend, connector: Connector, vertex_manager: VertexManager):
+    backend.failing_markers.add('"c"')
+    vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in "abcd"], list("abcd"), batch_size=2)
+    vertex_manager.get_vertices_by_vids(NAME_SPACE, ["a", "b"])
+    snapshot = connector.metrics_snapshot()
+
+    assert snapshot["histograms"]["execute_seconds"]["VertexManager.insert_vertices"]["count"] == 2
+    # Only the succeeding batch reports server latency and rows, the failed one is counted as an error
+    assert snapshot["histograms"]["rows"]["VertexManager.insert_vertices"]["count"] == 1
+    assert snapshot["errors"] == {"VertexManager.insert_vertices": {"E_EXECUTION_ERROR": 1}}
+    assert snapshot["histograms"]["rows"]["VertexManager.get_vertices_by_vids"]["sum"] == 2
+    assert snapshot["pool"]["active"] == 0
+
+
+def test_transport_failures_are_counted(connector: Connector, vertex_manager: VertexManager, monkeypatch):
+    failing_prefix = "INSERT"
+    execute_parameter = FakeSession.execute_parameter
+
+    def lose_connection(session, query, params):
+        if query.startswith(failing_prefix):
+            raise ConnectionError("connection lost")
+        return execute_parameter(session, query, params)
+
+    monkeypatch.setattr(FakeSession, "execute_parameter", lose_connection)
+    with pytest.raises(ConnectionError):
+        vertex_manager.insert_vertex(NAME_SPACE, LibNode(name="a"), "a")
+    snapshot = connector.metrics_snapshot()
+    assert snapshot["errors"] == {"VertexManager.insert_vertex": {"EXCEPTION": 1}}
+    assert snapshot["histograms"]["execute_seconds"]["VertexManager.insert_vertex"]["count"] == 1
+
+    # Switching space goes through use(), which counts its own transport failures
+    failing_prefix = "USE"
+    with pytest.raises(ConnectionError):
+        vertex_manager.insert_vertex(NAME_SPACE, LibNode(name="a"), "a")
+    assert connector.metrics_snapshot()["errors"] == {"VertexManager.insert_vertex": {"EXCEPTION": 2}}
+
+
+def test_generator_methods_label_only_their_own_statements(connector: Connector, vertex_manager: VertexManager):
+    vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in "abc"], list("abc"))
+    labels = [current_operation.get() for _ in vertex_manager.iter_vertices_of_node_class(NAME_SPACE, LibNode, page_size=2)]
+
+    assert labels == ["unknown"] * 3
+    assert connector.metrics_snapshot()["histograms"]["execute_seconds"]["VertexManager.iter_vertices_of_node_class"]["count"] == 2
+
+
+def test_histogram_buckets_are_cumulative_in_the_text_format():
+    metrics = ConnectorMetrics()
+    token = current_operation.set("op")
+    try:
+        metrics.observe_result(make_result(["n"], [[1], [2]]), 0.003)
+        metrics.observe_result(make_result(["n"], [[1]] * 20), 20.0)
+        metrics.observe_result(make_result([], [], -1005, "failed"), 0.001)
+    finally:
+        current_operation.reset(token)
+    text = metrics.to_prometheus({"active": 1, "hosts_available": 2})
+
+    # Failed statements still count towards the execute latency
+    assert 'sw_nebula_execute_seconds_bucket{operation="op",le="0.001"} 1' in text
+    assert 'sw_nebula_execute_seconds_bucket{operation="op",le="0.005"} 2' in text
+    assert 'sw_nebula_execute_seconds_bucket{operation="op",le="10.0"} 2' in text
+    assert 'sw_nebula_execute_seconds_bucket{operation="op",le="+Inf"} 3' in text
+    assert 'sw_nebula_rows_sum{operation="op"} 22' in text
+    assert 'sw_nebula_errors_total{operation="op",error_code="E_EXECUTION_ERROR"} 1' in text
+    assert 'sw_nebula_pool_sessions{state="active"} 1' in text
+    assert "sw_nebula_hosts_available 2" in text
+    assert 'state="hosts_available"' not in text
+    metrics.reset()
+    assert metrics.snapshot() == {"histograms": {}, "errors": {}, "pool": {}}
+
+
+def test_disabled_metrics_still_report_the_pool(backend: FakeNebulaBackend):
+    config = ConnectorConfig(host="fake", port=0, username="root", password="nebula", metrics_enabled=False)  # noqa: S106
+    connector = Connector(config, session_factory=backend.session_factory())
+    VertexManager(connector).insert_vertex(NAME_SPACE, LibNode(name="a"), "a")
+
+    snapshot = connector.metrics_snapshot()
+    assert (snapshot["histograms"], snapshot["errors"]) == ({}, {})
+    assert snapshot["pool"]["active"] == 0
+    connector.close()
@@ -0,0 +1,26 @@
+import logging
+
+import pytest
+from pydantic import ValidationError
+
+from sw_nebula_service.managers.query_log import QUERY_LOGGER_NAME, QueryLogConfig, QueryLogger
+from tests.fake_nebula import make_result
+
+
+def test_level_names_are_normalised():
+    config = QueryLogConfig(levels={"insert": "info"}, default_level="debug", error_level="Error")
+    assert (config.levels, config.default_level, config.error_level) == ({"INSERT": "INFO"}, "DEBUG", "ERROR")
+
+
+@pytest.mark.parametrize("levels", [{"levels": {"INSERT": "LOUD"}}, {"default_level": "VERBOSE"}, {"error_level": "Level 30"}])
+def test_unknown_level_names_are_rejected(levels):
+    with pytest.raises(ValidationError, match="is not a logging level name"):
+        QueryLogConfig(**levels)
+
+
+def test_statements_are_logged_at_their_level(caplog):
+    query_logger = QueryLogger(QueryLogConfig(enabled=True, levels={"insert": "info"}, default_level="debug"))
+    with caplog.at_level(logging.DEBUG, logger=QUERY_LOGGER_NAME):
+        query_logger.log('INSERT VERTEX lib_node (name) VALUES "a": ("a")', make_result([], []), "space")
+        query_logger.log('FETCH PROP ON * "a" YIELD vertex AS n', make_result([], [], error_code=-1009, error_msg="boom"), "space")
+    assert [(record.levelno, record.statement) for record in caplog.records] == [(logging.INFO, "INSERT"), (logging.WARNING, "FETCH")]
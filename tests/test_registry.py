@@ -0,0 +1,40 @@
+import pytest
+
+from sw_nebula_service.managers.utils import get_node_class_by_tag_name
+from sw_nebula_service.models.nodes import LibNode, OntologyNode, PdfNode
+from sw_nebula_service.models.relations import HasLib, HasPdf
+from sw_nebula_service.registry import ClassRegistry, get_registry
+
+
+def test_registry_maps_both_ways():
+    registry = ClassRegistry(node_classes=[LibNode, PdfNode], relation_classes=[HasPdf])
+
+    assert registry.get_node_class("lib_node") is LibNode
+    assert registry.get_tag_name(PdfNode) == "pdf_node"
+    assert registry.get_relation_class("has_pdf") is HasPdf
+    assert registry.get_edge_type(HasPdf) == "has_pdf"
+
+
+def test_unknown_names_raise_and_unknown_classes_fall_back_to_snake_case():
+    registry = ClassRegistry(node_classes=[LibNode], relation_classes=[HasPdf])
+
+    with pytest.raises(ValueError, match="ontology_node"):
+        registry.get_node_class("ontology_node")
+    with pytest.raises(ValueError, match="has_lib"):
+        registry.get_relation_class("has_lib")
+    assert registry.get_tag_name(OntologyNode) == "ontology_node"
+    assert registry.get_edge_type(HasLib) == "has_lib"
+
+
+def test_classes_registered_later_are_found():
+    registry = ClassRegistry()
+    assert registry.register_node_class(OntologyNode) == "ontology_node"
+    assert registry.register_relation_class(HasLib) == "has_lib"
+    assert registry.get_node_class("ontology_node") is OntologyNode
+    assert registry.get_relation_class("has_lib") is HasLib
+
+
+def test_shared_registry_covers_predefined_classes():
+    assert get_registry() is get_registry()
+    assert get_node_class_by_tag_name("pdf_node") is PdfNode
+    assert get_registry().get_relation_class("has_pdf") is HasPdf
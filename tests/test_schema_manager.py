@@ -0,0 +1,73 @@
+import pytest
+
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.edge_type_manager import EdgeTypeManager
+from sw_nebula_service.managers.schema_manager import SchemaManager
+from sw_nebula_service.managers.tag_manager import TagManager
+from sw_nebula_service.models.nodes import BaseNebulaNode, LibNode
+from sw_nebula_service.models.relations import HasLib
+from tests.fake_nebula import FakeNebulaBackend
+
+NAME_SPACE = "schema"
+
+
+@pytest.fixture
+def schema_manager(connector: Connector, tmp_path) -> SchemaManager:
+    return SchemaManager(connector, TagManager(connector), EdgeTypeManager(connector), fingerprint_cache=tmp_path / "fingerprints.json")
+
+
+def test_sync_creates_missing_schema_then_skips_by_fingerprint(backend: FakeNebulaBackend, schema_manager: SchemaManager):
+    result = schema_manager.sync(NAME_SPACE, [LibNode], [HasLib])
+
+    assert result.is_succeeded and not result.skipped
+    assert result.statements == ["CREATE TAG IF NOT EXISTS lib_node (name string)", 'CREATE EDGE IF NOT EXISTS has_lib(source_node string DEFAULT "RootNode", target_node string DEFAULT "LibNode")']
+    assert backend.schemas[NAME_SPACE]["EDGE"]["has_lib"] == {"source_node": "string", "target_node": "string"}
+
+    statements = backend.statements
+    assert schema_manager.sync(NAME_SPACE, [LibNode], [HasLib]).skipped
+    # Only the SHOW TAGS that checks the space still has its tags
+    assert backend.statements == statements + 1
+    # A forced sync diffs against the server again and finds nothing to apply
+    forced = schema_manager.sync(NAME_SPACE, [LibNode], [HasLib], force=True)
+    assert not forced.skipped and forced.statements == []
+
+
+def test_recreated_space_is_synced_again(backend: FakeNebulaBackend, schema_manager: SchemaManager):
+    schema_manager.sync(NAME_SPACE, [LibNode], [HasLib])
+    # Dropping and recreating the space loses its schema but not the cached fingerprint
+    backend.schemas[NAME_SPACE] = {}
+
+    result = schema_manager.sync(NAME_SPACE, [LibNode], [HasLib])
+    assert not result.skipped
+    assert len(result.statements) == 2
+    assert set(backend.schemas[NAME_SPACE]["TAG"]) == {"lib_node"}
+
+
+def test_diff_adds_missing_properties_and_reports_drift(backend: FakeNebulaBackend, schema_manager: SchemaManager):
+    backend.schemas[NAME_SPACE] = {"TAG": {"lib_node": {}, "pdf_like": {"size": "string"}}}
+
+    class PdfLike(BaseNebulaNode):
+        size: int
+        pages: int
+
+    result = schema_manager.sync(NAME_SPACE, [LibNode, PdfLike], [])
+    assert result.statements == ["ALTER TAG lib_node ADD (name string)", "ALTER TAG pdf_like ADD (pages int)"]
+    assert result.drift == ["tag pdf_like.size is string but the model declares int"]
+    assert backend.schemas[NAME_SPACE]["TAG"]["pdf_like"] == {"size": "string", "pages": "int64"}
+    # Drift is never fixed automatically, so the next sync diffs again instead of skipping
+    assert not schema_manager.sync(NAME_SPACE, [LibNode, PdfLike], []).skipped
+
+
+def test_fingerprint_follows_the_model_fields():
+    class Draft(BaseNebulaNode):
+        name: str
+
+    fingerprint = SchemaManager.fingerprint([Draft], [HasLib])
+    assert SchemaManager.fingerprint([Draft], [HasLib]) == fingerprint
+
+    class Draft(BaseNebulaNode):
+        name: str
+        version: int
+
+    assert SchemaManager.fingerprint([Draft], [HasLib]) != fingerprint
+    assert SchemaManager.fingerprint([Draft], []) != SchemaManager.fingerprint([Draft], [HasLib])
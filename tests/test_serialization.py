@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from sw_nebula_service.managers.utils import convert_fields_of_class_to_nebula_types, convert_node_to_nebula_data, format_field_value, get_serialization_plan
+from sw_nebula_service.models.nodes import BaseNebulaNode, LibNode
+from tests.factories import make_pdf_nodes
+
+
+class Address(BaseModel):
+    city: str
+
+
+class Person(BaseNebulaNode):
+    name: str
+    age: int | None = None
+    score: float
+    active: bool
+    born: datetime
+    address: Address | None = None
+
+
+def test_plan_matches_the_generic_formatter():
+    node = make_pdf_nodes(1)[0]
+    fields = node.model_dump()
+    assert convert_node_to_nebula_data(node) == ("pdf_node", ", ".join(fields), ", ".join(format_field_value(value) for value in fields.values()))
+
+
+def test_plan_skips_nested_models_and_writes_null_for_missing_optionals():
+    person = Person(name="Ayşe", score=1.5, active=True, born=datetime(1990, 5, 1, 8, 30), address=Address(city="Ankara"))
+    tag_name, field_names, values = convert_node_to_nebula_data(person)
+
+    assert (tag_name, field_names) == ("person", "name, age, score, active, born")
+    assert values == '"Ayşe", NULL, 1.5, true, datetime("1990-05-01T08:30:00")'
+    assert convert_fields_of_class_to_nebula_types(Person) == ["name string", "age int", "score float", "active bool", "born datetime"]
+
+
+def test_mixed_unions_are_formatted_by_value():
+    class Code(BaseNebulaNode):
+        code: int | str
+        label: str | None = None
+
+    assert convert_node_to_nebula_data(Code(code=7))[2] == "7, NULL"
+    assert convert_node_to_nebula_data(Code(code="A-7", label="x"))[2] == '"A-7", "x"'
+
+
+def test_strings_are_escaped_for_ngql():
+    _, _, values = convert_node_to_nebula_data(LibNode(name='a "quoted"\\path\nnext\tline'))
+    assert values == '"a \\"quoted\\"\\\\path\\nnext\\tline"'
+    assert values == format_field_value('a "quoted"\\path\nnext\tline')
+
+
+def test_plans_are_built_once_per_class():
+    assert get_serialization_plan(Person) is get_serialization_plan(Person)
+    assert get_serialization_plan(LibNode).field_types == {"name": str}
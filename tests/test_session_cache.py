@@ -0,0 +1,99 @@
+from nebula3.common.ttypes import ErrorCode
+
+from sw_nebula_service.managers.session_cache import PooledSession, SessionCache
+from tests.fake_nebula import FakeNebulaBackend, FakeSession, make_result
+
+INSERT_QUERY = 'INSERT VERTEX lib_node (name) VALUES "v": ("v")'
+
+
+class TrackedSession(FakeSession):
+    """FakeSession that records its statements and whether it was released."""
+
+    def __init__(self, backend: FakeNebulaBackend):
+        super().__init__(backend)
+        self.queries: list[str] = []
+        self.released = False
+        self.alive = True
+        self.expire_next = False
+
+    def execute_parameter(self, query: str, params: dict | None):
+        self.queries.append(query)
+        if self.expire_next:
+            self.expire_next = False
+            return make_result([], [], ErrorCode.E_SESSION_INVALID, "Session not existed")
+        return super().execute_parameter(query, params)
+
+    def ping(self) -> bool:
+        return self.alive
+
+    def release(self) -> None:
+        self.released = True
+
+
+class TrackedFactory:
+    def __init__(self, backend: FakeNebulaBackend):
+        self.backend = backend
+        self.sessions: list[TrackedSession] = []
+
+    def __call__(self) -> TrackedSession:
+        session = TrackedSession(self.backend)
+        self.sessions.append(session)
+        return session
+
+
+def make_cache(factory: TrackedFactory, idle_timeout: float = 300.0, health_check_interval: float = 30.0) -> SessionCache:
+    return SessionCache(factory, max_size=2, idle_timeout=idle_timeout, health_check_interval=health_check_interval)
+
+
+def test_sessions_are_reused_per_space(backend: FakeNebulaBackend):
+    factory = TrackedFactory(backend)
+    cache = make_cache(factory)
+    first = cache.acquire("a")
+    second = cache.acquire("b")
+    cache.release(first)
+    cache.release(second)
+
+    assert cache.acquire("b") is second
+    assert cache.acquire("a") is first
+    assert len(factory.sessions) == 2
+    # Each session switched space once, when it was first handed out
+    assert [session.queries for session in factory.sessions] == [["USE a"], ["USE b"]]
+
+
+def test_idle_session_switches_space(backend: FakeNebulaBackend):
+    factory = TrackedFactory(backend)
+    cache = make_cache(factory)
+    cache.release(cache.acquire("a"))
+    session = cache.acquire("b")
+    assert session.name_space == "b"
+    assert factory.sessions[0].queries == ["USE a", "USE b"]
+
+
+def test_expired_and_unhealthy_sessions_are_replaced(backend: FakeNebulaBackend):
+    factory = TrackedFactory(backend)
+    cache = make_cache(factory, idle_timeout=0.0)
+    cache.release(cache.acquire("a"))
+    cache.acquire("a")
+    assert len(factory.sessions) == 2
+    assert factory.sessions[0].released
+
+    factory = TrackedFactory(backend)
+    cache = make_cache(factory, health_check_interval=0.0)
+    cache.release(cache.acquire("a"))
+    factory.sessions[0].alive = False
+    assert cache.acquire("a").session is factory.sessions[1]
+    assert factory.sessions[0].released
+    assert cache.active_count == 1
+
+
+def test_expired_server_session_is_reauthenticated(backend: FakeNebulaBackend):
+    factory = TrackedFactory(backend)
+    session = PooledSession(factory)
+    session.use("a")
+    factory.sessions[0].expire_next = True
+
+    assert session.execute(INSERT_QUERY).is_succeeded()
+    assert session.session is factory.sessions[1]
+    assert factory.sessions[0].released
+    # The new session is put back on the space before the statement is retried
+    assert factory.sessions[1].queries == ["USE a", INSERT_QUERY]
@@ -0,0 +1,60 @@
+from datetime import date, datetime
+
+import pytest
+from nebula3.data.DataObject import ValueWrapper
+
+from sw_nebula_service.managers.statements import get_statement, quote_vid, to_nebula_value
+from sw_nebula_service.managers.vertex_manager import VertexManager
+
+
+def test_statement_is_compiled_once_per_tag():
+    statement = get_statement("insert_vertices", tag_name="pdf_node", field_names="name")
+    assert get_statement("insert_vertices", tag_name="pdf_node", field_names="name") is statement
+    assert statement.slots == {"rows"}
+    assert statement.render(rows='"a": ("x")') == 'INSERT VERTEX pdf_node (name) VALUES "a": ("x")'
+
+
+def test_vids_are_escaped():
+    assert quote_vid('a"b\\c') == '"a\\"b\\\\c"'
+    statement = VertexManager._update_statement("pdf_node", 'vid"; DROP SPACE x', {"name": 'it"s'})
+    assert statement == 'UPDATE VERTEX ON pdf_node "vid\\"; DROP SPACE x" SET name = "it\\"s"'
+
+
+def test_bind_sends_parameters_separately():
+    statement = get_statement("match_vertices_page_after", tag_name="pdf_node")
+    query, params = statement.bind({"cursor": 'vid"1'}, returns="n, id(n) AS vid", page_size=10)
+    assert query == "MATCH (n:pdf_node) WHERE id(n) > $cursor RETURN n, id(n) AS vid ORDER BY vid LIMIT 10"
+    assert ValueWrapper(params["cursor"]).cast() == 'vid"1'
+    with pytest.raises(ValueError, match="cursor"):
+        statement.bind({}, returns="n", page_size=10)
+
+
+def test_go_references_are_not_parameters():
+    statement = get_statement("get_subtree")
+    assert statement.parameters == frozenset()
+    assert "$$ AS node LIMIT [2, 2]" in statement.render(root_vid=quote_vid("root"), max_depth=2, over="has_lib", limit_clause=" LIMIT [2, 2]")
+
+
+def test_parameters_come_from_the_template_only():
+    # A $ inside a compiled field list or a rendered DEFAULT is text, not a parameter to bind
+    assert get_statement("insert_vertices", tag_name="pdf_node", field_names="$name").parameters == frozenset()
+    assert get_statement("create_edge").render(edge_type="has_pdf", fields='source_node string DEFAULT "$x"').endswith('DEFAULT "$x")')
+    assert get_statement("match_edges_page_after", edge_type="has_pdf").parameters == {"src", "dst", "rank"}
+
+
+def test_only_schema_parts_are_compiled():
+    with pytest.raises(ValueError, match="page_size"):
+        get_statement("match_vertices_page", tag_name="pdf_node", page_size=10)
+    assert get_statement.cache_info().maxsize is not None
+
+
+def test_fixed_parts_keep_braces():
+    statement = get_statement("insert_vertices", tag_name="pdf_node", field_names="{x}")
+    assert statement.render(rows='"a": ("{y}")') == 'INSERT VERTEX pdf_node ({x}) VALUES "a": ("{y}")'
+
+
+def test_datetime_parameter_keeps_time():
+    value = to_nebula_value(datetime(2025, 1, 1, 12, 30, 5))
+    assert value.getType() == value.DTVAL
+    assert (value.get_dtVal().hour, value.get_dtVal().minute) == (12, 30)
+    assert to_nebula_value(date(2025, 1, 1)).getType() == value.DVAL
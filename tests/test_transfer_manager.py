@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from sw_nebula_service.managers import transfer_manager as transfer_manager_module
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.managers.edge_type_manager import EdgeTypeManager
+from sw_nebula_service.managers.tag_manager import TagManager
+from sw_nebula_service.managers.transfer_manager import CHECKPOINT_FILE, MANIFEST_FILE, TransferManager
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import OntologyNode, PdfNode
+from sw_nebula_service.models.relations import HasLib, HasPdf
+from tests.factories import make_pdf_nodes
+from tests.fake_nebula import FakeNebulaBackend
+
+SOURCE_SPACE = "source"
+TARGET_SPACE = "target"
+NODE_COUNT = 12
+
+
+@pytest.fixture
+def transfer_manager(connector: Connector, vertex_manager: VertexManager, edge_manager: EdgeManager) -> TransferManager:
+    return TransferManager(TagManager(connector), EdgeTypeManager(connector), vertex_manager, edge_manager)
+
+
+@pytest.fixture
+def exported(tmp_path, transfer_manager: TransferManager, vertex_manager: VertexManager, edge_manager: EdgeManager):
+    nodes = make_pdf_nodes(NODE_COUNT)
+    vids = [f"pdf_{i:02d}" for i in range(NODE_COUNT)]
+    ontology = OntologyNode(name="kira")
+    vertex_manager.insert_vertices(SOURCE_SPACE, [ontology, *nodes], ["ontology_kira", *vids])
+    edge_manager.insert_edges(SOURCE_SPACE, [(HasPdf(source_node=ontology, target_node=node), "ontology_kira", vid) for node, vid in zip(nodes, vids, strict=True)])
+    report = transfer_manager.export_space(SOURCE_SPACE, tmp_path, node_classes=[OntologyNode, PdfNode], relation_classes=[HasPdf, HasLib], page_size=5)
+    return tmp_path, report
+
+
+def test_export_skips_edge_types_missing_from_the_space(exported):
+    directory, report = exported
+    manifest = json.loads((directory / MANIFEST_FILE).read_text())
+    assert list(manifest["edges"]) == ["has_pdf"]
+    assert (report.vertices, report.edges) == (NODE_COUNT + 1, NODE_COUNT)
+    assert not (directory / "edges" / "has_lib.csv").exists()
+
+
+def test_export_import_round_trip(backend: FakeNebulaBackend, exported, transfer_manager: TransferManager, vertex_manager: VertexManager):
+    directory, _ = exported
+    report = transfer_manager.import_space(TARGET_SPACE, directory, chunk_size=5, schema_wait=0)
+    assert (report.vertices, report.edges) == (NODE_COUNT + 1, NODE_COUNT)
+    assert not report.failed_vids and not report.failed_edges
+    assert backend.vertices[TARGET_SPACE] == backend.vertices[SOURCE_SPACE]
+    assert backend.edges[TARGET_SPACE] == backend.edges[SOURCE_SPACE]
+    assert vertex_manager.get_vertex_by_vid(TARGET_SPACE, "pdf_03") == make_pdf_nodes(4)[3]
+    assert not (directory / CHECKPOINT_FILE).exists()
+
+
+def test_import_creates_the_schema_of_a_fresh_space(backend: FakeNebulaBackend, exported, transfer_manager: TransferManager, monkeypatch):
+    directory, _ = exported
+    backend.require_schema = True
+    waits = []
+    monkeypatch.setattr(transfer_manager_module.time, "sleep", waits.append)
+
+    report = transfer_manager.import_space(TARGET_SPACE, directory, chunk_size=5)
+    assert (report.vertices, report.edges) == (NODE_COUNT + 1, NODE_COUNT)
+    assert not report.failed_vids and not report.failed_edges
+    assert set(backend.schemas[TARGET_SPACE]["TAG"]) == {"ontology_node", "pdf_node"}
+    assert backend.schemas[TARGET_SPACE]["EDGE"] == {"has_pdf": {"source_node": "string", "target_node": "string"}}
+    assert backend.vertices[TARGET_SPACE] == backend.vertices[SOURCE_SPACE]
+    # The created schema is waited for once, an import into a space that already has it starts right away
+    transfer_manager.import_space(TARGET_SPACE, directory, chunk_size=5)
+    assert waits == [transfer_manager_module.SCHEMA_PROPAGATION_WAIT]
+
+
+def test_import_resumes_after_a_failure(backend: FakeNebulaBackend, exported, transfer_manager: TransferManager, edge_manager: EdgeManager, monkeypatch):
+    directory, _ = exported
+    insert_edges = edge_manager.insert_edges
+    calls = 0
+
+    def fail_second_batch(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise ConnectionError("connection lost")
+        return insert_edges(*args, **kwargs)
+
+    monkeypatch.setattr(edge_manager, "insert_edges", fail_second_batch)
+    with pytest.raises(ConnectionError):
+        transfer_manager.import_space(TARGET_SPACE, directory, chunk_size=5, schema_wait=0)
+    checkpoint = json.loads((directory / CHECKPOINT_FILE).read_text())
+    assert checkpoint["edges/has_pdf.csv"] == 5
+
+    report = transfer_manager.import_space(TARGET_SPACE, directory, chunk_size=5, schema_wait=0)
+    assert (report.vertices, report.edges) == (0, NODE_COUNT - 5)
+    assert backend.edges[TARGET_SPACE] == backend.edges[SOURCE_SPACE]
+
+    # The finished import removed its checkpoint, so importing again loads every row instead of nothing
+    report = transfer_manager.import_space(TARGET_SPACE, directory, chunk_size=5, schema_wait=0)
+    assert (report.vertices, report.edges) == (NODE_COUNT + 1, NODE_COUNT)
@@ -0,0 +1,66 @@
+import pytest
+
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.edge_manager import EdgeManager
+from sw_nebula_service.managers.traversal_manager import TraversalManager
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import LibNode, OntologyNode, PdfNode, RootNode
+from sw_nebula_service.models.relations import HasLib, HasOntology, HasPdf
+from tests.factories import make_pdf_nodes
+
+NAME_SPACE = "traversal"
+
+
+@pytest.fixture
+def traversal_manager(connector: Connector, vertex_manager: VertexManager, edge_manager: EdgeManager) -> TraversalManager:
+    # root -> hukuk -> kira -> pdf_0, pdf_1 and root -> finans
+    root, hukuk, finans, kira = RootNode(name="root"), LibNode(name="hukuk"), LibNode(name="finans"), OntologyNode(name="kira")
+    pdfs = make_pdf_nodes(2)
+    vertex_manager.insert_vertices(NAME_SPACE, [root, hukuk, finans, kira, *pdfs], ["root", "hukuk", "finans", "kira", "pdf_0", "pdf_1"])
+    edge_manager.insert_edges(
+        NAME_SPACE,
+        [
+            (HasLib(source_node=root, target_node=hukuk), "root", "hukuk"),
+            (HasLib(source_node=root, target_node=finans), "root", "finans"),
+            (HasOntology(source_node=hukuk, target_node=kira), "hukuk", "kira"),
+            *((HasPdf(source_node=kira, target_node=pdf), "kira", f"pdf_{i}") for i, pdf in enumerate(pdfs)),
+        ],
+    )
+    return TraversalManager(connector)
+
+
+def test_subtree_follows_every_step(traversal_manager):
+    subtree = traversal_manager.get_subtree(NAME_SPACE, "root")
+    assert subtree.root.node == RootNode(name="root")
+    assert [(node.vid, node.depth, node.edge_type) for node in subtree.iter_nodes()] == [
+        ("root", 0, None),
+        ("hukuk", 1, "has_lib"),
+        ("kira", 2, "has_ontology"),
+        ("pdf_0", 3, "has_pdf"),
+        ("pdf_1", 3, "has_pdf"),
+        ("finans", 1, "has_lib"),
+    ]
+    assert isinstance(subtree.root.children[0].children[0].children[0].node, PdfNode)
+    assert ("has_pdf", "kira", "pdf_1") in subtree.edges
+
+
+def test_subtree_honours_depth_and_limits(traversal_manager):
+    subtree = traversal_manager.get_subtree(NAME_SPACE, "root", max_depth=1)
+    assert [node.vid for node in subtree.iter_nodes()] == ["root", "hukuk", "finans"]
+    subtree = traversal_manager.get_subtree(NAME_SPACE, "root", limits=[1, 1, 1])
+    assert [node.vid for node in subtree.iter_nodes()] == ["root", "hukuk", "kira", "pdf_0"]
+    with pytest.raises(ValueError, match="one entry per step"):
+        traversal_manager.get_subtree(NAME_SPACE, "root", limits=[1, 1])
+
+
+def test_dangling_edges_are_reported_not_attached(traversal_manager, edge_manager: EdgeManager):
+    edge_manager.insert_edges(NAME_SPACE, [("has_ontology", "finans", "deleted_ontology", {"source_node": "finans", "target_node": "deleted_ontology"})])
+    subtree = traversal_manager.get_subtree(NAME_SPACE, "root")
+    assert subtree.dangling_edges == [("has_ontology", "finans", "deleted_ontology")]
+    assert "deleted_ontology" not in {node.vid for node in subtree.iter_nodes()}
+    assert len(subtree.edges) == 5
+
+
+def test_missing_root_is_an_error(traversal_manager):
+    with pytest.raises(Exception, match="vertex not found"):
+        traversal_manager.get_subtree(NAME_SPACE, "nowhere")
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from sw_nebula_service.managers.connector import Connector
+from sw_nebula_service.managers.vertex_cache import VertexCache
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import LibNode
+from tests.fake_nebula import FakeNebulaBackend
+
+NAME_SPACE = "cache"
+
+
+@pytest.fixture
+def cache() -> VertexCache:
+    return VertexCache(max_size=2, ttl=60.0)
+
+
+@pytest.fixture
+def cached_vertex_manager(connector: Connector, cache: VertexCache) -> VertexManager:
+    return VertexManager(connector, cache=cache)
+
+
+def test_lru_evicts_least_recently_used(cache):
+    cache.put(NAME_SPACE, "a", LibNode(name="a"))
+    cache.put(NAME_SPACE, "b", LibNode(name="b"))
+    assert cache.get(NAME_SPACE, "a") is not None
+    cache.put(NAME_SPACE, "c", LibNode(name="c"))
+    assert cache.get(NAME_SPACE, "b") is None
+    assert cache.get(NAME_SPACE, "a").name == "a"
+    assert cache.stats().evictions == 1
+
+
+def test_expired_entries_are_misses():
+    cache = VertexCache(ttl=0.0)
+    cache.put(NAME_SPACE, "a", LibNode(name="a"))
+    time.sleep(0.001)
+    assert cache.get(NAME_SPACE, "a") is None
+    assert cache.stats().misses == 1
+
+
+def test_cached_nodes_are_copies(cache):
+    node = LibNode(name="a")
+    cache.put(NAME_SPACE, "a", node)
+    node.name = "changed"
+    cache.get(NAME_SPACE, "a").name = "changed"
+    assert cache.get(NAME_SPACE, "a").name == "a"
+
+
+def test_invalidation_wins_over_in_flight_fill(cache):
+    token = cache.fill_token()
+    cache.invalidate(NAME_SPACE, "a")
+    cache.put(NAME_SPACE, "a", LibNode(name="stale"), token=token)
+    assert cache.get(NAME_SPACE, "a") is None
+    cache.put(NAME_SPACE, "b", LibNode(name="b"), token=token)
+    assert cache.get(NAME_SPACE, "b").name == "b"
+
+
+def test_fill_is_dropped_when_its_invalidation_was_evicted_from_the_log(cache):
+    token = cache.fill_token()
+    for vid in ("a", "b", "c"):
+        cache.invalidate(NAME_SPACE, vid)
+    cache.put(NAME_SPACE, "a", LibNode(name="stale"), token=token)
+    assert cache.get(NAME_SPACE, "a") is None
+
+
+def test_clear_drops_in_flight_fills(cache):
+    token = cache.fill_token()
+    cache.clear(NAME_SPACE)
+    cache.put(NAME_SPACE, "a", LibNode(name="stale"), token=token)
+    assert cache.get(NAME_SPACE, "a") is None
+
+
+def test_reads_are_served_from_the_cache(backend: FakeNebulaBackend, cached_vertex_manager):
+    cached_vertex_manager.insert_vertex(NAME_SPACE, LibNode(name="a"), "a")
+    cached_vertex_manager.get_vertex_by_vid(NAME_SPACE, "a")
+    statements = backend.statements
+    assert cached_vertex_manager.get_vertex_by_vid(NAME_SPACE, "a").name == "a"
+    assert backend.statements == statements
+
+
+def test_writes_invalidate_cached_vertices(cached_vertex_manager, cache):
+    cached_vertex_manager.insert_vertex(NAME_SPACE, LibNode(name="a"), "a")
+    cached_vertex_manager.get_vertex_by_vid(NAME_SPACE, "a")
+    cached_vertex_manager.update_vertex_field(NAME_SPACE, "lib_node", "a", "name", "renamed")
+    assert cache.get(NAME_SPACE, "a") is None
+    assert cached_vertex_manager.get_vertex_by_vid(NAME_SPACE, "a").name == "renamed"
+
+    cached_vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name="again")], ["a"])
+    assert cached_vertex_manager.get_vertex_by_vid(NAME_SPACE, "a").name == "again"
+
+
+def test_write_during_fetch_keeps_the_stale_row_out(backend: FakeNebulaBackend, cached_vertex_manager, cache, monkeypatch):
+    cached_vertex_manager.insert_vertex(NAME_SPACE, LibNode(name="old"), "a")
+    execute = backend.execute
+
+    def execute_then_write(name_space, query):
+        result = execute(name_space, query)
+        if query.startswith("FETCH"):
+            # Another writer updates the vertex after the FETCH read it but before the row is cached
+            cache.invalidate(NAME_SPACE, "a")
+        return result
+
+    monkeypatch.setattr(backend, "execute", execute_then_write)
+    assert cached_vertex_manager.get_vertex_by_vid(NAME_SPACE, "a").name == "old"
+    assert cache.get(NAME_SPACE, "a") is None
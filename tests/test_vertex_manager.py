@@ -0,0 +1,103 @@
+import pytest
+from nebula3.data.DataObject import ValueWrapper
+
+from sw_nebula_service.managers.vertex_manager import VertexManager
+from sw_nebula_service.models.nodes import LibNode, OntologyNode
+from tests.factories import make_pdf_nodes
+from tests.fake_nebula import FakeNebulaBackend, FakeSession
+
+NAME_SPACE = "vertices"
+
+
+def test_insert_vertices_batches_each_tag(backend: FakeNebulaBackend, vertex_manager: VertexManager):
+    pdfs = make_pdf_nodes(5)
+    nodes = [*pdfs, LibNode(name="hukuk"), OntologyNode(name="kira")]
+    vids = [f"pdf_{i}" for i in range(5)] + ["hukuk", "kira"]
+    results = vertex_manager.insert_vertices(NAME_SPACE, nodes, vids, batch_size=2)
+
+    assert [result.vids for result in results] == [["pdf_0", "pdf_1"], ["pdf_2", "pdf_3"], ["pdf_4"], ["hukuk"], ["kira"]]
+    assert all(result.is_succeeded and not result.failed_vids for result in results)
+    assert vertex_manager.get_vertex_by_vid(NAME_SPACE, "pdf_3") == pdfs[3]
+    assert set(backend.vertices[NAME_SPACE]["kira"]) == {"ontology_node"}
+
+
+def test_insert_vertices_reports_failed_batches(backend: FakeNebulaBackend, vertex_manager: VertexManager):
+    backend.failing_markers.add('"b"')
+    results = vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in "abcd"], list("abcd"), batch_size=2)
+
+    assert [(result.is_succeeded, result.failed_vids) for result in results] == [(False, ["a", "b"]), (True, [])]
+    assert "injected failure" in results[0].message
+    assert set(backend.vertices[NAME_SPACE]) == {"c", "d"}
+
+
+def test_insert_vertices_needs_a_vid_per_node(vertex_manager: VertexManager):
+    with pytest.raises(ValueError):
+        vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name="a")], ["a", "b"])
+
+
+def test_update_vertices_replays_a_failed_batch_per_vid(backend: FakeNebulaBackend, vertex_manager: VertexManager):
+    vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in ("a", "b", "c")], ["a", "b", "c"])
+    patches = {"a": {"name": "a2"}, "missing": {"name": "m2"}, "b": {"name": "b2"}, "c": {"name": "c2"}}
+    results = vertex_manager.update_vertices(NAME_SPACE, "lib_node", patches, batch_size=3)
+
+    assert {vid: result.is_succeeded for vid, result in results.items()} == {"a": True, "missing": False, "b": True, "c": True}
+    assert "Vertex or tag not found" in results["missing"].message
+    # b comes after the failing statement in the batch, so only the per-vid replay can have written it
+    assert {vid: tags["lib_node"]["name"] for vid, tags in backend.vertices[NAME_SPACE].items()} == {"a": "a2", "b": "b2", "c": "c2"}
+
+
+def test_update_vertices_sends_one_request_per_succeeding_batch(backend: FakeNebulaBackend, vertex_manager: VertexManager, monkeypatch):
+    vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in ("a", "b", "c", "d")], ["a", "b", "c", "d"])
+    requests = []
+    execute_parameter = FakeSession.execute_parameter
+    monkeypatch.setattr(FakeSession, "execute_parameter", lambda session, query, params: requests.append(query) or execute_parameter(session, query, params))
+    results = vertex_manager.update_vertices(NAME_SPACE, "lib_node", {vid: {"name": vid * 2} for vid in ("a", "b", "c", "d")}, batch_size=2)
+    assert all(result.is_succeeded for result in results.values())
+    assert [query.count("UPDATE VERTEX") for query in requests if "UPDATE" in query] == [2, 2]
+
+
+def test_empty_patches_run_no_query(backend: FakeNebulaBackend, vertex_manager: VertexManager):
+    vertex_manager.insert_vertex(NAME_SPACE, LibNode(name="a"), "a")
+    statements = backend.statements
+    assert vertex_manager.update_vertex(NAME_SPACE, "lib_node", "a", {}).is_succeeded
+    results = vertex_manager.update_vertices(NAME_SPACE, "lib_node", {"a": {}, "b": {}})
+    assert all(result.is_succeeded for result in results.values())
+    assert backend.statements == statements
+
+
+def test_iter_vertices_pages_through_the_tag(vertex_manager: VertexManager, monkeypatch):
+    vids = ['a"quoted', "b", "c", "d", "e"]
+    vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in vids], vids)
+    vertex_manager.insert_vertex(NAME_SPACE, OntologyNode(name="other tag"), "f")
+    pages = []
+    execute_parameter = FakeSession.execute_parameter
+
+    def record_pages(session, query, params):
+        if query.startswith("MATCH"):
+            pages.append(params and ValueWrapper(params["cursor"]).cast())
+        return execute_parameter(session, query, params)
+
+    monkeypatch.setattr(FakeSession, "execute_parameter", record_pages)
+    nodes = list(vertex_manager.iter_vertices_of_node_class(NAME_SPACE, LibNode, page_size=2))
+    assert sorted(node.name for node in nodes) == sorted(vids)
+    # Each page after the first starts after the last vid of the one before
+    assert pages == [None, "b", "d"]
+
+
+def test_iter_vertices_stops_after_a_short_page(vertex_manager: VertexManager, backend: FakeNebulaBackend):
+    vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in "abcd"], list("abcd"))
+    statements = backend.statements
+    assert len(list(vertex_manager.iter_vertices_of_node_class(NAME_SPACE, LibNode, page_size=2))) == 4
+    # Two full pages and the empty one that shows the tag is exhausted
+    assert backend.statements - statements == 3
+
+
+def test_get_vertices_by_vids_skips_missing_vids(vertex_manager: VertexManager, backend: FakeNebulaBackend):
+    vertex_manager.insert_vertices(NAME_SPACE, [LibNode(name=vid) for vid in "abc"], list("abc"))
+    statements = backend.statements
+    nodes = vertex_manager.get_vertices_by_vids(NAME_SPACE, ["c", "missing", "a", "c"], batch_size=2)
+    assert {vid: node.name for vid, node in nodes.items()} == {"c": "c", "a": "a"}
+    # Duplicates are fetched once, so three distinct vids make two batches
+    assert backend.statements - statements == 2
+    with pytest.raises(Exception, match="vertex not found"):
+        vertex_manager.get_vertex_by_vid(NAME_SPACE, "missing")